@@ -67,6 +67,7 @@ from .deep_crawling import (
     BFSDeepCrawlStrategy,
     FilterChain,
     URLPatternFilter,
+    PathSegmentFilter,
     DomainFilter,
     ContentTypeFilter,
     URLFilter,
@@ -169,6 +170,7 @@ __all__ = [
     "DFSDeepCrawlStrategy",
     "FilterChain",
     "URLPatternFilter",
+    "PathSegmentFilter",
     "ContentTypeFilter",
     "DomainFilter",
     "FilterStats",
@@ -2,7 +2,7 @@ import os
 from pathlib import Path
 import aiosqlite
 import asyncio
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Callable, Awaitable
 from contextlib import asynccontextmanager
 import json  
 from .models import CrawlResult, MarkdownGenerationResult, StringCompatibleMarkdown
@@ -30,6 +30,10 @@ class AsyncDatabaseManager:
         self.pool_lock = asyncio.Lock()
         self.init_lock = asyncio.Lock()
         self.connection_semaphore = asyncio.Semaphore(pool_size)
+        # Extra setup run on every new pooled connection, see add_connection_init_hook()
+        self.connection_init_hooks: List[Callable[[aiosqlite.Connection], Awaitable[None]]] = []
+        # Run by cleanup() for components holding connections outside the pool
+        self.cleanup_hooks: List[Callable[[], Awaitable[None]]] = []
         self._initialized = False
         self.version_manager = VersionManager()
         self.logger = AsyncLogger(
@@ -92,11 +96,23 @@ class AsyncDatabaseManager:
 
     async def cleanup(self):
         """Cleanup connections when shutting down"""
+        for hook in self.cleanup_hooks:
+            await hook()
         async with self.pool_lock:
             for conn in self.connection_pool.values():
                 await conn.close()
             self.connection_pool.clear()
 
+    def add_connection_init_hook(self, hook: Callable[[aiosqlite.Connection], Awaitable[None]]):
+        """Run ``hook(conn)`` on every connection the pool opens from now on"""
+        if hook not in self.connection_init_hooks:
+            self.connection_init_hooks.append(hook)
+
+    def add_cleanup_hook(self, hook: Callable[[], Awaitable[None]]):
+        """Await ``hook()`` when cleanup() runs"""
+        if hook not in self.cleanup_hooks:
+            self.cleanup_hooks.append(hook)
+
     def get_site_graph_manager(self):
         """Get site graph database manager for this database instance"""
         from .site_graph_db import SiteGraphDatabaseManager
@@ -137,6 +153,8 @@ class AsyncDatabaseManager:
                         conn = await aiosqlite.connect(self.db_path, timeout=30.0)
                         await conn.execute("PRAGMA journal_mode = WAL")
                         await conn.execute("PRAGMA busy_timeout = 5000")
+                        for hook in self.connection_init_hooks:
+                            await hook(conn)
 
                         # Verify database structure
                         async with conn.execute(
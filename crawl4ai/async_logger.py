@@ -75,6 +75,10 @@ class AsyncLoggerBase(ABC):
     def error_status(self, url: str, error: str, tag: str = "ERROR", url_length: int = 100):
         pass
 
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        """Whether a message at `level` would be emitted; lets callers skip building it."""
+        return True
+
 
 class AsyncLogger(AsyncLoggerBase):
     """
@@ -142,6 +146,10 @@ class AsyncLogger(AsyncLoggerBase):
         if log_file:
             os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
 
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        """Whether a message at `level` passes log_level and has an output."""
+        return level.value >= self.log_level.value and bool(self.verbose or self.log_file)
+
     def _format_tag(self, tag: str) -> str:
         """Format a tag with consistent width."""
         return f"[{tag}]".ljust(self.tag_width, ".")
@@ -9,6 +9,7 @@ from .filters import (
     DomainFilter,
     URLFilter,
     URLPatternFilter,
+    PathSegmentFilter,
     FilterStats,
     ContentRelevanceFilter,
     SEOFilter
@@ -34,6 +35,7 @@ __all__ = [
     "DomainFilter",
     "URLFilter",
     "URLPatternFilter",
+    "PathSegmentFilter",
     "FilterStats",
     "ContentRelevanceFilter",
     "SEOFilter",
@@ -162,6 +162,15 @@ class URLPatternFilter(URLFilter):
             pattern_type = self._categorize_pattern(pattern)
             self._add_pattern(pattern, pattern_type)
 
+        # Fold all translated globs into a single alternation so each URL is
+        # scanned once instead of once per pattern
+        globs = [p for p in self._path_patterns if isinstance(p, str)]
+        self._path_patterns = [p for p in self._path_patterns if not isinstance(p, str)]
+        if globs:
+            self._path_patterns.insert(
+                0, re.compile("|".join(f"(?:{glob})" for glob in globs))
+            )
+
     def _categorize_pattern(self, pattern: str) -> int:
         """Categorize pattern for specialized handling"""
         if not isinstance(pattern, str):
@@ -209,10 +218,10 @@ class URLPatternFilter(URLFilter):
                         lambda m: f'({"|".join(m.group(1).split(","))})',
                         pattern,
                     )
-                pattern = fnmatch.translate(pattern)
-            self._path_patterns.append(
-                pattern if isinstance(pattern, Pattern) else re.compile(pattern)
-            )
+                # Kept as a string here; __init__ compiles all globs together
+                self._path_patterns.append(fnmatch.translate(pattern))
+            else:
+                self._path_patterns.append(pattern)
 
     @lru_cache(maxsize=10000)
     def apply(self, url: str) -> bool:
@@ -263,6 +272,113 @@ class URLPatternFilter(URLFilter):
         return not result if self._reverse else result
 
 
+class ExclusionTrie:
+    """Segment trie for '*/seg/.../seg[/*]' glob patterns over URLs
+
+    Each pattern is matched in O(path segments), independent of how many
+    patterns are stored. Only globs whose wildcards are a leading '*/', a
+    trailing '/*' or a trailing '*' on the last segment are representable;
+    use `supports()` to check before inserting.
+    """
+
+    __slots__ = ("_root",)
+
+    # Non-string node keys so they never collide with real path segments
+    _END = 0  # pattern ends at this segment, which must be the last one
+    _MORE = 1  # pattern ends at this segment and requires a following '/'
+    _PREFIXES = 2  # set of prefixes matching the next segment and ending the pattern
+
+    _GLOB_CHARS = frozenset("*?[]{}")
+
+    def __init__(self, patterns: List[str] = None):
+        self._root = {}
+        for pattern in patterns or []:
+            if not self.insert(pattern):
+                raise ValueError(f"Pattern is not a path segment glob: {pattern!r}")
+
+    @classmethod
+    def _split(cls, pattern) -> Union[tuple, None]:
+        """Split a pattern into (literal segments, terminal kind, prefix) or None"""
+        if not isinstance(pattern, str) or not pattern.startswith("*/"):
+            return None
+        segments = pattern[2:].split("/")
+        last = segments[-1]
+        prefix = None
+        if last == "*":
+            segments, terminal = segments[:-1], cls._MORE
+        elif last.endswith("*"):
+            segments, terminal, prefix = segments[:-1], cls._PREFIXES, last[:-1]
+            if not prefix or cls._GLOB_CHARS.intersection(prefix):
+                return None
+        else:
+            terminal = cls._END
+        if terminal != cls._PREFIXES and not segments:
+            return None
+        if any(not seg or cls._GLOB_CHARS.intersection(seg) for seg in segments):
+            return None
+        return segments, terminal, prefix
+
+    @classmethod
+    def supports(cls, pattern) -> bool:
+        return cls._split(pattern) is not None
+
+    def insert(self, pattern: str) -> bool:
+        """Add a pattern; returns False if it is not a path segment glob"""
+        split = self._split(pattern)
+        if split is None:
+            return False
+        segments, terminal, prefix = split
+        node = self._root
+        for seg in segments:
+            node = node.setdefault(seg, {})
+        if terminal == self._PREFIXES:
+            node.setdefault(self._PREFIXES, set()).add(prefix)
+        else:
+            node[terminal] = True
+        return True
+
+    def matches(self, url: str) -> bool:
+        # The whole URL, not just its path, as fnmatch saw it: '*/admin/*'
+        # also matches a host, query or fragment containing '/admin/'
+        segments = url.split("/")
+        count = len(segments)
+        root = self._root
+        # segments[0] is not preceded by a '/', so no pattern can start there
+        for start in range(1, count):
+            node = root
+            for i in range(start, count):
+                seg = segments[i]
+                prefixes = node.get(self._PREFIXES)
+                if prefixes and any(seg.startswith(p) for p in prefixes):
+                    return True
+                node = node.get(seg)
+                if node is None:
+                    break
+                if self._MORE in node and i + 1 < count:
+                    return True
+                if self._END in node and i + 1 == count:
+                    return True
+        return False
+
+
+class PathSegmentFilter(URLFilter):
+    """Trie-backed glob filter for '*/segment/*' style path patterns"""
+
+    __slots__ = ("patterns", "reverse", "_trie")
+
+    def __init__(self, patterns: Union[str, List[str]], reverse: bool = False):
+        super().__init__()
+        # Store original constructor params for serialization
+        self.patterns = patterns
+        self.reverse = reverse
+        self._trie = ExclusionTrie([patterns] if isinstance(patterns, str) else patterns)
+
+    def apply(self, url: str) -> bool:
+        result = self._trie.matches(url)
+        self._update_stats(result)
+        return not result if self.reverse else result
+
+
 class ContentTypeFilter(URLFilter):
     """Optimized content type filter using fast lookups"""
 
@@ -390,7 +506,7 @@ class ContentTypeFilter(URLFilter):
 
     def __init__(
         self,
-        allowed_types: Union[str, List[str]],
+        allowed_types: Union[str, List[str], Set[str]],
         check_extension: bool = True,
         ext_map: Dict[str, str] = _MIME_MAP,
     ):
@@ -399,7 +515,7 @@ class ContentTypeFilter(URLFilter):
         self.allowed_types = frozenset(
             t.lower()
             for t in (
-                allowed_types if isinstance(allowed_types, list) else [allowed_types]
+                [allowed_types] if isinstance(allowed_types, str) else allowed_types
             )
         )
         self._check_extension = check_extension
@@ -7,13 +7,17 @@ It extends the existing AsyncWebCrawler analytics infrastructure to support "cra
 
 import asyncio
 import time
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Deque, Dict, List, Set, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
+from itertools import islice
 
 from .models import CrawlResult
-from .async_logger import AsyncLoggerBase
+from .async_logger import AsyncLoggerBase, LogLevel
+
+# Number of per-batch discovery counts kept for trend analysis
+DISCOVERY_HISTORY_SIZE = 10
 
 
 @dataclass
@@ -24,7 +28,7 @@ class DeadEndMetrics:
     new_urls_last_batch: int = 0
     revisit_count: int = 0
     total_crawl_attempts: int = 0
-    discovery_rate_history: List[int] = field(default_factory=list)
+    discovery_rate_history: Deque[int] = field(default_factory=lambda: deque(maxlen=DISCOVERY_HISTORY_SIZE))
     last_discovery_time: Optional[datetime] = None
     crawl_start_time: Optional[datetime] = None
     
@@ -41,9 +45,14 @@ class DeadEndMetrics:
         if not self.discovery_rate_history:
             return 0.0
         # Use last 5 batches for average
-        recent_history = self.discovery_rate_history[-5:]
+        recent_history = self.recent_discovery_rates(5)
         return sum(recent_history) / len(recent_history)
     
+    def recent_discovery_rates(self, count: int) -> List[int]:
+        """Return the last ``count`` discovery counts, oldest first"""
+        history = self.discovery_rate_history
+        return list(islice(history, max(0, len(history) - count), None))
+    
     @property
     def time_since_last_discovery(self) -> Optional[timedelta]:
         """Time elapsed since last URL discovery"""
@@ -136,20 +145,83 @@ class ExhaustiveAnalytics:
         if self.logger:
             self.logger.info("Started exhaustive crawl session", tag="EXHAUST")
     
-    def analyze_crawl_results(self, results: List[CrawlResult], source_url: str = None) -> Dict:
+    def analyze_crawl_results(
+        self,
+        results: List[CrawlResult],
+        source_url: Union[str, List[Optional[str]], None] = None,
+        dead_end_threshold: int = 50,
+        revisit_threshold: float = 0.95
+    ) -> Dict:
         """
         Analyze crawl results to update dead-end detection metrics.
         
         Args:
             results: List of CrawlResult objects from recent crawling
-            source_url: The URL that was crawled to produce these results
+            source_url: The URL that was crawled to produce these results, or a
+                list with one source URL per result. With a list, each result is
+                scored as its own page (as if analyzed one by one) but the whole
+                batch is processed in a single call.
+            dead_end_threshold: Passed to should_stop_crawling for 'should_continue'
+            revisit_threshold: Passed to should_stop_crawling for 'should_continue'
             
         Returns:
-            Dictionary with analysis results and recommendations
+            Dictionary with analysis results and recommendations. 'should_continue'
+            and 'stop_reason' carry the stop check for the updated metrics, so
+            callers do not need to run should_stop_crawling again. When a list of
+            source URLs is given, 'new_urls_per_result' holds the number of new
+            URLs each result contributed.
         """
         if not results:
-            return self._handle_empty_results()
+            return self._handle_empty_results(dead_end_threshold, revisit_threshold)
+        
+        if isinstance(source_url, list):
+            groups = [
+                ([result], source_url[i] if i < len(source_url) else None)
+                for i, result in enumerate(results)
+            ]
+        else:
+            groups = [(results, source_url)]
         
+        new_urls_per_result = []
+        total_links_found = 0
+        for group, group_source in groups:
+            new_urls, links_found = self._analyze_result_group(group, group_source)
+            new_urls_per_result.append(new_urls)
+            total_links_found += links_found
+        new_urls_discovered = sum(new_urls_per_result)
+        self.metrics.new_urls_last_batch = new_urls_discovered
+        
+        # Log analysis results; runs for every crawled page, so skip the
+        # formatting when the logger would drop the message
+        if self.logger and self.logger.is_enabled_for(LogLevel.INFO):
+            self.logger.info(
+                f"Analyzed {len(results)} results: {new_urls_discovered} new URLs, "
+                f"{total_links_found} total links, {self.metrics.consecutive_dead_pages} consecutive dead pages",
+                tag="ANALYZE"
+            )
+        
+        should_stop, stop_reason = self.should_stop_crawling(dead_end_threshold, revisit_threshold)
+        analysis = {
+            'new_urls_discovered': new_urls_discovered,
+            'total_links_found': total_links_found,
+            'consecutive_dead_pages': self.metrics.consecutive_dead_pages,
+            'revisit_ratio': self.metrics.revisit_ratio,
+            'discovery_rate': self.metrics.average_discovery_rate,
+            'should_continue': not should_stop,
+            'stop_reason': stop_reason,
+            'url_stats': self.url_state.get_stats()
+        }
+        if isinstance(source_url, list):
+            analysis['new_urls_per_result'] = new_urls_per_result
+        return analysis
+    
+    def _analyze_result_group(self, results: List[CrawlResult], source_url: Optional[str]) -> Tuple[int, int]:
+        """
+        Update metrics for one group of results produced by crawling `source_url`.
+        
+        Returns:
+            Tuple of (new_urls_discovered, total_links_found)
+        """
         # Track the crawled URL
         if source_url:
             success = any(r.success for r in results if r.url == source_url)
@@ -182,12 +254,9 @@ class ExhaustiveAnalytics:
         # Update metrics
         self.metrics.new_urls_last_batch = new_urls_discovered
         self.metrics.total_urls_discovered += new_urls_discovered
+        # History is a bounded deque, so old batches fall off on append
         self.metrics.discovery_rate_history.append(new_urls_discovered)
         
-        # Keep only recent history (last 10 batches)
-        if len(self.metrics.discovery_rate_history) > 10:
-            self.metrics.discovery_rate_history = self.metrics.discovery_rate_history[-10:]
-        
         # Update discovery time if new URLs found
         if new_urls_discovered > 0:
             self.metrics.last_discovery_time = datetime.now()
@@ -199,25 +268,9 @@ class ExhaustiveAnalytics:
         if source_url and source_url in self.url_state.crawled_urls:
             self.metrics.revisit_count += 1
         
-        # Log analysis results
-        if self.logger:
-            self.logger.info(
-                f"Analyzed {len(results)} results: {new_urls_discovered} new URLs, "
-                f"{total_links_found} total links, {self.metrics.consecutive_dead_pages} consecutive dead pages",
-                tag="ANALYZE"
-            )
-        
-        return {
-            'new_urls_discovered': new_urls_discovered,
-            'total_links_found': total_links_found,
-            'consecutive_dead_pages': self.metrics.consecutive_dead_pages,
-            'revisit_ratio': self.metrics.revisit_ratio,
-            'discovery_rate': self.metrics.average_discovery_rate,
-            'should_continue': self._should_continue_crawling(),
-            'url_stats': self.url_state.get_stats()
-        }
+        return new_urls_discovered, total_links_found
     
-    def _handle_empty_results(self) -> Dict:
+    def _handle_empty_results(self, dead_end_threshold: int = 50, revisit_threshold: float = 0.95) -> Dict:
         """Handle case where no results were returned"""
         self.metrics.consecutive_dead_pages += 1
         self.metrics.discovery_rate_history.append(0)
@@ -225,13 +278,15 @@ class ExhaustiveAnalytics:
         if self.logger:
             self.logger.warning("No results returned from crawl batch", tag="ANALYZE")
         
+        should_stop, stop_reason = self.should_stop_crawling(dead_end_threshold, revisit_threshold)
         return {
             'new_urls_discovered': 0,
             'total_links_found': 0,
             'consecutive_dead_pages': self.metrics.consecutive_dead_pages,
             'revisit_ratio': self.metrics.revisit_ratio,
             'discovery_rate': 0.0,
-            'should_continue': self._should_continue_crawling(),
+            'should_continue': not should_stop,
+            'stop_reason': stop_reason,
             'url_stats': self.url_state.get_stats()
         }
     
@@ -260,7 +315,7 @@ class ExhaustiveAnalytics:
         
         # Check discovery rate trend (if consistently low for extended period)
         if len(self.metrics.discovery_rate_history) >= 5:
-            recent_avg = sum(self.metrics.discovery_rate_history[-5:]) / 5
+            recent_avg = sum(self.metrics.recent_discovery_rates(5)) / 5
             if recent_avg < 0.5 and self.metrics.consecutive_dead_pages > 20:
                 return True, f"Very low discovery rate: {recent_avg:.1f} URLs/batch over last 5 batches"
         
@@ -292,7 +347,7 @@ class ExhaustiveAnalytics:
                 'time_since_last_discovery': str(self.metrics.time_since_last_discovery) if self.metrics.time_since_last_discovery else None
             },
             'url_tracking': self.url_state.get_stats(),
-            'discovery_history': self.metrics.discovery_rate_history.copy(),
+            'discovery_history': list(self.metrics.discovery_rate_history),
             'pending_urls_sample': list(self.url_state.pending_urls)[:10]  # First 10 pending URLs
         }
     
@@ -384,7 +384,7 @@ class ExhaustiveAnalyticsReporter:
             # Basic dead-end metrics
             analysis.consecutive_dead_pages = metrics.consecutive_dead_pages
             analysis.revisit_ratio = metrics.revisit_ratio
-            analysis.discovery_rate_trend = metrics.discovery_rate_history.copy()
+            analysis.discovery_rate_trend = list(metrics.discovery_rate_history)
             analysis.time_since_last_discovery = metrics.time_since_last_discovery
             
             # Determine if dead-end threshold was reached
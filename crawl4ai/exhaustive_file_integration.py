@@ -526,8 +526,8 @@ class ExhaustiveFileDiscoveryCrawler(ExhaustiveAsyncWebCrawler):
                 # Process each link through file discovery filter
                 for link_url in all_links:
                     if self.file_filter.apply(link_url):
-                        # Get the discovered file metadata
-                        discovered_files = self.file_filter.get_discovered_files()
+                        # Get the discovered file metadata without copying the inventory
+                        discovered_files = self.file_filter.discovered_files
                         if discovered_files:
                             # Get the most recently discovered file
                             latest_file = discovered_files[-1]
@@ -623,29 +623,17 @@ class ExhaustiveFileDiscoveryCrawler(ExhaustiveAsyncWebCrawler):
             }
         }
     
-    # Override the batch crawling method to include file processing
-    async def _crawl_batch(self, urls: List[str], config: ExhaustiveCrawlConfig, **kwargs) -> List[CrawlResult]:
+    # Override the per-page hook to include file processing
+    async def _on_page_crawled(self, result: CrawlResult, url: str) -> None:
         """
-        Enhanced batch crawling with file discovery integration.
+        Discover and queue the files linked from each crawled page.
         
         Args:
-            urls: URLs to crawl
-            config: Crawl configuration
-            **kwargs: Additional arguments
-            
-        Returns:
-            List of crawl results
+            result: CrawlResult of the page
+            url: URL the page was requested as
         """
-        # Call parent method to get results
-        results = await super()._crawl_batch(urls, config, **kwargs)
-        
-        # Process each result for file discovery
         if self._file_discovery_active:
-            for i, result in enumerate(results):
-                source_url = urls[i] if i < len(urls) else None
-                await self._process_crawl_result_for_files(result, source_url)
-        
-        return results
+            await self._process_crawl_result_for_files(result, url)
     
     def get_file_discovery_stats(self) -> Dict[str, Any]:
         """Get current file discovery statistics."""
@@ -6,13 +6,104 @@ with exhaustive parameters for comprehensive site mapping that continues "until
 """
 
 import logging
-from typing import Optional, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, List, Tuple
 from math import inf as infinity
 
-from .deep_crawling import BFSDeepCrawlStrategy, FilterChain, URLPatternFilter, ContentTypeFilter
+from .deep_crawling import (
+    BFSDeepCrawlStrategy,
+    FilterChain,
+    URLPatternFilter,
+    PathSegmentFilter,
+    ContentTypeFilter,
+)
+from .deep_crawling.filters import ExclusionTrie
 from .deep_crawling.scorers import URLScorer
 
 
+# Defaults shared by every minimal filter chain; built once at import time
+_DEFAULT_FILE_EXTENSIONS = frozenset({
+    # Documents
+    'pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx',
+    'odt', 'ods', 'odp', 'rtf', 'txt', 'csv',
+    # Archives
+    'zip', 'tar', 'gz', 'rar', '7z', 'bz2',
+    # Media
+    'jpg', 'jpeg', 'png', 'gif', 'svg', 'bmp', 'tiff',
+    'mp3', 'wav', 'mp4', 'avi', 'mov', 'wmv',
+    # Web formats
+    'html', 'htm', 'xml', 'json', 'css', 'js',
+    # Other
+    'epub', 'mobi', 'apk', 'exe', 'dmg', 'iso',
+})
+
+_DEFAULT_EXCLUDE_PATTERNS = (
+    # Exclude obvious non-content patterns
+    '*/wp-admin/*',  # WordPress admin
+    '*/admin/*',     # Generic admin
+    '*/login/*',     # Login pages
+    '*/logout/*',    # Logout pages
+    '*/api/v*',      # API endpoints (versioned)
+    '*/.git/*',      # Git repositories
+    '*/.svn/*',      # SVN repositories
+    '*/node_modules/*',  # Node.js modules
+    '*/vendor/*',    # Vendor directories
+    '*/_*',          # Hidden/private directories
+    '*/cgi-bin/*',   # CGI scripts
+)
+
+_COMPREHENSIVE_CONTENT_TYPES = frozenset({
+    'text/html', 'text/plain', 'text/xml', 'text/css',
+    'application/pdf', 'application/json', 'application/xml',
+    'application/zip', 'application/gzip', 'application/x-tar',
+    'application/msword', 'application/vnd.ms-excel', 'application/vnd.ms-powerpoint',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    'image/jpeg', 'image/png', 'image/gif', 'image/svg+xml',
+    'audio/mpeg', 'audio/wav', 'video/mp4', 'video/avi',
+    'application/octet-stream',  # Catch-all for binary files
+})
+
+# Read-only preset table for create_exhaustive_strategy_preset
+_STRATEGY_PRESETS = MappingProxyType({
+    "comprehensive": {
+        "max_depth": 100,
+        "max_pages": 10000,
+        "max_concurrent_requests": 20,
+        "delay_between_requests": 0.1,
+        "enable_minimal_filtering": True,
+    },
+    "balanced": {
+        "max_depth": 50,
+        "max_pages": 5000,
+        "max_concurrent_requests": 15,
+        "delay_between_requests": 0.2,
+        "enable_minimal_filtering": True,
+    },
+    "fast": {
+        "max_depth": 25,
+        "max_pages": 2000,
+        "max_concurrent_requests": 25,
+        "delay_between_requests": 0.05,
+        "enable_minimal_filtering": True,
+    },
+    "files_focused": {
+        "max_depth": 75,
+        "max_pages": 7500,
+        "max_concurrent_requests": 15,
+        "delay_between_requests": 0.15,
+        "enable_minimal_filtering": True,
+        "file_extensions": (
+            'pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx',
+            'zip', 'tar', 'gz', 'rar', '7z', 'txt', 'csv',
+            'epub', 'mobi', 'json', 'xml'
+        )
+    }
+})
+
+
 def create_exhaustive_bfs_strategy(
     max_depth: int = 100,
     max_pages: int = 10000,
@@ -114,70 +205,55 @@ def create_minimal_filter_chain(
     
     # Default comprehensive file extensions for discovery
     if file_extensions is None:
-        file_extensions = [
-            # Documents
-            'pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx',
-            'odt', 'ods', 'odp', 'rtf', 'txt', 'csv',
-            # Archives
-            'zip', 'tar', 'gz', 'rar', '7z', 'bz2',
-            # Media
-            'jpg', 'jpeg', 'png', 'gif', 'svg', 'bmp', 'tiff',
-            'mp3', 'wav', 'mp4', 'avi', 'mov', 'wmv',
-            # Web formats
-            'html', 'htm', 'xml', 'json', 'css', 'js',
-            # Other
-            'epub', 'mobi', 'apk', 'exe', 'dmg', 'iso'
-        ]
+        file_extensions = _DEFAULT_FILE_EXTENSIONS
     
     # Default minimal exclusions (only obvious non-content)
     if exclude_patterns is None:
-        exclude_patterns = [
-            # Exclude obvious non-content patterns
-            '*/wp-admin/*',  # WordPress admin
-            '*/admin/*',     # Generic admin
-            '*/login/*',     # Login pages
-            '*/logout/*',    # Logout pages
-            '*/api/v*',      # API endpoints (versioned)
-            '*/.git/*',      # Git repositories
-            '*/.svn/*',      # SVN repositories
-            '*/node_modules/*',  # Node.js modules
-            '*/vendor/*',    # Vendor directories
-            '*/_*',          # Hidden/private directories
-            '*/cgi-bin/*',   # CGI scripts
-        ]
+        exclude_patterns = _DEFAULT_EXCLUDE_PATTERNS
     
     # Add comprehensive URL pattern filter that accepts almost everything
     # Use reverse=True with exclusion patterns to allow everything except specific patterns
+    # Plain path segment globs go to a trie; anything else falls back to regex
     if exclude_patterns:
-        filters.append(URLPatternFilter(
-            patterns=exclude_patterns,
-            use_glob=True,
-            reverse=True  # Reverse logic: reject if matches exclusion patterns
-        ))
+        segment_patterns, other_patterns = _split_exclude_patterns(tuple(exclude_patterns))
+        if segment_patterns:
+            filters.append(PathSegmentFilter(
+                patterns=list(segment_patterns),
+                reverse=True  # Reverse logic: reject if matches exclusion patterns
+            ))
+        if other_patterns:
+            filters.append(URLPatternFilter(
+                patterns=list(other_patterns),
+                use_glob=True,
+                reverse=True  # Reverse logic: reject if matches exclusion patterns
+            ))
     
     # Add content type filter for comprehensive file discovery
     # Include all common content types for maximum discovery
-    comprehensive_content_types = [
-        'text/html', 'text/plain', 'text/xml', 'text/css',
-        'application/pdf', 'application/json', 'application/xml',
-        'application/zip', 'application/gzip', 'application/x-tar',
-        'application/msword', 'application/vnd.ms-excel', 'application/vnd.ms-powerpoint',
-        'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-        'image/jpeg', 'image/png', 'image/gif', 'image/svg+xml',
-        'audio/mpeg', 'audio/wav', 'video/mp4', 'video/avi',
-        'application/octet-stream'  # Catch-all for binary files
-    ]
-    
     filters.append(ContentTypeFilter(
-        allowed_types=comprehensive_content_types,
+        allowed_types=_COMPREHENSIVE_CONTENT_TYPES,
         check_extension=True
     ))
     
+    # A new chain per call: filters carry per-crawl statistics
     return FilterChain(filters)
 
 
+@lru_cache(maxsize=32)
+def _split_exclude_patterns(
+    exclude_patterns: Tuple[str, ...]
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Split exclusion globs into (path segment globs for the trie, everything else).
+    
+    Only this immutable classification is cached; the filters built from it
+    are created fresh for every chain.
+    """
+    segment_patterns = tuple(p for p in exclude_patterns if ExclusionTrie.supports(p))
+    other_patterns = tuple(p for p in exclude_patterns if not ExclusionTrie.supports(p))
+    return segment_patterns, other_patterns
+
+
 def configure_exhaustive_crawler_settings(crawler_config: dict) -> dict:
     """
     Configure crawler settings for exhaustive crawling behavior.
@@ -249,46 +325,10 @@ def create_exhaustive_strategy_preset(
     Returns:
         BFSDeepCrawlStrategy: Configured strategy for the specified preset
     """
-    presets = {
-        "comprehensive": {
-            "max_depth": 100,
-            "max_pages": 10000,
-            "max_concurrent_requests": 20,
-            "delay_between_requests": 0.1,
-            "enable_minimal_filtering": True,
-        },
-        "balanced": {
-            "max_depth": 50,
-            "max_pages": 5000,
-            "max_concurrent_requests": 15,
-            "delay_between_requests": 0.2,
-            "enable_minimal_filtering": True,
-        },
-        "fast": {
-            "max_depth": 25,
-            "max_pages": 2000,
-            "max_concurrent_requests": 25,
-            "delay_between_requests": 0.05,
-            "enable_minimal_filtering": True,
-        },
-        "files_focused": {
-            "max_depth": 75,
-            "max_pages": 7500,
-            "max_concurrent_requests": 15,
-            "delay_between_requests": 0.15,
-            "enable_minimal_filtering": True,
-            "file_extensions": [
-                'pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx',
-                'zip', 'tar', 'gz', 'rar', '7z', 'txt', 'csv',
-                'epub', 'mobi', 'json', 'xml'
-            ]
-        }
-    }
-    
-    if preset_name not in presets:
-        raise ValueError(f"Unknown preset '{preset_name}'. Available: {list(presets.keys())}")
+    if preset_name not in _STRATEGY_PRESETS:
+        raise ValueError(f"Unknown preset '{preset_name}'. Available: {list(_STRATEGY_PRESETS.keys())}")
     
-    preset_config = presets[preset_name].copy()
+    preset_config = dict(_STRATEGY_PRESETS[preset_name])
     preset_config.update(overrides)
     
     return create_exhaustive_bfs_strategy(**preset_config)
\ No newline at end of file
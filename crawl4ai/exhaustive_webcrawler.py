@@ -7,14 +7,96 @@ and revisit ratio analysis.
 """
 
 import asyncio
-from typing import Optional, List, Dict, Any, Union
+from collections import defaultdict
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Iterator, Set, Tuple, Union
+from urllib.parse import urlsplit, urlunsplit
+
+import xxhash
 
 from .async_webcrawler import AsyncWebCrawler
 from .async_configs import CrawlerRunConfig
-from .models import CrawlResult, RunManyReturn
+from .models import CrawlResult, CrawlResultContainer, RunManyReturn
 from .exhaustive_analytics import ExhaustiveAnalytics, DeadEndMetrics, URLTrackingState
 from .exhaustive_configs import ExhaustiveCrawlConfig
-from .async_logger import AsyncLoggerBase
+from .async_logger import AsyncLoggerBase, LogLevel
+
+
+# Query parameters that never change page content and only fragment the dedup sets
+_TRACKING_PARAMS = frozenset({'gclid', 'fbclid'})
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _canonical(url: str) -> str:
+    """
+    Build a canonical dedup key for a URL.
+    
+    Lowercases scheme and host, strips default ports, the fragment, tracking
+    query parameters (utm_*, gclid, fbclid) and trailing slashes, and sorts the
+    remaining query parameters so equivalent spellings of a page share one key.
+    URLs without a network location (raw:, relative hrefs) are returned as-is.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.netloc:
+        return url
+    
+    scheme = parts.scheme.lower()
+    host = parts.hostname or ''
+    if ':' in host:
+        host = f"[{host}]"  # IPv6 literal
+    netloc = host if port is None or _DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    if '@' in parts.netloc:
+        netloc = f"{parts.netloc.rsplit('@', 1)[0]}@{netloc}"
+    
+    path = parts.path.rstrip('/') or '/'
+    query = '&'.join(sorted(
+        param for param in parts.query.split('&')
+        if param and not (
+            param.lower().startswith('utm_')
+            or param.split('=', 1)[0].lower() in _TRACKING_PARAMS
+        )
+    ))
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+def _host_of(key: str) -> str:
+    """Return the host bucket of a canonical key ('' for host-less URLs)."""
+    scheme_sep = key.find('://')
+    if scheme_sep == -1:
+        return ''
+    return key[scheme_sep + 3:].split('/', 1)[0]
+
+
+@lru_cache(maxsize=100_000)
+def _dedup_key(url: str) -> Tuple[str, int]:
+    """
+    Return the (host bucket, 64-bit hash) dedup key of a URL.
+    
+    The hash is taken over the canonical form, so dedup sets hold 8-byte
+    ints instead of full URL strings. Cached since the same hrefs recur
+    across many pages.
+    """
+    key = _canonical(url)
+    return _host_of(key), xxhash.xxh64_intdigest(key)
+
+
+def _failed_result(url: str, error_message: str) -> CrawlResult:
+    """
+    Build the CrawlResult recorded for a URL that could not be crawled.
+    
+    Uses model_construct() to skip pydantic validation: the payload is fixed
+    and valid, and a dead host can produce thousands of these in one session.
+    """
+    return CrawlResult.model_construct(
+        url=url,
+        html="",
+        success=False,
+        error_message=error_message
+    )
 
 
 class ExhaustiveAsyncWebCrawler(AsyncWebCrawler):
@@ -43,10 +125,12 @@ class ExhaustiveAsyncWebCrawler(AsyncWebCrawler):
         """
         Run exhaustive crawling until dead ends are reached.
         
-        This method uses existing arun() as foundation and adds loop logic to continue
-        crawling until dead-end threshold is reached. It implements URL queue management
-        for continuing from discovered URLs and provides progress tracking using existing
-        crawl analytics.
+        This method uses existing arun() as foundation: a pool of
+        max_concurrent_requests workers pulls URLs from a shared queue and pushes
+        discovered URLs back onto it, so one slow page never holds up the others.
+        Crawling continues until the queue is drained, max_pages is reached or the
+        dead-end threshold is hit, with progress tracking using existing crawl
+        analytics.
         
         Args:
             start_url: The URL to start crawling from
@@ -67,92 +151,140 @@ class ExhaustiveAsyncWebCrawler(AsyncWebCrawler):
         
         try:
             # Start with the initial URL
-            all_results = []
-            crawl_queue = [start_url]  # URL queue for continuing from discovered URLs
+            all_results: List[CrawlResult] = []
+            # Work queue shared by the crawl workers; discovered URLs go straight
+            # back onto it so no worker waits for a batch to finish
+            url_queue: asyncio.Queue = asyncio.Queue()
+            url_queue.put_nowait(start_url)
+            # Dedup sets are keyed by canonical URL and bucketed by host so each
+            # probe only touches that host's slice; the queue keeps the original hrefs
+            start_host, start_key = _dedup_key(start_url)
+            seen_by_host: Dict[str, Set[int]] = defaultdict(set)  # URLs already crawled
+            queued_by_host: Dict[str, Set[int]] = defaultdict(set)  # URLs ever enqueued
+            seen_by_host[start_host].add(start_key)
+            queued_by_host[start_host].add(start_key)
             crawled_count = 0
+            enqueued_count = 1  # URLs ever put on the queue; capped at max_pages
+            stop_reason: Optional[str] = None
             
+            # Bind config values and collaborators once; they are read for every page
             log_stats = getattr(config, 'log_discovery_stats', True)
-            if self.logger and log_stats:
-                self.logger.info(
+            batch_size_cfg = getattr(config, 'batch_size', 5)
+            continue_on_dead_ends = getattr(config, 'continue_on_dead_ends', True)
+            worker_count = getattr(config, 'max_concurrent_requests', 20)
+            max_pages = config.max_pages
+            dead_end_threshold = config.dead_end_threshold
+            revisit_threshold = config.revisit_ratio_threshold
+            logger = self.logger
+            analytics = self.analytics
+            # Progress messages are only formatted when the logger would emit them
+            log_progress = bool(logger and log_stats and logger.is_enabled_for(LogLevel.INFO))
+            
+            if logger and log_stats:
+                logger.info(
                     f"Starting exhaustive crawl from {start_url}",
                     tag="EXHAUST"
                 )
             
-            while crawl_queue and self._exhaustive_session_active and crawled_count < config.max_pages:
-                # Get next batch of URLs to crawl
-                batch_urls = []
-                batch_size = min(getattr(config, 'batch_size', 5), len(crawl_queue))
-                
-                for _ in range(batch_size):
-                    if crawl_queue:
-                        batch_urls.append(crawl_queue.pop(0))
-                
-                if not batch_urls:
-                    break
-                
-                # Crawl the batch using existing arun() as foundation
-                batch_results = await self._crawl_batch(batch_urls, config, **kwargs)
-                all_results.extend(batch_results)
-                crawled_count += len(batch_results)
-                
-                # Analyze results for dead-end detection and URL discovery
-                for i, result in enumerate(batch_results):
-                    source_url = batch_urls[i] if i < len(batch_urls) else None
-                    analysis = self.analytics.analyze_crawl_results([result], source_url)
-                    
-                    # Add newly discovered URLs to the queue
-                    if result.success and hasattr(result, 'links') and result.links:
-                        new_urls = self._extract_urls_from_result(result, config)
-                        for new_url in new_urls:
-                            if new_url not in [r.url for r in all_results] and new_url not in crawl_queue:
-                                crawl_queue.append(new_url)
-                
-                # Log progress using existing crawl analytics
-                log_stats = getattr(config, 'log_discovery_stats', True)
-                if self.logger and log_stats:
-                    total_analysis = self.analytics.analyze_crawl_results(batch_results)
-                    self.logger.info(
-                        f"Batch complete: {len(batch_results)} pages crawled, "
-                        f"{total_analysis['new_urls_discovered']} new URLs discovered, "
-                        f"{len(crawl_queue)} URLs in queue, "
-                        f"dead pages: {total_analysis['consecutive_dead_pages']}, "
-                        f"revisit ratio: {total_analysis['revisit_ratio']:.2%}",
-                        tag="PROGRESS"
-                    )
-                
-                # Check if we should stop based on dead-end detection
-                should_stop, stop_reason = self.analytics.should_stop_crawling(
-                    dead_end_threshold=config.dead_end_threshold,
-                    revisit_threshold=config.revisit_ratio_threshold
+            def request_stop(reason: str) -> None:
+                nonlocal stop_reason
+                if stop_reason is None:
+                    stop_reason = reason
+                    if logger:
+                        logger.info(f"Stopping exhaustive crawl: {reason}", tag="COMPLETE")
+            
+            async def crawl_worker() -> None:
+                nonlocal crawled_count, enqueued_count
+                while True:
+                    url = await url_queue.get()
+                    try:
+                        # Once stopped, drain the queue without crawling so join() returns
+                        if stop_reason is not None or not self._exhaustive_session_active:
+                            continue
+                        
+                        result = await self._crawl_url(url, **kwargs)
+                        await self._on_page_crawled(result, url)
+                        all_results.append(result)
+                        crawled_count += 1
+                        
+                        # Analyze the page for dead-end detection; the analysis
+                        # also carries the stop check for the updated metrics
+                        analysis = analytics.analyze_crawl_results(
+                            [result],
+                            [url],
+                            dead_end_threshold=dead_end_threshold,
+                            revisit_threshold=revisit_threshold
+                        )
+                        result_host, result_key = _dedup_key(result.url)
+                        seen_by_host[result_host].add(result_key)
+                        
+                        # Enqueue newly discovered URLs, but only as many as can still be
+                        # crawled before max_pages; pages whose links were all discovered
+                        # before cannot add queue entries
+                        if (
+                            stop_reason is None
+                            and enqueued_count < max_pages
+                            and analysis['new_urls_discovered']
+                        ):
+                            for new_url in self._iter_urls_from_result(result, config):
+                                host, key = _dedup_key(new_url)
+                                if key not in seen_by_host[host] and key not in queued_by_host[host]:
+                                    url_queue.put_nowait(new_url)
+                                    queued_by_host[host].add(key)
+                                    enqueued_count += 1
+                                    if enqueued_count >= max_pages:
+                                        break
+                        
+                        # Log progress using existing crawl analytics
+                        if log_progress and crawled_count % batch_size_cfg == 0:
+                            logger.info(
+                                f"Progress: {crawled_count} pages crawled, "
+                                f"{analytics.metrics.total_urls_discovered} URLs discovered, "
+                                f"{url_queue.qsize()} URLs in queue, "
+                                f"dead pages: {analysis['consecutive_dead_pages']}, "
+                                f"revisit ratio: {analysis['revisit_ratio']:.2%}",
+                                tag="PROGRESS"
+                            )
+                        
+                        # Check if we should stop based on dead-end detection
+                        if not analysis['should_continue']:
+                            request_stop(analysis['stop_reason'])
+                        elif not continue_on_dead_ends and analysis['consecutive_dead_pages'] > 0:
+                            request_stop("Dead end reached and continue_on_dead_ends disabled")
+                    finally:
+                        url_queue.task_done()
+            
+            # Persistent workers keep max_concurrent_requests pages in flight; the
+            # crawl ends when the queue is drained or a worker fails
+            workers = [asyncio.create_task(crawl_worker()) for _ in range(worker_count)]
+            queue_drained = asyncio.create_task(url_queue.join())
+            try:
+                done, _ = await asyncio.wait(
+                    [queue_drained, *workers], return_when=asyncio.FIRST_COMPLETED
                 )
-                
-                if should_stop:
-                    if self.logger:
-                        self.logger.info(f"Stopping exhaustive crawl: {stop_reason}", tag="COMPLETE")
-                    break
-                
-                # Continue crawling if we have URLs in queue and haven't hit limits
-                continue_on_dead_ends = getattr(config, 'continue_on_dead_ends', True)
-                if not continue_on_dead_ends and total_analysis['consecutive_dead_pages'] > 0:
-                    if self.logger:
-                        self.logger.info("Stopping due to dead end and continue_on_dead_ends=False", tag="COMPLETE")
-                    stop_reason = "Dead end reached and continue_on_dead_ends disabled"
-                    break
+            finally:
+                for task in (queue_drained, *workers):
+                    task.cancel()
+                await asyncio.gather(queue_drained, *workers, return_exceptions=True)
+            for task in done:
+                if task is not queue_drained:
+                    task.result()  # Re-raise the worker's error
+            urls_in_queue = enqueued_count - crawled_count
             
             # Determine final stop reason if not already set
-            if 'stop_reason' not in locals():
-                if crawled_count >= config.max_pages:
-                    stop_reason = f"Maximum pages limit reached ({config.max_pages})"
-                elif not crawl_queue:
+            if stop_reason is None:
+                if crawled_count >= max_pages:
+                    stop_reason = f"Maximum pages limit reached ({max_pages})"
+                elif not urls_in_queue:
                     stop_reason = "No more URLs to crawl"
                 else:
                     stop_reason = "Session ended"
             
             # Get final analytics using existing crawl analytics
-            final_stats = self.analytics.get_comprehensive_stats()
+            final_stats = analytics.get_comprehensive_stats()
             
-            if self.logger:
-                self.logger.info(
+            if logger:
+                logger.info(
                     f"Exhaustive crawl completed: {len(all_results)} pages crawled, "
                     f"{final_stats['session_stats']['total_urls_discovered']} URLs discovered",
                     tag="COMPLETE"
@@ -165,18 +297,58 @@ class ExhaustiveAsyncWebCrawler(AsyncWebCrawler):
                 'total_pages_crawled': len(all_results),
                 'successful_pages': len([r for r in all_results if r.success]),
                 'total_urls_discovered': final_stats['session_stats']['total_urls_discovered'],
-                'urls_in_queue': len(crawl_queue)
+                'urls_in_queue': urls_in_queue
             }
             
         finally:
             self._exhaustive_session_active = False
     
+    async def _crawl_url(self, url: str, **kwargs) -> CrawlResult:
+        """
+        Crawl a single URL with arun(), returning a failed result instead of raising.
+        
+        Args:
+            url: URL to crawl
+            **kwargs: Additional arguments passed to arun
+            
+        Returns:
+            CrawlResult for the URL
+        """
+        try:
+            result = await self.arun(url=url, config=CrawlerRunConfig(), **kwargs)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error crawling {url}: {str(e)}", tag="CRAWL")
+            return _failed_result(url, str(e))
+        
+        if isinstance(result, CrawlResultContainer) and len(result):
+            result = result[0]
+        if not isinstance(result, CrawlResult):
+            if self.logger:
+                self.logger.warning(f"Unexpected result type from arun: {type(result)}", tag="CRAWL")
+            return _failed_result(url, "No crawl result returned")
+        return result
+    
+    async def _on_page_crawled(self, result: CrawlResult, url: str) -> None:
+        """
+        Hook run for every crawled page before its links are queued.
+        
+        Subclasses override this to process each result as it arrives, such as
+        file discovery; the default does nothing.
+        
+        Args:
+            result: CrawlResult of the page
+            url: URL the page was requested as
+        """
+    
     async def _crawl_batch(self, urls: List[str], config: CrawlerRunConfig, **kwargs) -> List[CrawlResult]:
         """
-        Crawl a batch of URLs using the existing arun infrastructure as foundation.
+        Crawl a batch of URLs one after another with _crawl_url().
         
-        This method uses existing arun() method as the foundation for crawling,
-        ensuring compatibility with all existing AsyncWebCrawler functionality.
+        arun_exhaustive() crawls through its worker pool instead; this is kept
+        for callers that crawl a fixed list of URLs. Each result goes through
+        _on_page_crawled() like a page crawled by the workers, and results are
+        returned in the same order as `urls`.
         
         Args:
             urls: List of URLs to crawl
@@ -186,105 +358,62 @@ class ExhaustiveAsyncWebCrawler(AsyncWebCrawler):
         Returns:
             List of CrawlResult objects
         """
-        if not urls:
-            return []
-        
         results = []
-        
-        try:
-            # Create a basic CrawlerRunConfig for batch operations to avoid attribute issues
-            from .async_configs import CrawlerRunConfig
-            batch_config = CrawlerRunConfig()
-            
-            for url in urls:
-                try:
-                    # Use existing arun() as foundation - this ensures all existing
-                    # functionality (caching, processing, etc.) works correctly
-                    result_container = await self.arun(url, config=batch_config, **kwargs)
-                    
-                    # Extract CrawlResult from container if needed
-                    if hasattr(result_container, 'result'):
-                        # It's a CrawlResultContainer
-                        crawl_result = result_container.result
-                    elif hasattr(result_container, 'url'):
-                        # It's already a CrawlResult
-                        crawl_result = result_container
-                    else:
-                        # Handle unexpected return type
-                        if self.logger:
-                            self.logger.warning(f"Unexpected result type from arun: {type(result_container)}", tag="BATCH")
-                        continue
-                    
-                    results.append(crawl_result)
-                    
-                except Exception as e:
-                    if self.logger:
-                        self.logger.error(f"Error crawling URL {url}: {str(e)}", tag="BATCH")
-                    
-                    # Create a failed result to maintain consistency
-                    from .models import CrawlResult
-                    failed_result = CrawlResult(
-                        url=url,
-                        html="",
-                        success=False,
-                        error_message=str(e)
-                    )
-                    results.append(failed_result)
-                
-        except Exception as e:
-            if self.logger:
-                self.logger.error(f"Error in batch crawling: {str(e)}", tag="BATCH")
-        
+        for url in urls:
+            result = await self._crawl_url(url, **kwargs)
+            await self._on_page_crawled(result, url)
+            results.append(result)
         return results
     
-    def _extract_urls_from_result(self, result: CrawlResult, config: ExhaustiveCrawlConfig) -> List[str]:
+    def _iter_urls_from_result(self, result: CrawlResult, config: ExhaustiveCrawlConfig) -> Iterator[str]:
         """
-        Extract URLs from a crawl result for URL queue management.
+        Lazily yield URLs from a crawl result for URL queue management.
         
-        This method extracts internal and external links from crawl results
-        to continue crawling from discovered URLs.
+        This method yields internal and external links from crawl results
+        to continue crawling from discovered URLs. No deduplication is done
+        here; callers check each URL against their own seen/queued sets and can
+        stop iterating early without building the full list.
         
         Args:
             result: CrawlResult object to extract URLs from
             config: Configuration to determine which URLs to include
             
-        Returns:
-            List of URLs discovered in the result
+        Yields:
+            URLs discovered in the result, in page order
         """
-        urls = []
-        
         if not result.success or not hasattr(result, 'links') or not result.links:
-            return urls
+            return
         
         try:
-            # Extract internal links (always included)
-            internal_links = result.links.get('internal', [])
-            for link in internal_links:
-                if isinstance(link, dict) and 'href' in link:
-                    url = link['href']
-                    if url and url not in urls:
-                        urls.append(url)
-                elif isinstance(link, str):
-                    if link and link not in urls:
-                        urls.append(link)
-            
-            # Extract external links if configured
-            include_external = getattr(config, 'include_external_links', False)
-            if include_external:
-                external_links = result.links.get('external', [])
-                for link in external_links:
-                    if isinstance(link, dict) and 'href' in link:
-                        url = link['href']
-                        if url and url not in urls:
-                            urls.append(url)
-                    elif isinstance(link, str):
-                        if link and link not in urls:
-                            urls.append(link)
+            # Hrefs are flattened once per result, so repeated passes over the
+            # same page skip the dict/str handling of each link
+            yield from result.internal_hrefs
+            # External links are only included if configured
+            if getattr(config, 'include_external_links', False):
+                yield from result.external_hrefs
         
         except Exception as e:
             if self.logger:
                 self.logger.warning(f"Error extracting URLs from result: {str(e)}", tag="URL_EXTRACT")
+    
+    def _extract_urls_from_result(self, result: CrawlResult, config: ExhaustiveCrawlConfig) -> List[str]:
+        """
+        Extract the distinct URLs of a crawl result as a list.
         
+        Args:
+            result: CrawlResult object to extract URLs from
+            config: Configuration to determine which URLs to include
+            
+        Returns:
+            List of URLs discovered in the result, deduplicated by canonical form
+        """
+        urls = []
+        seen = set()  # Dedup keys of URLs already in `urls`
+        for url in self._iter_urls_from_result(result, config):
+            key = _dedup_key(url)
+            if key not in seen:
+                seen.add(key)
+                urls.append(url)
         return urls
     
     async def analyze_url_discovery_rate(self, results: List[CrawlResult]) -> Dict[str, Any]:
@@ -390,7 +519,7 @@ class ExhaustiveAsyncWebCrawler(AsyncWebCrawler):
                 'average_discovery_rate': metrics.average_discovery_rate,
                 'time_since_last_discovery': str(metrics.time_since_last_discovery) if metrics.time_since_last_discovery else None
             },
-            'discovery_trend': metrics.discovery_rate_history[-5:] if len(metrics.discovery_rate_history) >= 5 else metrics.discovery_rate_history
+            'discovery_trend': metrics.recent_discovery_rates(5)
         }
     
     async def stop_exhaustive_crawling(self) -> None:
@@ -16,9 +16,15 @@ Features:
 
 import re
 import mimetypes
-from typing import List, Set, Dict, Optional, Union, Pattern
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import accumulate
+from types import MappingProxyType
+from typing import Iterator, List, Set, Dict, Optional, Tuple, Union, Pattern
 from urllib.parse import urlparse, unquote
-from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
@@ -27,6 +33,131 @@ import logging
 from .deep_crawling.filters import URLFilter, FilterStats
 from .async_logger import AsyncLogger
 
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# File size hints carried in URL parameters or paths (size=, filesize=, bytes=, length=)
+_SIZE_HINT_RE = re.compile(r'(?:size|filesize|bytes|length)=(\d+)', re.IGNORECASE)
+
+# MIME types expected for common file extensions; other extensions accept any type
+_EXPECTED_MIME_TYPES = MappingProxyType({
+    '.pdf': frozenset({'application/pdf'}),
+    '.doc': frozenset({'application/msword'}),
+    '.docx': frozenset({'application/vnd.openxmlformats-officedocument.wordprocessingml.document'}),
+    '.xls': frozenset({'application/vnd.ms-excel'}),
+    '.xlsx': frozenset({'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'}),
+    '.ppt': frozenset({'application/vnd.ms-powerpoint'}),
+    '.pptx': frozenset({'application/vnd.openxmlformats-officedocument.presentationml.presentation'}),
+    '.zip': frozenset({'application/zip'}),
+    '.csv': frozenset({'text/csv', 'application/csv'}),
+    '.json': frozenset({'application/json'}),
+    '.xml': frozenset({'application/xml', 'text/xml'}),
+})
+
+# Path component of a URL (RFC 3986, appendix B)
+_URL_PATH_RE = re.compile(r'^(?:[^:/?#]+:)?(?://[^/?#]*)?([^?#]*)')
+
+
+@lru_cache(maxsize=32)
+def _batch_candidate_regex(extensions: frozenset) -> Pattern:
+    """
+    Compile the line regex used by apply_batch() for a set of target extensions.
+    
+    A line matches if it contains '%' or ';' (the suffix may be hidden) or one
+    of the extensions followed by optional slashes and a '?', '#' or line end.
+    This is a superset of the URLs apply() can accept.
+    """
+    suffixes = "|".join(sorted(re.escape(ext[1:]) for ext in extensions if len(ext) > 1))
+    if not suffixes:
+        return re.compile(r'(?m)^[^\n]*?[%;]')
+    return re.compile(
+        rf'(?mi)^[^\n]*?(?:[%;]|\.(?:{suffixes})/*(?=[?#\n]|$))'
+    )
+
+
+# Directories whose repository path is remembered per filter
+_REPOSITORY_PATH_CACHE_SIZE = 2048
+_CACHE_MISS = object()
+
+# A repository pattern the marker automaton can take: literal characters, each
+# optionally followed by '?' (e.g. r'/downloads?/')
+_LITERAL_PATTERN_RE = re.compile(r'(?:[\w/-]\??)*')
+_MAX_LITERAL_VARIANTS = 16
+
+
+def _literal_variants(pattern: str) -> Optional[List[str]]:
+    """
+    Expand a repository pattern into the lowercased literal strings it matches.
+    
+    Returns None for anything beyond plain characters with optional '?', or if
+    the expansion would exceed _MAX_LITERAL_VARIANTS strings.
+    """
+    if not pattern or not _LITERAL_PATTERN_RE.fullmatch(pattern):
+        return None
+    variants = ['']
+    for char, optional in re.findall(r'([\w/-])(\??)', pattern.lower()):
+        variants = [v + char for v in variants] + (variants if optional else [])
+        if len(variants) > _MAX_LITERAL_VARIANTS:
+            return None
+    return variants
+
+
+def _build_marker_automaton(patterns: List[str]):
+    """
+    Build an Aho-Corasick automaton over the literal expansions of patterns.
+    
+    Each keyword maps to (pattern index, keyword length) so the leftmost match,
+    and among equal starts the earliest pattern, can be chosen as the combined
+    regex would. Returns None if ahocorasick is missing or a pattern is not
+    literal.
+    """
+    if not HAS_AHOCORASICK or not patterns:
+        return None
+    automaton = ahocorasick.Automaton()
+    for index, pattern in enumerate(patterns):
+        variants = _literal_variants(pattern)
+        if variants is None:
+            return None
+        for keyword in variants:
+            if keyword and keyword not in automaton:
+                automaton.add_word(keyword, (index, len(keyword)))
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=8192)
+def _split_file_path(url: str) -> Tuple[str, str, str]:
+    """
+    Split a URL into its decoded path, filename and lowercased extension.
+    
+    Gives the same result as urlparse + unquote + Path(...).name/.suffix, but
+    only URLs with percent-escapes or ';' path parameters go through urlparse;
+    the rest are split with a single regex match and string slicing. Cached,
+    since the same links show up on many pages of a crawl.
+    
+    URLs with brackets or non-ASCII characters also go through urlparse, so
+    the netlocs it rejects (such as an unclosed IPv6 bracket) still raise
+    ValueError.
+    """
+    if '%' in url or ';' in url or '[' in url or ']' in url or not url.isascii():
+        path = unquote(urlparse(url).path)
+    else:
+        path = _URL_PATH_RE.match(url).group(1)
+    
+    filename = path.rstrip('/').rpartition('/')[2]
+    dot = filename.rfind('.')
+    extension = filename[dot:].lower() if 0 < dot < len(filename) - 1 else ''
+    return path, filename, extension
+
 
 class FileType(Enum):
     """Enumeration of supported file types for discovery."""
@@ -42,7 +173,7 @@ class FileType(Enum):
     OTHER = "other"
 
 
-@dataclass
+@dataclass(slots=True)
 class FileMetadata:
     """Metadata for discovered files."""
     url: str
@@ -56,39 +187,110 @@ class FileMetadata:
     repository_path: Optional[str] = None
     
     def __post_init__(self):
-        """Post-initialization to set derived fields."""
-        if not self.mime_type:
-            self.mime_type, _ = mimetypes.guess_type(self.url)
+        """Normalize the extension once so consumers can use it as a key."""
+        self.extension = self.extension.lower()
+    
+    @property
+    def mime_type_guessed(self) -> Optional[str]:
+        """The known MIME type, or one guessed from the URL on access."""
+        if self.mime_type is None:
+            return mimetypes.guess_type(self.url)[0]
+        return self.mime_type
 
 
-@dataclass
+@dataclass(slots=True)
 class FileDiscoveryStats:
     """Statistics for file discovery operations."""
     total_files_discovered: int = 0
-    files_by_type: Dict[FileType, int] = field(default_factory=dict)
-    files_by_extension: Dict[str, int] = field(default_factory=dict)
+    files_by_type: Counter = field(default_factory=Counter)
+    files_by_extension: Counter = field(default_factory=Counter)
     repository_paths: Set[str] = field(default_factory=set)
     
     def add_file(self, file_metadata: FileMetadata):
         """Add a discovered file to statistics."""
         self.total_files_discovered += 1
         
-        # Update type counts
-        if file_metadata.file_type not in self.files_by_type:
-            self.files_by_type[file_metadata.file_type] = 0
+        # Update type and extension counts
         self.files_by_type[file_metadata.file_type] += 1
-        
-        # Update extension counts
-        ext = file_metadata.extension.lower()
-        if ext not in self.files_by_extension:
-            self.files_by_extension[ext] = 0
-        self.files_by_extension[ext] += 1
+        self.files_by_extension[file_metadata.extension] += 1
         
         # Track repository paths
         if file_metadata.repository_path:
             self.repository_paths.add(file_metadata.repository_path)
 
 
+class _FileColumns(Sequence):
+    """
+    Discovered files stored column-wise, one list per FileMetadata field.
+    
+    Behaves as a read-only sequence of FileMetadata (built on access) with
+    append() and clear(), so a crawl with many hits holds a few long lists
+    instead of one object per file. Fields apply() never sets
+    (estimated_size, source_url, discovery_timestamp) are not stored.
+    """
+    __slots__ = ('url', 'filename', 'extension', 'file_type', 'mime_type', 'repository_path')
+    
+    # file_type is stored as a one-byte index into this tuple
+    _FILE_TYPES = tuple(FileType)
+    _FILE_TYPE_INDEX = MappingProxyType({file_type: i for i, file_type in enumerate(_FILE_TYPES)})
+    
+    def __init__(self):
+        self.url: List[str] = []
+        self.filename: List[str] = []
+        self.extension: List[str] = []
+        self.file_type = array('B')
+        self.mime_type: List[Optional[str]] = []
+        self.repository_path: List[Optional[str]] = []
+    
+    def append(self, file_metadata: FileMetadata) -> None:
+        """Store one discovered file."""
+        self.url.append(file_metadata.url)
+        self.filename.append(file_metadata.filename)
+        self.extension.append(file_metadata.extension)
+        self.file_type.append(self._FILE_TYPE_INDEX[file_metadata.file_type])
+        self.mime_type.append(file_metadata.mime_type)
+        self.repository_path.append(file_metadata.repository_path)
+    
+    def clear(self) -> None:
+        """Remove all stored files."""
+        self.__init__()
+    
+    def rows(self) -> Iterator[Tuple[str, str, str, FileType, Optional[str], Optional[str]]]:
+        """Iterate over (url, filename, extension, file_type, mime_type, repository_path) tuples."""
+        file_types = self._FILE_TYPES
+        return zip(
+            self.url, self.filename, self.extension,
+            (file_types[i] for i in self.file_type),
+            self.mime_type, self.repository_path
+        )
+    
+    def __len__(self) -> int:
+        return len(self.url)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return FileMetadata(
+            url=self.url[index],
+            filename=self.filename[index],
+            extension=self.extension[index],
+            file_type=self._FILE_TYPES[self.file_type[index]],
+            mime_type=self.mime_type[index],
+            repository_path=self.repository_path[index]
+        )
+    
+    def __iter__(self) -> Iterator[FileMetadata]:
+        for url, filename, extension, file_type, mime_type, repository_path in self.rows():
+            yield FileMetadata(
+                url=url,
+                filename=filename,
+                extension=extension,
+                file_type=file_type,
+                mime_type=mime_type,
+                repository_path=repository_path
+            )
+
+
 class FileDiscoveryFilter(URLFilter):
     """
     File discovery filter that extends existing URLFilter architecture.
@@ -142,6 +344,13 @@ class FileDiscoveryFilter(URLFilter):
         }
     }
     
+    # Reverse lookup from file extension to file type, built once for all instances
+    EXTENSION_TO_TYPE = MappingProxyType({
+        ext.lower(): file_type
+        for file_type, extensions in DEFAULT_EXTENSIONS.items()
+        for ext in extensions
+    })
+    
     # Common file repository URL patterns
     DEFAULT_REPOSITORY_PATTERNS = [
         r'/downloads?/',
@@ -193,32 +402,38 @@ class FileDiscoveryFilter(URLFilter):
         self.enable_mime_validation = enable_mime_validation
         self.track_repository_paths = track_repository_paths
         self.max_file_size_mb = max_file_size_mb
+        self._max_file_size_bytes = max_file_size_mb * 1024 * 1024 if max_file_size_mb else None
         
-        # Build target extensions set
-        self.target_extensions = set()
+        # Build target extensions set; frozen once built since apply() only reads it
+        targets = set()
         if target_extensions:
-            self.target_extensions.update(
+            targets.update(
                 ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
                 for ext in target_extensions
             )
         elif target_file_types:
             for file_type in target_file_types:
                 if file_type in self.DEFAULT_EXTENSIONS:
-                    self.target_extensions.update(self.DEFAULT_EXTENSIONS[file_type])
+                    targets.update(self.DEFAULT_EXTENSIONS[file_type])
         else:
             # Default to document and data files
             for file_type in [FileType.DOCUMENT, FileType.SPREADSHEET, FileType.PRESENTATION, FileType.DATA]:
-                self.target_extensions.update(self.DEFAULT_EXTENSIONS[file_type])
+                targets.update(self.DEFAULT_EXTENSIONS[file_type])
+        self.target_extensions = frozenset(targets)
+        # Non-ASCII extensions can never match the ASCII-lowercased byte suffix
+        self._target_ext_bytes = frozenset(
+            ext.encode('ascii') for ext in self.target_extensions if ext.isascii()
+        )
         
         # Build exclude extensions set
-        self.exclude_extensions = set()
-        if exclude_extensions:
-            self.exclude_extensions.update(
-                ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
-                for ext in exclude_extensions
-            )
+        self.exclude_extensions = frozenset(
+            ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
+            for ext in exclude_extensions or ()
+        )
         
-        # Compile repository patterns
+        # Compile repository patterns; each is validated on its own so one bad
+        # pattern is skipped, then the valid ones are merged into one alternation
+        # so a path is scanned once instead of once per pattern
         self.repository_patterns = []
         patterns = repository_patterns or self.DEFAULT_REPOSITORY_PATTERNS
         for pattern in patterns:
@@ -227,13 +442,36 @@ class FileDiscoveryFilter(URLFilter):
             except re.error as e:
                 if self._custom_logger:
                     self._custom_logger.warning(f"Invalid repository pattern '{pattern}': {e}")
+        self._repository_regex: Optional[Pattern] = None
+        if self.repository_patterns:
+            self._repository_regex = re.compile(
+                "|".join(f"(?:{p.pattern})" for p in self.repository_patterns),
+                re.IGNORECASE
+            )
+        # With pyahocorasick installed and only literal patterns, the markers are
+        # found in one linear scan instead of trying each alternative per position
+        self._repository_automaton = _build_marker_automaton(
+            [p.pattern for p in self.repository_patterns]
+        )
+        # Fewest slashes a path needs to contain any marker, e.g. 2 for '/files/';
+        # 0 (always scan) when some pattern is not a plain literal
+        self._repository_min_slashes = 0
+        # Whether every marker ends in '/', so a match never reaches past the
+        # file's directory and results can be cached per directory
+        self._repository_dir_only = False
+        if self.repository_patterns:
+            variants = [_literal_variants(p.pattern) for p in self.repository_patterns]
+            if all(variants):
+                self._repository_min_slashes = min(
+                    v.count('/') for vs in variants for v in vs
+                )
+                self._repository_dir_only = all(v.endswith('/') for vs in variants for v in vs)
+        # Repository path per directory (or per path), oldest entries evicted first
+        self._repository_path_cache: Dict[str, Optional[str]] = {}
         
         # File discovery statistics
         self.discovery_stats = FileDiscoveryStats()
-        self.discovered_files: List[FileMetadata] = []
-        
-        # Extension to file type mapping
-        self._build_extension_mapping()
+        self.discovered_files = _FileColumns()
         
         if self._custom_logger:
             self._custom_logger.info(
@@ -241,13 +479,6 @@ class FileDiscoveryFilter(URLFilter):
                 tag="FILE_FILTER"
             )
     
-    def _build_extension_mapping(self):
-        """Build mapping from file extensions to file types."""
-        self.extension_to_type = {}
-        for file_type, extensions in self.DEFAULT_EXTENSIONS.items():
-            for ext in extensions:
-                self.extension_to_type[ext.lower()] = file_type
-    
     def apply(self, url: str) -> bool:
         """
         Apply the file discovery filter to a URL.
@@ -258,121 +489,170 @@ class FileDiscoveryFilter(URLFilter):
         Returns:
             bool: True if the URL represents a discoverable file, False otherwise
         """
-        try:
-            # Parse URL
-            parsed_url = urlparse(url)
-            path = unquote(parsed_url.path)
-            
-            # Extract filename and extension
-            filename = Path(path).name
-            if not filename or '.' not in filename:
-                self._update_stats(False)
-                return False
-            
-            # Get file extension
-            extension = Path(filename).suffix.lower()
-            if not extension:
-                self._update_stats(False)
-                return False
-            
-            # Check if extension is excluded
-            if extension in self.exclude_extensions:
-                self._update_stats(False)
-                return False
-            
-            # Check if extension is in target extensions
-            if extension not in self.target_extensions:
-                self._update_stats(False)
-                return False
-            
-            # Validate MIME type if enabled
-            if self.enable_mime_validation:
-                mime_type, _ = mimetypes.guess_type(url)
-                if mime_type and not self._is_valid_mime_type(mime_type, extension):
-                    if self._custom_logger:
-                        self._custom_logger.debug(
-                            f"MIME type mismatch for {url}: {mime_type} vs {extension}",
-                            tag="FILE_FILTER"
-                        )
-                    self._update_stats(False)
-                    return False
-            
-            # Check file size hints in URL (if available)
-            if self.max_file_size_mb and not self._check_size_hints(url):
-                self._update_stats(False)
+        # Bind the attributes read on every call once, up front
+        target = self.target_extensions
+        exclude = self.exclude_extensions
+        ext_to_type = self.EXTENSION_TO_TYPE
+        update_stats = self._update_stats
+        
+        # Most URLs are pages, not files: reject them on the raw suffix before
+        # any parsing. Percent-escapes and ';' path parameters can hide the
+        # real suffix, so those URLs always take the full route below.
+        if '%' not in url and ';' not in url:
+            bare = url.split('?', 1)[0].split('#', 1)[0].rstrip('/')
+            dot = bare.rfind('.')
+            if dot == -1 or bare[dot:].lower() not in target:
+                update_stats(False)
                 return False
-            
-            # Create file metadata
-            file_type = self.extension_to_type.get(extension, FileType.OTHER)
-            repository_path = self._extract_repository_path(path) if self.track_repository_paths else None
-            
-            file_metadata = FileMetadata(
-                url=url,
-                filename=filename,
-                extension=extension,
-                file_type=file_type,
-                repository_path=repository_path
-            )
-            
-            # Add to discovered files and update statistics
-            self.discovered_files.append(file_metadata)
-            self.discovery_stats.add_file(file_metadata)
-            
+        
+        # Extract path, filename and extension; urlparse rejects malformed
+        # netlocs such as an unclosed IPv6 bracket
+        try:
+            path, filename, extension = _split_file_path(url)
+        except ValueError as e:
             if self._custom_logger:
-                self._custom_logger.info(
-                    f"Discovered {file_type.value} file: {filename}",
+                self._custom_logger.error(f"Error processing URL {url}: {e}", tag="FILE_FILTER")
+            update_stats(False)
+            return False
+        if not extension:
+            update_stats(False)
+            return False
+        
+        # Check if extension is excluded
+        if extension in exclude:
+            update_stats(False)
+            return False
+        
+        # Check if extension is in target extensions
+        if extension not in target:
+            update_stats(False)
+            return False
+        
+        # Validate MIME type if enabled. Servers often mislabel files, so a
+        # mismatch is only logged and never rejects the file
+        mime_type = None
+        if self.enable_mime_validation:
+            mime_type, _ = mimetypes.guess_type(url)
+            if mime_type and self._custom_logger and not self._is_valid_mime_type(mime_type, extension):
+                self._custom_logger.debug(
+                    f"Unexpected MIME type {mime_type} for extension {extension}, but allowing it",
                     tag="FILE_FILTER"
                 )
+        
+        # Check file size hints in URL (if available)
+        if self._max_file_size_bytes is not None and not self._check_size_hints(url):
+            update_stats(False)
+            return False
+        
+        # Create file metadata
+        file_type = ext_to_type.get(extension, FileType.OTHER)
+        repository_path = None
+        if self.track_repository_paths and path.count('/') >= self._repository_min_slashes:
+            repository_path = self._extract_repository_path(path)
+        
+        file_metadata = FileMetadata(
+            url=url,
+            filename=filename,
+            extension=extension,
+            file_type=file_type,
+            mime_type=mime_type,
+            repository_path=repository_path
+        )
+        
+        # Add to discovered files and update statistics
+        self.discovered_files.append(file_metadata)
+        self.discovery_stats.add_file(file_metadata)
+        
+        if self._custom_logger:
+            self._custom_logger.info(
+                f"Discovered {file_type.value} file: {filename}",
+                tag="FILE_FILTER"
+            )
+        
+        update_stats(True)
+        return True
+    
+    def apply_batch(self, urls: List[str]) -> List[bool]:
+        """
+        Apply the filter to many URLs at once, e.g. a batch from AsyncUrlSeeder.
+        
+        The URLs are joined into one buffer and scanned by a single regex that
+        picks the lines which could name a target file; only those go through
+        apply(), the rest are rejected in bulk. Results, statistics and the
+        discovered files are the same as calling apply() on each URL in order.
+        
+        Args:
+            urls: The URLs to analyze
             
-            self._update_stats(True)
-            return True
+        Returns:
+            List[bool]: One result per URL, in input order
+        """
+        results = [False] * len(urls)
+        if not urls:
+            return results
+        
+        buffer = "\n".join(urls)
+        if buffer.count("\n") != len(urls) - 1:
+            # A URL with an embedded newline would shift the line mapping
+            return [self.apply(url) for url in urls]
+        
+        # Offset of the first character of each URL in the buffer
+        line_starts = [0, *accumulate(map((1).__add__, map(len, urls)))]
+        regex = _batch_candidate_regex(self.target_extensions)
+        candidates = [bisect_right(line_starts, m.start()) - 1 for m in regex.finditer(buffer)]
+        
+        for index in candidates:
+            results[index] = self.apply(urls[index])
+        
+        # Everything else is rejected without being looked at individually
+        rejected = len(urls) - len(candidates)
+        self.stats._counters[0] += rejected  # total
+        self.stats._counters[2] += rejected  # rejected
+        return results
+    
+    def apply_bytes(self, url: bytes) -> bool:
+        """
+        Apply the filter to a URL given as raw bytes, e.g. read from a socket or file.
+        
+        Pages are rejected on their byte suffix without decoding; only URLs that
+        may name a target file are decoded and passed to apply().
+        
+        Args:
+            url: The UTF-8 encoded URL to analyze
             
-        except Exception as e:
+        Returns:
+            bool: True if the URL represents a discoverable file, False otherwise
+        """
+        if b'%' not in url and b';' not in url:
+            bare = url.split(b'?', 1)[0].split(b'#', 1)[0].rstrip(b'/')
+            dot = bare.rfind(b'.')
+            if dot == -1 or bare[dot:].lower() not in self._target_ext_bytes:
+                self._update_stats(False)
+                return False
+        
+        try:
+            decoded = url.decode('utf-8')
+        except UnicodeDecodeError as e:
             if self._custom_logger:
-                self._custom_logger.error(f"Error processing URL {url}: {e}", tag="FILE_FILTER")
+                self._custom_logger.error(f"Error decoding URL {url!r}: {e}", tag="FILE_FILTER")
             self._update_stats(False)
             return False
+        return self.apply(decoded)
     
     def _is_valid_mime_type(self, mime_type: str, extension: str) -> bool:
         """
-        Validate that the MIME type matches the file extension.
+        Check whether the MIME type matches the file extension.
         
         Args:
             mime_type: The MIME type to validate
             extension: The file extension
             
         Returns:
-            bool: True if MIME type is valid for the extension
+            bool: True if the MIME type is expected for the extension, or the
+            extension has no known MIME types
         """
-        # Common MIME type mappings for validation
-        mime_mappings = {
-            '.pdf': ['application/pdf'],
-            '.doc': ['application/msword'],
-            '.docx': ['application/vnd.openxmlformats-officedocument.wordprocessingml.document'],
-            '.xls': ['application/vnd.ms-excel'],
-            '.xlsx': ['application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'],
-            '.ppt': ['application/vnd.ms-powerpoint'],
-            '.pptx': ['application/vnd.openxmlformats-officedocument.presentationml.presentation'],
-            '.zip': ['application/zip'],
-            '.csv': ['text/csv', 'application/csv'],
-            '.json': ['application/json'],
-            '.xml': ['application/xml', 'text/xml'],
-        }
-        
-        expected_mimes = mime_mappings.get(extension.lower())
-        if expected_mimes:
-            is_valid = mime_type.lower() in [m.lower() for m in expected_mimes]
-            if not is_valid and self._custom_logger:
-                self._custom_logger.debug(
-                    f"Unexpected MIME type {mime_type} for extension {extension}, but allowing it",
-                    tag="FILE_FILTER"
-                )
-            # Be lenient - allow files even with unexpected MIME types
-            # This handles cases where servers might return incorrect MIME types
-            return True
-        
-        # For extensions not in our mapping, accept any reasonable MIME type
-        return True
+        expected_mimes = _EXPECTED_MIME_TYPES.get(extension.lower())
+        return expected_mimes is None or mime_type.lower() in expected_mimes
     
     def _check_size_hints(self, url: str) -> bool:
         """
@@ -384,29 +664,16 @@ class FileDiscoveryFilter(URLFilter):
         Returns:
             bool: True if size is acceptable or no size hint found
         """
-        if not self.max_file_size_mb:
+        if self._max_file_size_bytes is None:
             return True
         
         # Look for size hints in URL parameters or path
-        size_patterns = [
-            r'size=(\d+)',
-            r'filesize=(\d+)',
-            r'bytes=(\d+)',
-            r'length=(\d+)'
-        ]
-        
-        for pattern in size_patterns:
-            match = re.search(pattern, url, re.IGNORECASE)
-            if match:
-                try:
-                    size_bytes = int(match.group(1))
-                    size_mb = size_bytes / (1024 * 1024)
-                    return size_mb <= self.max_file_size_mb
-                except ValueError:
-                    continue
-        
-        # No size hint found, assume acceptable
-        return True
+        match = _SIZE_HINT_RE.search(url)
+        if not match:
+            # No size hint found, assume acceptable
+            return True
+        
+        return int(match.group(1)) <= self._max_file_size_bytes
     
     def _extract_repository_path(self, path: str) -> Optional[str]:
         """
@@ -418,12 +685,37 @@ class FileDiscoveryFilter(URLFilter):
         Returns:
             Optional[str]: The repository path if found, None otherwise
         """
-        for pattern in self.repository_patterns:
-            match = pattern.search(path)
-            if match:
-                # Extract the path up to and including the repository directory
-                repo_end = match.end()
-                return path[:repo_end].rstrip('/')
+        if self._repository_regex is None:
+            return None
+        
+        # Files in one directory share the answer, and crawls keep returning to
+        # the same directories
+        key = path[:path.rfind('/') + 1] if self._repository_dir_only else path
+        cache = self._repository_path_cache
+        repository_path = cache.get(key, _CACHE_MISS)
+        if repository_path is _CACHE_MISS:
+            repository_path = self._scan_repository_path(key)
+            if len(cache) >= _REPOSITORY_PATH_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[key] = repository_path
+        return repository_path
+    
+    def _scan_repository_path(self, path: str) -> Optional[str]:
+        """Find the leftmost repository marker in path, uncached."""
+        # The leftmost repository directory in the path wins. Lowercasing may
+        # change the length of non-ASCII text, so such paths use the regex
+        if self._repository_automaton is not None and path.isascii():
+            best = None
+            for end, (index, length) in self._repository_automaton.iter(path.lower()):
+                key = (end - length + 1, index)
+                if best is None or key < best[0]:
+                    best = (key, end + 1)
+            return path[:best[1]].rstrip('/') if best else None
+        
+        match = self._repository_regex.search(path)
+        if match:
+            # Extract the path up to and including the repository directory
+            return path[:match.end()].rstrip('/')
         
         return None
     
@@ -438,7 +730,7 @@ class FileDiscoveryFilter(URLFilter):
             List[FileMetadata]: List of discovered files
         """
         if file_type is None:
-            return self.discovered_files.copy()
+            return list(self.discovered_files)
         
         return [f for f in self.discovered_files if f.file_type == file_type]
     
@@ -489,14 +781,15 @@ class FileDiscoveryFilter(URLFilter):
             return {
                 "discovered_files": [
                     {
-                        "url": f.url,
-                        "filename": f.filename,
-                        "extension": f.extension,
-                        "file_type": f.file_type.value,
-                        "mime_type": f.mime_type,
-                        "repository_path": f.repository_path
+                        "url": url,
+                        "filename": filename,
+                        "extension": extension,
+                        "file_type": file_type.value,
+                        "mime_type": mime_type or mimetypes.guess_type(url)[0],
+                        "repository_path": repository_path
                     }
-                    for f in self.discovered_files
+                    for url, filename, extension, file_type, mime_type, repository_path
+                    in self.discovered_files.rows()
                 ],
                 "statistics": {
                     "total_files": self.discovery_stats.total_files_discovered,
@@ -506,28 +799,64 @@ class FileDiscoveryFilter(URLFilter):
                 }
             }
         elif format.lower() == "json":
-            import json
-            return json.dumps(self.export_file_inventory("dict"), indent=2)
+            return self.export_file_inventory_bytes().decode("utf-8")
         elif format.lower() == "csv":
-            import csv
-            import io
-            
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write header
-            writer.writerow(["URL", "Filename", "Extension", "File Type", "MIME Type", "Repository Path"])
-            
-            # Write data
-            for f in self.discovered_files:
-                writer.writerow([
-                    f.url, f.filename, f.extension, f.file_type.value,
-                    f.mime_type or "", f.repository_path or ""
-                ])
-            
-            return output.getvalue()
+            return "".join(self.iter_csv_rows())
         else:
             raise ValueError(f"Unsupported export format: {format}")
+    
+    def export_file_inventory_bytes(self) -> bytes:
+        """
+        Export the file inventory as UTF-8 encoded, indented JSON.
+        
+        Uses orjson when it is installed, which is much faster than the json
+        module on large inventories; the text is the same JSON either way.
+        Callers writing to a file or socket can skip the str round trip of
+        export_file_inventory("json").
+        
+        Returns:
+            bytes: The JSON document
+        """
+        inventory = self.export_file_inventory("dict")
+        if HAS_ORJSON:
+            return orjson.dumps(inventory, option=orjson.OPT_INDENT_2)
+        
+        import json
+        return json.dumps(inventory, indent=2, ensure_ascii=False).encode("utf-8")
+    
+    def iter_csv_rows(self) -> Iterator[str]:
+        """
+        Yield the CSV file inventory one formatted line at a time.
+        
+        Produces the same text as export_file_inventory("csv"), header first,
+        but lets callers stream large inventories to a file or socket instead
+        of building the whole document in memory.
+        
+        Yields:
+            str: One CSV line, including its line terminator
+        """
+        import csv
+        import io
+        
+        # csv.writer handles quoting; each row is rendered into a reused buffer
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        def render(row) -> str:
+            writer.writerow(row)
+            line = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return line
+        
+        yield render(["URL", "Filename", "Extension", "File Type", "MIME Type", "Repository Path"])
+        
+        # Rows come straight from the columns
+        for url, filename, extension, file_type, mime_type, repository_path in self.discovered_files.rows():
+            yield render((
+                url, filename, extension, file_type.value,
+                mime_type or mimetypes.guess_type(url)[0] or "", repository_path or ""
+            ))
 
 
 # Convenience functions for integration with existing systems
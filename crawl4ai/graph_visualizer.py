@@ -7,19 +7,29 @@ and interactive features for the Domain Intelligence Crawler.
 """
 
 import networkx as nx
+import numpy as np
 from typing import Dict, List, Optional, Tuple, Any, Union
 from pathlib import Path
 import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+import sys
 from datetime import datetime
 from urllib.parse import urlparse
 
 # Optional visualization imports
 try:
+    import matplotlib
+    # Without a display only file output is possible; pick the raster backend
+    # up front unless the user chose one
+    if (sys.platform.startswith("linux") and "MPLBACKEND" not in os.environ
+            and not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY")):
+        matplotlib.use("Agg")
     import matplotlib.pyplot as plt
     import matplotlib.patches as mpatches
+    from matplotlib.collections import LineCollection, PolyCollection
     from matplotlib.colors import LinearSegmentedColormap
-    import numpy as np
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
@@ -39,8 +49,149 @@ try:
 except ImportError:
     GRAPHVIZ_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Arrowhead length as a fraction of the layout extent, and the point along
+# each edge where its tip sits (short of the target node's center)
+_ARROW_HEAD_SCALE = 0.02
+_ARROW_TIP_POSITION = 0.95
+
+# From this many nodes on, spring layouts minimize the layout energy with
+# scipy instead of running the Fruchterman-Reingold force iterations
+_ENERGY_LAYOUT_MIN_NODES = 500
+
+# Static part of the Cytoscape.js export, written after the streamed elements
+_CYTOSCAPE_STYLE = [
+    {
+        'selector': 'node',
+        'style': {
+            'background-color': 'data(is_file) ? "red" : "blue"',
+            'label': 'data(label)',
+            'width': 'mapData(pagerank, 0, 1, 20, 80)',
+            'height': 'mapData(pagerank, 0, 1, 20, 80)'
+        }
+    },
+    {
+        'selector': 'edge',
+        'style': {
+            'width': 2,
+            'line-color': '#ccc',
+            'target-arrow-color': '#ccc',
+            'target-arrow-shape': 'triangle'
+        }
+    }
+]
+_CYTOSCAPE_LAYOUT = {
+    'name': 'cose',
+    'idealEdgeLength': 100,
+    'nodeOverlap': 20
+}
+
+
+def _cytoscape_trailer(layout: Dict[str, Any]) -> bytes:
+    """Closing part of the export: the end of the elements, style and layout."""
+    return (
+        '\n],\n"style": ' + json.dumps(_CYTOSCAPE_STYLE, indent=2)
+        + ',\n"layout": ' + json.dumps(layout, indent=2) + '\n}\n'
+    ).encode('utf-8')
+
+
+_CYTOSCAPE_TRAILER = _cytoscape_trailer(_CYTOSCAPE_LAYOUT)
+# Used when the export carries node positions computed here
+_CYTOSCAPE_PRESET_TRAILER = _cytoscape_trailer({'name': 'preset'})
+
+# Dashboard page: the summary panels render on load, the network panel only
+# once its button is clicked (its figure JSON sits inert in the page until then)
+_DASHBOARD_HTML = """<html>
+<head><meta charset="utf-8" /></head>
+<body>
+{summary}
+<div style="text-align:center">
+<button id="show-network" onclick="Plotly.react('site-graph-network', JSON.parse(document.getElementById('site-graph-network-data').textContent)); this.disabled = true;">Show network</button>
+</div>
+<div id="site-graph-network" style="height:600px"></div>
+<script type="application/json" id="site-graph-network-data">{network}</script>
+</body>
+</html>
+"""
+
+
+def _hierarchical_coords(counts: np.ndarray, levels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Coordinates for consecutive depth groups of ``counts[g]`` nodes at height
+    ``levels[g]``, each spread evenly over [-n/2, n/2] (a lone node sits at 0)."""
+    xs = np.concatenate([np.linspace(-n/2, n/2, n) if n > 1 else np.zeros(1) for n in counts.tolist()])
+    return xs, np.repeat(levels, counts)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _hierarchical_coords(counts, levels):  # noqa: F811
+        # Same result as the NumPy version, written straight into the output
+        # arrays without per-group temporaries
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+        xs = np.empty(offsets[-1])
+        ys = np.empty(offsets[-1])
+        for g in prange(len(counts)):
+            n = counts[g]
+            start = offsets[g]
+            for i in range(n):
+                xs[start + i] = -n / 2 + i * (n / (n - 1)) if n > 1 else 0.0
+                ys[start + i] = levels[g]
+            if n > 1:
+                xs[start + n - 1] = n / 2
+        return xs, ys
+
+
+def _fast_pagerank(indptr: np.ndarray, indices: np.ndarray, out_deg: np.ndarray, alpha: float = 0.85,
+                   initial: Optional[np.ndarray] = None, max_iter: int = 100, tol: float = 1.0e-6) -> np.ndarray:
+    """PageRank of an unweighted graph given as CSR out-edges, by power iteration.
+    
+    Matches ``nx.pagerank`` with its defaults: uniform teleport, and the rank
+    of nodes without out-links spread over all nodes. ``initial`` warm-starts
+    the iteration, e.g. from the ranks of a previous render.
+    """
+    n = len(out_deg)
+    if n == 0:
+        return np.zeros(0)
+    
+    sources = np.repeat(np.arange(n), out_deg)
+    dangling = np.flatnonzero(out_deg == 0)
+    inv_out_deg = np.divide(1.0, out_deg, out=np.zeros(n), where=out_deg > 0)
+    x = np.full(n, 1.0 / n) if initial is None else initial / initial.sum()
+    
+    for _ in range(max_iter):
+        x_last = x
+        # A^T @ (x / out_deg) as a scatter-add over the edges
+        x = alpha * np.bincount(indices, weights=(x_last * inv_out_deg)[sources], minlength=n)
+        x += (alpha * x_last[dangling].sum() + 1.0 - alpha) / n
+        # Renormalize so rounding cannot make the total rank drift from 1
+        x /= x.sum()
+        if np.abs(x - x_last).sum() < n * tol:
+            return x
+    
+    logger.warning(f"PageRank did not converge in {max_iter} iterations")
+    return x
+
+
+def _url_parts(url: str) -> Tuple[str, str]:
+    """Return (short label, netloc) for a URL; the label is the last path
+    segment, or the netloc for URLs without a path."""
+    parsed = urlparse(url)
+    return (parsed.path.split('/')[-1] if parsed.path else parsed.netloc), parsed.netloc
+
 
 class GraphVisualizer:
     """Advanced graph visualization with multiple rendering engines."""
@@ -51,6 +202,142 @@ class GraphVisualizer:
         self.graph = graph_handler.graph
         self.nodes = graph_handler.nodes
         
+        # Centrality and analysis results, reused until the graph changes
+        self._centrality_cache: Optional[Tuple[Tuple, Dict[str, Dict[str, float]]]] = None
+        self._analysis_cache: Optional[Tuple[Tuple, Any]] = None
+        self._pagerank_cache: Optional[Tuple[Tuple, Dict[str, float]]] = None
+        # CSR mirror of the out-edges for read-only scans, see _ensure_csr()
+        self._csr_version: Optional[Tuple] = None
+        self._indptr: Optional[np.ndarray] = None
+        self._indices: Optional[np.ndarray] = None
+        self._node_ids: List[str] = []
+        # Parsed (label, netloc) per node URL, see _get_url_parts()
+        self._url_parts_version: Optional[Tuple] = None
+        self._url_parts: Dict[str, Tuple[str, str]] = {}
+        # (graph version, positions) per layout type, see get_layout()
+        self._layout_cache: Dict[str, Tuple[Tuple, Dict[str, Tuple[float, float]]]] = {}
+        # Figure kept by visualize_with_matplotlib() for restyling, see _build_figure()
+        self._render_context: Optional[Dict[str, Any]] = None
+    
+    def _graph_version(self) -> Tuple:
+        """Token that changes whenever nodes or edges are added or removed.
+        
+        Handlers that modify the graph in place without changing its size can
+        bump ``graph.graph["version"]`` to invalidate cached metrics.
+        """
+        return (self.graph.number_of_nodes(), self.graph.number_of_edges(),
+                self.graph.graph.get("version"))
+    
+    def _get_centrality(self) -> Dict[str, Dict[str, float]]:
+        """Return the handler's centrality measures, computed once per graph version.
+        
+        The ``'pagerank'`` entry is replaced by _get_pagerank(), so every
+        renderer shows the same scores.
+        """
+        version = self._graph_version()
+        if self._centrality_cache is None or self._centrality_cache[0] != version:
+            measures = dict(self.graph_handler.calculate_centrality_measures())
+            measures['pagerank'] = self._get_pagerank()
+            self._centrality_cache = (version, measures)
+        return self._centrality_cache[1]
+    
+    def _get_pagerank(self) -> Dict[str, float]:
+        """Return PageRank per node from the CSR mirror, computed once per graph version.
+        
+        After a graph change the iteration starts from the previous scores, so
+        a grown crawl converges in a few iterations.
+        """
+        version = self._graph_version()
+        if self._pagerank_cache is None or self._pagerank_cache[0] != version:
+            indptr, indices, node_ids = self._ensure_csr()
+            initial = None
+            if self._pagerank_cache is not None and node_ids:
+                previous = self._pagerank_cache[1]
+                initial = np.fromiter((previous.get(node, 1.0 / len(node_ids)) for node in node_ids),
+                                      dtype=float, count=len(node_ids))
+            ranks = _fast_pagerank(indptr, indices, np.diff(indptr), initial=initial)
+            self._pagerank_cache = (version, dict(zip(node_ids, ranks.tolist())))
+        return self._pagerank_cache[1]
+    
+    def _ensure_csr(self) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """Return a CSR mirror (indptr, indices, node_ids) of the graph's out-edges.
+        
+        Node i is ``node_ids[i]``, in ``graph.nodes()`` order, and its successors
+        are ``indices[indptr[i]:indptr[i + 1]]``. Rebuilt when the graph changes.
+        """
+        version = self._graph_version()
+        if self._csr_version != version:
+            node_ids = list(self.graph)
+            index = {node: i for i, node in enumerate(node_ids)}
+            adj = self.graph.adj
+            
+            indptr = np.zeros(len(node_ids) + 1, dtype=np.int32)
+            np.cumsum(np.fromiter((len(adj[node]) for node in node_ids), dtype=np.int32, count=len(node_ids)),
+                      out=indptr[1:])
+            indices = np.fromiter((index[target] for node in node_ids for target in adj[node]),
+                                  dtype=np.int32, count=int(indptr[-1]))
+            
+            self._indptr, self._indices, self._node_ids = indptr, indices, node_ids
+            self._csr_version = version
+        return self._indptr, self._indices, self._node_ids
+    
+    def _degrees(self) -> np.ndarray:
+        """Total (in + out) degree per node, in ``graph.nodes()`` order."""
+        indptr, indices, node_ids = self._ensure_csr()
+        return np.diff(indptr) + np.bincount(indices, minlength=len(node_ids))
+    
+    def _get_url_parts(self) -> Dict[str, Tuple[str, str]]:
+        """Return (label, netloc) for every node URL, parsed once per graph version."""
+        version = self._graph_version()
+        if self._url_parts_version != version:
+            self._url_parts = {url: _url_parts(url) for url in self.graph.nodes()}
+            self._url_parts_version = version
+        return self._url_parts
+    
+    def _short_label(self, url: str) -> str:
+        """Short display label for a URL, from the cache when it is a node."""
+        parts = self._get_url_parts().get(url)
+        return (parts or _url_parts(url))[0]
+    
+    def _get_analysis(self):
+        """Return the handler's graph analysis, computed once per graph version."""
+        version = self._graph_version()
+        if self._analysis_cache is None or self._analysis_cache[0] != version:
+            self._analysis_cache = (version, self.graph_handler.analyze_graph())
+        return self._analysis_cache[1]
+    
+    def get_layout(self, layout_type: str = "spring") -> Dict[str, Tuple[float, float]]:
+        """Return node positions for a layout type, computed once per graph version.
+        
+        Every renderer takes its positions from here, so the matplotlib figure,
+        the dashboard and the Cytoscape export of one graph share a layout.
+        """
+        version = self._graph_version()
+        cached = self._layout_cache.get(layout_type)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        if layout_type == "hierarchical":
+            pos = self.create_hierarchical_layout()
+        elif layout_type == "domain_clustered":
+            pos = self.create_domain_clustered_layout()
+        elif layout_type == "force_directed":
+            pos = self.create_force_directed_layout()
+        else:  # spring (default)
+            pos = self._spring_layout(k=1, iterations=50)
+        
+        self._layout_cache[layout_type] = (version, pos)
+        return pos
+    
+    def _spring_layout(self, **kwargs) -> Dict[str, Tuple[float, float]]:
+        """``nx.spring_layout`` with the solver picked by graph size."""
+        method = "energy" if self.graph.number_of_nodes() >= _ENERGY_LAYOUT_MIN_NODES else "force"
+        try:
+            return nx.spring_layout(self.graph, method=method, **kwargs)
+        except TypeError:
+            # Older NetworkX releases have only the force solver
+            return nx.spring_layout(self.graph, **kwargs)
+        
     def create_hierarchical_layout(self, root_url: Optional[str] = None) -> Dict[str, Tuple[float, float]]:
         """Create a hierarchical layout based on crawl depth."""
         if not root_url:
@@ -63,91 +350,81 @@ class GraphVisualizer:
                 root_url = list(self.graph.nodes())[0] if self.graph.nodes() else None
         
         if not root_url or root_url not in self.graph:
-            return nx.spring_layout(self.graph)
+            return self._spring_layout()
         
         # Group nodes by depth
         depth_groups = {}
         for url, node in self.nodes.items():
-            depth = node.depth
-            if depth not in depth_groups:
-                depth_groups[depth] = []
-            depth_groups[depth].append(url)
-        
-        # Create positions
-        pos = {}
-        max_depth = max(depth_groups.keys()) if depth_groups else 0
-        
-        for depth, urls in depth_groups.items():
-            y = max_depth - depth  # Higher depth = lower y position
-            num_nodes = len(urls)
-            
-            if num_nodes == 1:
-                pos[urls[0]] = (0, y)
-            else:
-                x_positions = np.linspace(-num_nodes/2, num_nodes/2, num_nodes) if MATPLOTLIB_AVAILABLE else [i - num_nodes/2 for i in range(num_nodes)]
-                for i, url in enumerate(urls):
-                    pos[url] = (x_positions[i], y)
+            depth_groups.setdefault(node.depth, []).append(url)
         
-        return pos
+        if not depth_groups:
+            return {}
+        
+        # Build the coordinates as arrays, one row per depth level, instead of
+        # assigning positions node by node
+        max_depth = max(depth_groups)
+        all_urls = [url for urls in depth_groups.values() for url in urls]
+        counts = np.fromiter(map(len, depth_groups.values()), dtype=np.int64, count=len(depth_groups))
+        levels = np.fromiter((max_depth - depth for depth in depth_groups),  # Higher depth = lower y position
+                             dtype=float, count=len(depth_groups))
+        xs, ys = _hierarchical_coords(counts, levels)
+        
+        return dict(zip(all_urls, zip(xs.tolist(), ys.tolist())))
     
     def create_domain_clustered_layout(self) -> Dict[str, Tuple[float, float]]:
         """Create layout with nodes clustered by domain."""
-        # Group nodes by domain
-        domain_groups = {}
-        for url in self.graph.nodes():
-            parsed = urlparse(url)
-            domain = parsed.netloc
-            if domain not in domain_groups:
-                domain_groups[domain] = []
-            domain_groups[domain].append(url)
-        
-        # Create subgraphs for each domain
-        pos = {}
-        domain_centers = {}
+        urls = list(self.graph.nodes())
+        if not urls:
+            return {}
+        
+        # Domain index per node, in order of first appearance
+        domain_index = {}
+        url_parts = self._get_url_parts()
+        labels = np.array([domain_index.setdefault(url_parts[url][1], len(domain_index)) for url in urls])
         
         # Calculate domain centers in a circle
-        num_domains = len(domain_groups)
+        num_domains = len(domain_index)
         if num_domains == 1:
-            domain_centers[list(domain_groups.keys())[0]] = (0, 0)
+            centers = np.zeros((1, 2))
         else:
-            if MATPLOTLIB_AVAILABLE:
-                angles = np.linspace(0, 2*np.pi, num_domains, endpoint=False)
-                radius = max(3, num_domains)
-                
-                for i, domain in enumerate(domain_groups.keys()):
-                    x = radius * np.cos(angles[i])
-                    y = radius * np.sin(angles[i])
-                    domain_centers[domain] = (x, y)
-            else:
-                # Fallback without numpy
-                import math
-                for i, domain in enumerate(domain_groups.keys()):
-                    angle = 2 * math.pi * i / num_domains
-                    radius = max(3, num_domains)
-                    x = radius * math.cos(angle)
-                    y = radius * math.sin(angle)
-                    domain_centers[domain] = (x, y)
-        
-        # Position nodes within each domain cluster
-        for domain, urls in domain_groups.items():
-            center_x, center_y = domain_centers[domain]
-            
-            if len(urls) == 1:
-                pos[urls[0]] = (center_x, center_y)
-            else:
-                # Create subgraph layout
-                subgraph = self.graph.subgraph(urls)
-                sub_pos = nx.spring_layout(subgraph, k=0.5, iterations=50)
-                
-                # Offset by domain center
-                for url, (x, y) in sub_pos.items():
-                    pos[url] = (center_x + x, center_y + y)
+            angles = np.linspace(0, 2*np.pi, num_domains, endpoint=False)
+            radius = max(3, num_domains)
+            centers = radius * np.column_stack([np.cos(angles), np.sin(angles)])
         
-        return pos
+        # One force-directed run over the whole graph instead of one per domain
+        layout = self._spring_layout(k=0.5, iterations=50, seed=42)
+        coords = np.array([layout[url] for url in urls], dtype=float)
+        
+        # Move each domain's centroid to its center and scale the cluster to
+        # unit radius, as a per-domain spring layout would have been
+        counts = np.bincount(labels, minlength=num_domains)[:, None]
+        centroids = np.column_stack([
+            np.bincount(labels, weights=coords[:, axis], minlength=num_domains) for axis in (0, 1)
+        ]) / counts
+        coords -= centroids[labels]
+        extent = np.zeros(num_domains)
+        np.maximum.at(extent, labels, np.abs(coords).max(axis=1))
+        extent[extent == 0] = 1.0
+        coords = coords / extent[labels, None] + centers[labels]
+        
+        return dict(zip(urls, map(tuple, coords.tolist())))
     
     def create_force_directed_layout(self, iterations: int = 100, k: Optional[float] = None) -> Dict[str, Tuple[float, float]]:
-        """Create an optimized force-directed layout."""
-        return nx.spring_layout(self.graph, k=k, iterations=iterations, seed=42)
+        """Create an optimized force-directed layout.
+        
+        Uses Graphviz's sfdp (multilevel, Barnes-Hut approximated forces) when
+        pygraphviz is installed, rescaled to the same [-1, 1] range as the
+        networkx spring layout it otherwise falls back to. sfdp picks its own
+        number of iterations; ``k`` sets its ideal edge length.
+        """
+        if GRAPHVIZ_AVAILABLE and self.graph.number_of_nodes() > 1:
+            try:
+                pos = nx.nx_agraph.graphviz_layout(self.graph, prog="sfdp", args=f"-GK={k}" if k else "")
+                return nx.rescale_layout_dict(pos)
+            except (ValueError, OSError) as e:
+                logger.warning(f"sfdp layout failed, using spring layout: {e}")
+        
+        return self._spring_layout(k=k, iterations=iterations, seed=42)
     
     def visualize_with_matplotlib(self, 
                                  output_path: Optional[str] = None,
@@ -158,7 +435,14 @@ class GraphVisualizer:
                                  highlight_files: bool = True,
                                  figsize: Tuple[int, int] = (15, 10),
                                  dpi: int = 300) -> Optional[str]:
-        """Create advanced matplotlib visualization."""
+        """Create advanced matplotlib visualization.
+        
+        After saving to a file the figure is kept, and later calls with the
+        same layout, labels, file highlighting and figure size on an unchanged
+        graph only restyle the nodes (sizes, colors, colorbar and legend)
+        instead of laying out and drawing everything again. close_figure()
+        releases it.
+        """
         if not MATPLOTLIB_AVAILABLE:
             logger.error("Matplotlib not available")
             return None
@@ -167,63 +451,188 @@ class GraphVisualizer:
             logger.warning("Cannot visualize empty graph")
             return None
         
-        # Choose layout
-        if layout_type == "hierarchical":
-            pos = self.create_hierarchical_layout()
-        elif layout_type == "domain_clustered":
-            pos = self.create_domain_clustered_layout()
-        elif layout_type == "force_directed":
-            pos = self.create_force_directed_layout()
-        else:  # spring (default)
-            pos = nx.spring_layout(self.graph, k=1, iterations=50)
+        key = (self._graph_version(), layout_type, show_labels, highlight_files, tuple(figsize))
+        context = self._render_context
+        if context is None or context['key'] != key:
+            self.close_figure()
+            context = self._build_figure(layout_type, show_labels, highlight_files, figsize)
+            context['key'] = key
+            self._update_styling(context, size_scheme, color_scheme, highlight_files)
+            context['fig'].tight_layout()
+        else:
+            self._update_styling(context, size_scheme, color_scheme, highlight_files)
+        
+        fig = context['fig']
+        if output_path:
+            fig.savefig(output_path, dpi=dpi, bbox_inches='tight', facecolor='white')
+            # Detach from pyplot; the figure object stays usable for the next render
+            plt.close(fig)
+            self._render_context = context
+            return output_path
+        else:
+            # A shown figure belongs to the GUI, so it is not reused
+            self._render_context = None
+            plt.show()
+            return None
+    
+    def close_figure(self):
+        """Release the figure kept for reuse by visualize_with_matplotlib()."""
+        if self._render_context is not None:
+            plt.close(self._render_context['fig'])
+            self._render_context = None
+    
+    def _build_figure(self, layout_type: str, show_labels: bool, highlight_files: bool,
+                      figsize: Tuple[int, int]) -> Dict[str, Any]:
+        """Lay out and draw everything that does not depend on the size and color schemes."""
+        pos = self.get_layout(layout_type)
         
         # Create figure with subplots
         fig, (ax_main, ax_legend) = plt.subplots(1, 2, figsize=figsize, 
                                                 gridspec_kw={'width_ratios': [4, 1]})
         
+        # Draw nodes; sizes and colors are set by _update_styling()
+        nodes = nx.draw_networkx_nodes(self.graph, pos, 
+                                      node_size=300,
+                                      node_color='lightblue',
+                                      alpha=0.8,
+                                      ax=ax_main)
+        
+        # Draw edges with different styles: split the CSR edge arrays on whether
+        # the target node is a file
+        indptr, indices, node_ids = self._ensure_csr()
+        is_file = np.fromiter((bool(getattr(self.nodes.get(node), 'is_file', False)) for node in node_ids),
+                              dtype=bool, count=len(node_ids))
+        sources = np.repeat(np.arange(len(node_ids)), np.diff(indptr))
+        file_mask = is_file[indices]
+        
+        # Each edge style is two collections built from NumPy arrays: the
+        # shafts as line segments and the arrowheads as triangles, instead of
+        # one FancyArrowPatch per edge
+        coords = np.array([pos[node] for node in node_ids], dtype=float).reshape(-1, 2)
+        extent = np.ptp(coords, axis=0).max() if len(coords) else 0.0
+        head_length = _ARROW_HEAD_SCALE * (extent or 1.0)
+        
+        def draw_edges(mask: np.ndarray, color: str, alpha: float, style: str = 'solid'):
+            if not mask.any():
+                return
+            start, end = coords[sources[mask]], coords[indices[mask]]
+            ax_main.add_collection(LineCollection(np.stack([start, end], axis=1), colors=color, alpha=alpha,
+                                                  linestyles=style, rasterized=True))
+            
+            # Arrowheads; self-loops have no direction and get none
+            delta = end - start
+            length = np.hypot(delta[:, 0], delta[:, 1])
+            keep = length > 0
+            direction = delta[keep] / length[keep, None]
+            normal = np.column_stack([-direction[:, 1], direction[:, 0]])
+            tip = start[keep] + _ARROW_TIP_POSITION * delta[keep]
+            base = tip - head_length * direction
+            heads = np.stack([tip, base + 0.4 * head_length * normal, base - 0.4 * head_length * normal], axis=1)
+            ax_main.add_collection(PolyCollection(heads, facecolors=color, edgecolors='none', alpha=alpha,
+                                                  rasterized=True))
+        
+        # Draw regular edges
+        draw_edges(~file_mask, 'gray', 0.6)
+        
+        # Draw file edges with different style
+        if highlight_files:
+            draw_edges(file_mask, 'red', 0.8, 'dashed')
+        
+        # Add labels for small graphs
+        if show_labels and self.graph.number_of_nodes() <= 30:
+            labels = {node: label[:10] for node, (label, _) in self._get_url_parts().items()}
+            
+            nx.draw_networkx_labels(self.graph, pos, labels, 
+                                   font_size=8, font_weight='bold', ax=ax_main)
+        
+        # Main plot formatting
+        ax_main.set_title(f"Site Graph Analysis\n{self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges", 
+                         fontsize=16, fontweight='bold')
+        ax_main.axis('off')
+        ax_legend.axis('off')
+        
+        # Add statistics text
+        analysis = self._get_analysis()
+        stats_text = f"""Graph Statistics:
+        
+Nodes: {analysis.total_nodes}
+Edges: {analysis.total_edges}
+Density: {analysis.density:.3f}
+Components: {analysis.connected_components}
+Dead Ends: {len(analysis.dead_ends)}
+Entry Points: {len(analysis.entry_points)}
+File Nodes: {len(analysis.file_nodes)}
+        
+Top PageRank:
+        """
+        
+        for i, (url, score) in enumerate(analysis.page_rank_top_10[:3]):
+            short_url = self._short_label(url)
+            stats_text += f"{i+1}. {short_url[:20]}... ({score:.3f})\n"
+        
+        ax_legend.text(0.05, 0.3, stats_text, fontsize=9, verticalalignment='top',
+                      bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.8))
+        
+        return {
+            'fig': fig,
+            'ax_main': ax_main,
+            'ax_legend': ax_legend,
+            'nodes': nodes,
+            'mappable': None,
+            'colorbar': None,
+        }
+    
+    def _update_styling(self, context: Dict[str, Any], size_scheme: str, color_scheme: str,
+                        highlight_files: bool):
+        """Apply node sizes, node colors, colorbar and legend to a built figure."""
+        ax_main, ax_legend, nodes = context['ax_main'], context['ax_legend'], context['nodes']
+        
         # Calculate node attributes
-        centrality = self.graph_handler.calculate_centrality_measures()
+        pagerank = self._get_pagerank()
+        
+        # Per-node values as arrays, in graph.nodes() order. Sizes and colors
+        # only drive marker areas and colormap lookups, so single precision
+        # (and small ints for categories) is plenty and halves what is copied
+        # through the draw calls
+        node_list = list(self.graph.nodes())
+        
+        def node_values(mapping: Dict[str, float], default: float) -> np.ndarray:
+            return np.fromiter((mapping.get(node, default) for node in node_list),
+                               dtype=np.float32, count=len(node_list))
         
         # Node sizes
         if size_scheme == "pagerank":
-            pagerank = centrality.get('pagerank', {})
-            node_sizes = [max(100, pagerank.get(node, 0.001) * 3000) for node in self.graph.nodes()]
+            node_sizes = np.maximum(100, node_values(pagerank, 0.001) * 3000)
         elif size_scheme == "degree":
-            degrees = dict(self.graph.degree())
-            max_degree = max(degrees.values()) if degrees else 1
-            node_sizes = [max(100, (degrees.get(node, 1) / max_degree) * 1000) for node in self.graph.nodes()]
+            degrees = self._degrees()
+            max_degree = max(int(degrees.max()), 1) if len(degrees) else 1
+            node_sizes = np.maximum(100, degrees / max_degree * 1000).astype(np.float32)
         elif size_scheme == "betweenness":
-            betweenness = centrality.get('betweenness', {})
-            node_sizes = [max(100, betweenness.get(node, 0.001) * 2000) for node in self.graph.nodes()]
+            node_sizes = np.maximum(100, node_values(self._get_centrality().get('betweenness', {}), 0.001) * 2000)
         else:
-            node_sizes = [300] * self.graph.number_of_nodes()
+            node_sizes = np.full(len(node_list), 300, dtype=np.float32)
         
         # Node colors
         if color_scheme == "depth":
-            node_colors = [self.nodes.get(node, type('obj', (object,), {'depth': 0})()).depth 
-                          for node in self.graph.nodes()]
+            node_colors = np.fromiter((getattr(self.nodes.get(node), 'depth', 0) for node in node_list),
+                                      dtype=np.int16, count=len(node_list))
             colormap = plt.cm.viridis
             color_label = "Crawl Depth"
         elif color_scheme == "pagerank":
-            pagerank = centrality.get('pagerank', {})
-            node_colors = [pagerank.get(node, 0) for node in self.graph.nodes()]
+            node_colors = node_values(pagerank, 0)
             colormap = plt.cm.plasma
             color_label = "PageRank Score"
         elif color_scheme == "file_type":
-            node_colors = []
-            color_map = {'page': 0, 'pdf': 1, 'doc': 2, 'xls': 3, 'other': 4}
-            for node in self.graph.nodes():
+            # 0 = page, 1 = pdf, 2 = doc, 3 = xls, 4 = other file
+            extension_codes = {'.pdf': 1, '.doc': 2, '.docx': 2, '.xls': 3, '.xlsx': 3}
+            
+            def type_code(node: str) -> int:
                 node_data = self.nodes.get(node)
                 if not node_data or not node_data.is_file:
-                    node_colors.append(color_map['page'])
-                elif node_data.file_extension in ['.pdf']:
-                    node_colors.append(color_map['pdf'])
-                elif node_data.file_extension in ['.doc', '.docx']:
-                    node_colors.append(color_map['doc'])
-                elif node_data.file_extension in ['.xls', '.xlsx']:
-                    node_colors.append(color_map['xls'])
-                else:
-                    node_colors.append(color_map['other'])
+                    return 0
+                return extension_codes.get(node_data.file_extension, 4)
+            
+            node_colors = np.fromiter(map(type_code, node_list), dtype=np.int8, count=len(node_list))
             colormap = plt.cm.Set1
             color_label = "Node Type"
         else:
@@ -231,75 +640,32 @@ class GraphVisualizer:
             colormap = None
             color_label = None
         
-        # Draw nodes
-        nodes = nx.draw_networkx_nodes(self.graph, pos, 
-                                      node_size=node_sizes,
-                                      node_color=node_colors,
-                                      cmap=colormap,
-                                      alpha=0.8,
-                                      ax=ax_main)
-        
-        # Draw edges with different styles
-        regular_edges = []
-        file_edges = []
-        
-        for edge in self.graph.edges():
-            target_node = self.nodes.get(edge[1])
-            if target_node and target_node.is_file:
-                file_edges.append(edge)
-            else:
-                regular_edges.append(edge)
-        
-        # Draw regular edges
-        if regular_edges:
-            nx.draw_networkx_edges(self.graph, pos,
-                                  edgelist=regular_edges,
-                                  edge_color='gray',
-                                  alpha=0.6,
-                                  arrows=True,
-                                  arrowsize=15,
-                                  ax=ax_main)
-        
-        # Draw file edges with different style
-        if file_edges and highlight_files:
-            nx.draw_networkx_edges(self.graph, pos,
-                                  edgelist=file_edges,
-                                  edge_color='red',
-                                  alpha=0.8,
-                                  arrows=True,
-                                  arrowsize=15,
-                                  style='dashed',
-                                  ax=ax_main)
-        
-        # Add labels for small graphs
-        if show_labels and self.graph.number_of_nodes() <= 30:
-            labels = {}
-            for node in self.graph.nodes():
-                parsed = urlparse(node)
-                if parsed.path:
-                    label = parsed.path.split('/')[-1][:10]
-                else:
-                    label = parsed.netloc[:10]
-                labels[node] = label
-            
-            nx.draw_networkx_labels(self.graph, pos, labels, 
-                                   font_size=8, font_weight='bold', ax=ax_main)
-        
-        # Main plot formatting
-        ax_main.set_title(f"Site Graph Analysis\n{self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges", 
-                         fontsize=16, fontweight='bold')
-        ax_main.axis('off')
+        nodes.set_sizes(node_sizes)
         
-        # Add colorbar if applicable
+        # Add colorbar if applicable, reusing the one from a previous render
         if colormap and color_label:
-            sm = plt.cm.ScalarMappable(cmap=colormap, 
-                                     norm=plt.Normalize(vmin=min(node_colors), vmax=max(node_colors)))
-            sm.set_array([])
-            cbar = plt.colorbar(sm, ax=ax_main, shrink=0.8)
-            cbar.set_label(color_label, fontsize=12)
+            vmin, vmax = node_colors.min(), node_colors.max()
+            nodes.set_array(node_colors)
+            nodes.set_cmap(colormap)
+            nodes.set_clim(vmin, vmax)
+            if context['colorbar'] is None:
+                sm = plt.cm.ScalarMappable(cmap=colormap, norm=plt.Normalize(vmin=vmin, vmax=vmax))
+                sm.set_array([])
+                context['mappable'] = sm
+                context['colorbar'] = context['fig'].colorbar(sm, ax=ax_main, shrink=0.8)
+            else:
+                context['mappable'].set_cmap(colormap)
+                context['mappable'].set_norm(plt.Normalize(vmin=vmin, vmax=vmax))
+                context['colorbar'].update_normal(context['mappable'])
+            context['colorbar'].set_label(color_label, fontsize=12)
+        else:
+            nodes.set_array(None)
+            nodes.set_facecolor(node_colors)
+            if context['colorbar'] is not None:
+                context['colorbar'].remove()
+                context['mappable'] = context['colorbar'] = None
         
         # Create legend
-        ax_legend.axis('off')
         legend_elements = []
         
         if highlight_files:
@@ -315,42 +681,19 @@ class GraphVisualizer:
         
         if legend_elements:
             ax_legend.legend(handles=legend_elements, loc='center', fontsize=10)
+        elif ax_legend.get_legend() is not None:
+            ax_legend.get_legend().remove()
+    
+    def create_interactive_dashboard(self, output_path: Optional[str] = None,
+                                     include_network: bool = True,
+                                     layout_type: str = "force_directed") -> Optional[str]:
+        """Create comprehensive interactive dashboard with multiple views.
         
-        # Add statistics text
-        analysis = self.graph_handler.analyze_graph()
-        stats_text = f"""Graph Statistics:
-        
-Nodes: {analysis.total_nodes}
-Edges: {analysis.total_edges}
-Density: {analysis.density:.3f}
-Components: {analysis.connected_components}
-Dead Ends: {len(analysis.dead_ends)}
-Entry Points: {len(analysis.entry_points)}
-File Nodes: {len(analysis.file_nodes)}
-        
-Top PageRank:
+        The page first renders the PageRank, degree and node type panels; the
+        network panel is embedded as figure JSON behind a "Show network" button
+        and drawn on demand. With ``include_network=False`` the layout is not
+        computed at all.
         """
-        
-        for i, (url, score) in enumerate(analysis.page_rank_top_10[:3]):
-            parsed = urlparse(url)
-            short_url = parsed.path.split('/')[-1] if parsed.path else parsed.netloc
-            stats_text += f"{i+1}. {short_url[:20]}... ({score:.3f})\n"
-        
-        ax_legend.text(0.05, 0.3, stats_text, fontsize=9, verticalalignment='top',
-                      bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.8))
-        
-        plt.tight_layout()
-        
-        if output_path:
-            plt.savefig(output_path, dpi=dpi, bbox_inches='tight', facecolor='white')
-            plt.close()
-            return output_path
-        else:
-            plt.show()
-            return None
-    
-    def create_interactive_dashboard(self, output_path: Optional[str] = None) -> Optional[str]:
-        """Create comprehensive interactive dashboard with multiple views."""
         if not PLOTLY_AVAILABLE:
             logger.error("Plotly not available")
             return None
@@ -359,186 +702,204 @@ Top PageRank:
             logger.warning("Cannot create dashboard for empty graph")
             return None
         
-        # Calculate layouts and metrics
-        pos = self.create_force_directed_layout()
-        analysis = self.graph_handler.analyze_graph()
-        centrality = self.graph_handler.calculate_centrality_measures()
+        analysis = self._get_analysis()
         
         # Create subplots
         fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=('Site Graph Network', 'PageRank Distribution', 
-                          'Degree Distribution', 'Node Type Analysis'),
-            specs=[[{"type": "scatter"}, {"type": "bar"}],
-                   [{"type": "histogram"}, {"type": "pie"}]]
-        )
-        
-        # 1. Main network graph
-        edge_x, edge_y = [], []
-        for edge in self.graph.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-        
-        fig.add_trace(
-            go.Scatter(x=edge_x, y=edge_y, mode='lines', 
-                      line=dict(width=0.5, color='#888'),
-                      hoverinfo='none', showlegend=False),
-            row=1, col=1
-        )
-        
-        # Node data
-        node_x = [pos[node][0] for node in self.graph.nodes()]
-        node_y = [pos[node][1] for node in self.graph.nodes()]
-        node_colors = []
-        node_sizes = []
-        node_text = []
-        
-        pagerank = centrality.get('pagerank', {})
-        
-        for node in self.graph.nodes():
-            node_data = self.nodes.get(node)
-            
-            # Color by type
-            if node_data and node_data.is_file:
-                node_colors.append('red')
-            else:
-                node_colors.append('blue')
-            
-            # Size by PageRank
-            size = max(5, pagerank.get(node, 0.001) * 500)
-            node_sizes.append(size)
-            
-            # Hover text
-            parsed = urlparse(node)
-            display_name = parsed.path.split('/')[-1] if parsed.path else parsed.netloc
-            node_text.append(f"{display_name}<br>PageRank: {pagerank.get(node, 0):.4f}")
-        
-        fig.add_trace(
-            go.Scatter(x=node_x, y=node_y, mode='markers',
-                      marker=dict(size=node_sizes, color=node_colors, 
-                                 line=dict(width=1, color='white')),
-                      text=node_text, hoverinfo='text',
-                      showlegend=False),
-            row=1, col=1
+            rows=1, cols=3,
+            subplot_titles=('PageRank Distribution', 'Degree Distribution', 'Node Type Analysis'),
+            specs=[[{"type": "bar"}, {"type": "bar"}, {"type": "pie"}]]
         )
         
-        # 2. PageRank distribution
+        # 1. PageRank distribution
         top_pagerank = analysis.page_rank_top_10[:10]
-        pr_urls = [urlparse(url).path.split('/')[-1] if urlparse(url).path else urlparse(url).netloc 
-                  for url, _ in top_pagerank]
+        pr_urls = [self._short_label(url) for url, _ in top_pagerank]
         pr_scores = [score for _, score in top_pagerank]
         
         fig.add_trace(
             go.Bar(x=pr_urls, y=pr_scores, name='PageRank',
                   marker_color='lightblue'),
-            row=1, col=2
+            row=1, col=1
         )
         
-        # 3. Degree distribution
-        degrees = [d for n, d in self.graph.degree()]
+        # 2. Degree distribution, binned here so the page carries 20 bar heights
+        # instead of one degree per node: one bar per degree for small degrees,
+        # otherwise 20 equal-width bins
+        degrees = self._degrees()
+        if degrees.max() < 20:
+            degree_counts = np.bincount(degrees)
+            bin_centers = np.arange(len(degree_counts))
+            bin_width = 1.0
+        else:
+            degree_counts, bin_edges = np.histogram(degrees, bins=20)
+            bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+            bin_width = float(bin_edges[1] - bin_edges[0])
         fig.add_trace(
-            go.Histogram(x=degrees, nbinsx=20, name='Degree Distribution',
-                        marker_color='lightgreen'),
-            row=2, col=1
+            go.Bar(x=bin_centers.tolist(), y=degree_counts.tolist(), width=bin_width,
+                   name='Degree Distribution', marker_color='lightgreen'),
+            row=1, col=2
         )
         
-        # 4. Node type pie chart
+        # 3. Node type pie chart
         file_count = len(analysis.file_nodes)
         page_count = analysis.total_nodes - file_count
         
         fig.add_trace(
             go.Pie(labels=['Pages', 'Files'], values=[page_count, file_count],
                   marker_colors=['blue', 'red']),
-            row=2, col=2
+            row=1, col=3
         )
         
         # Update layout
         fig.update_layout(
             title_text=f"Site Graph Dashboard - {analysis.total_nodes} Nodes, {analysis.total_edges} Edges",
             title_x=0.5,
-            height=800,
+            height=450,
             showlegend=False
         )
         
-        # Update subplot axes
-        fig.update_xaxes(showgrid=False, zeroline=False, showticklabels=False, row=1, col=1)
-        fig.update_yaxes(showgrid=False, zeroline=False, showticklabels=False, row=1, col=1)
+        network_fig = self._create_network_figure(layout_type) if include_network else None
         
         if output_path:
-            fig.write_html(output_path)
+            if network_fig is None:
+                fig.write_html(output_path)
+                return output_path
+            
+            # "</" is escaped so URLs in the hover text cannot close the script tag
+            network_json = network_fig.to_json().replace('</', '<\\/')
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(_DASHBOARD_HTML.format(
+                    summary=fig.to_html(full_html=False, include_plotlyjs=True),
+                    network=network_json
+                ))
             return output_path
         else:
             fig.show()
+            if network_fig is not None:
+                network_fig.show()
             return None
     
-    def export_for_cytoscape(self, output_path: str) -> str:
-        """Export graph in Cytoscape.js format."""
-        elements = []
+    def _create_network_figure(self, layout_type: str) -> 'go.Figure':
+        """Network panel of the dashboard as a standalone figure."""
+        pos = self.get_layout(layout_type)
+        pagerank = self._get_pagerank()
+        
+        # One (source, target, gap) triple per edge, gathered from the CSR
+        # arrays; plotly draws the NaN gaps as breaks
+        indptr, indices, node_ids = self._ensure_csr()
+        coords = np.array([pos[node] for node in node_ids], dtype=np.float32).reshape(-1, 2)
+        sources = np.repeat(np.arange(len(node_ids)), np.diff(indptr))
+        edge_x = np.full(3 * len(indices), np.nan, dtype=np.float32)
+        edge_y = np.full(3 * len(indices), np.nan, dtype=np.float32)
+        edge_x[0::3], edge_x[1::3] = coords[sources, 0], coords[indices, 0]
+        edge_y[0::3], edge_y[1::3] = coords[sources, 1], coords[indices, 1]
+        
+        fig = go.Figure()
+        fig.add_trace(
+            go.Scatter(x=edge_x, y=edge_y, mode='lines', 
+                      line=dict(width=0.5, color='#888'),
+                      hoverinfo='none', showlegend=False)
+        )
         
-        # Add nodes
-        centrality = self.graph_handler.calculate_centrality_measures()
-        pagerank = centrality.get('pagerank', {})
+        # Node data
+        node_x, node_y = coords[:, 0], coords[:, 1]
+        node_colors = []
+        node_text = []
         
-        for node in self.graph.nodes():
+        # Size by PageRank
+        node_sizes = np.maximum(5, np.fromiter((pagerank.get(node, 0.001) for node in node_ids),
+                                               dtype=np.float32, count=len(node_ids)) * 500)
+        
+        for node in node_ids:
             node_data = self.nodes.get(node)
             
-            element = {
-                'data': {
-                    'id': node,
-                    'label': urlparse(node).path.split('/')[-1] if urlparse(node).path else urlparse(node).netloc,
-                    'pagerank': pagerank.get(node, 0),
-                    'degree': self.graph.degree(node),
-                    'is_file': node_data.is_file if node_data else False,
-                    'depth': node_data.depth if node_data else 0
-                }
-            }
-            elements.append(element)
-        
-        # Add edges
-        for edge in self.graph.edges():
-            element = {
-                'data': {
-                    'id': f"{edge[0]}-{edge[1]}",
-                    'source': edge[0],
-                    'target': edge[1]
-                }
-            }
-            elements.append(element)
-        
-        # Create Cytoscape format
-        cytoscape_data = {
-            'elements': elements,
-            'style': [
-                {
-                    'selector': 'node',
-                    'style': {
-                        'background-color': 'data(is_file) ? "red" : "blue"',
-                        'label': 'data(label)',
-                        'width': 'mapData(pagerank, 0, 1, 20, 80)',
-                        'height': 'mapData(pagerank, 0, 1, 20, 80)'
-                    }
-                },
-                {
-                    'selector': 'edge',
-                    'style': {
-                        'width': 2,
-                        'line-color': '#ccc',
-                        'target-arrow-color': '#ccc',
-                        'target-arrow-shape': 'triangle'
+            # Color by type
+            if node_data and node_data.is_file:
+                node_colors.append('red')
+            else:
+                node_colors.append('blue')
+            
+            # Hover text
+            display_name = self._short_label(node)
+            node_text.append(f"{display_name}<br>PageRank: {pagerank.get(node, 0):.4f}")
+        
+        fig.add_trace(
+            go.Scatter(x=node_x, y=node_y, mode='markers',
+                      marker=dict(size=node_sizes, color=node_colors, 
+                                 line=dict(width=1, color='white')),
+                      text=node_text, hoverinfo='text',
+                      showlegend=False)
+        )
+        
+        fig.update_layout(title_text='Site Graph Network', title_x=0.5, height=600, showlegend=False)
+        fig.update_xaxes(showgrid=False, zeroline=False, showticklabels=False)
+        fig.update_yaxes(showgrid=False, zeroline=False, showticklabels=False)
+        return fig
+    
+    def export_for_cytoscape(self, output_path: str, layout_type: Optional[str] = None) -> str:
+        """Export graph in Cytoscape.js format.
+        
+        Elements are encoded and written one at a time, so memory use does not
+        grow with the size of the export. With a ``layout_type``, nodes carry
+        positions from get_layout() and the export uses Cytoscape's preset
+        layout instead of running cose in the browser.
+        """
+        if ORJSON_AVAILABLE:
+            encode = orjson.dumps
+        else:
+            def encode(element) -> bytes:
+                return json.dumps(element).encode('utf-8')
+        
+        pagerank = self._get_pagerank()
+        indptr, indices, node_ids = self._ensure_csr()
+        degrees = self._degrees().tolist()
+        
+        positions = [None] * len(node_ids)
+        if layout_type is not None and node_ids:
+            # Cytoscape positions are in pixels with y pointing down
+            pos = self.get_layout(layout_type)
+            scale = 100 * np.sqrt(len(node_ids))
+            coords = np.array([pos[node] for node in node_ids], dtype=float) * [scale, -scale]
+            positions = [{'x': x, 'y': y} for x, y in coords.tolist()]
+        
+        with open(output_path, 'wb') as f:
+            f.write(b'{\n"elements": [')
+            separator = b'\n'
+            
+            # Add nodes
+            for node, degree, position in zip(node_ids, degrees, positions):
+                node_data = self.nodes.get(node)
+                element = {
+                    'data': {
+                        'id': node,
+                        'label': self._short_label(node),
+                        'pagerank': pagerank.get(node, 0),
+                        'degree': degree,
+                        'is_file': node_data.is_file if node_data else False,
+                        'depth': node_data.depth if node_data else 0
                     }
                 }
-            ],
-            'layout': {
-                'name': 'cose',
-                'idealEdgeLength': 100,
-                'nodeOverlap': 20
-            }
-        }
-        
-        with open(output_path, 'w') as f:
-            json.dump(cytoscape_data, f, indent=2)
+                if position is not None:
+                    element['position'] = position
+                f.write(separator)
+                f.write(encode(element))
+                separator = b',\n'
+            
+            # Add edges
+            for i, source in enumerate(node_ids):
+                for j in indices[indptr[i]:indptr[i + 1]].tolist():
+                    target = node_ids[j]
+                    f.write(separator)
+                    f.write(encode({
+                        'data': {
+                            'id': f"{source}-{target}",
+                            'source': source,
+                            'target': target
+                        }
+                    }))
+                    separator = b',\n'
+            
+            f.write(_CYTOSCAPE_TRAILER if layout_type is None else _CYTOSCAPE_PRESET_TRAILER)
         
         return output_path
 
@@ -552,30 +913,47 @@ def quick_visualize(graph_handler, output_dir: str = "visualizations") -> Dict[s
     visualizer = GraphVisualizer(graph_handler)
     results = {}
     
-    # Static matplotlib visualization
-    if MATPLOTLIB_AVAILABLE:
-        static_path = output_dir / "site_graph_static.png"
-        result = visualizer.visualize_with_matplotlib(
-            output_path=str(static_path),
-            layout_type="spring",
-            color_scheme="depth",
-            size_scheme="pagerank"
-        )
-        if result:
-            results['static'] = result
-    
-    # Interactive dashboard
-    if PLOTLY_AVAILABLE:
-        dashboard_path = output_dir / "site_graph_dashboard.html"
-        result = visualizer.create_interactive_dashboard(str(dashboard_path))
-        if result:
-            results['dashboard'] = result
-    
-    # Cytoscape export
-    cytoscape_path = output_dir / "site_graph_cytoscape.json"
-    result = visualizer.export_for_cytoscape(str(cytoscape_path))
-    if result:
-        results['cytoscape'] = result
+    # Compute the shared metrics and the one layout all three renders use
+    # once, before the renders run side by side
+    layout_type = "spring"
+    if visualizer.graph.number_of_nodes() > 0:
+        visualizer._get_analysis()
+        visualizer._ensure_csr()
+        visualizer._get_pagerank()
+        visualizer._get_url_parts()
+        visualizer.get_layout(layout_type)
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {}
+        
+        # Interactive dashboard
+        if PLOTLY_AVAILABLE:
+            dashboard_path = output_dir / "site_graph_dashboard.html"
+            futures['dashboard'] = executor.submit(visualizer.create_interactive_dashboard, str(dashboard_path),
+                                                   layout_type=layout_type)
+        
+        # Cytoscape export
+        cytoscape_path = output_dir / "site_graph_cytoscape.json"
+        futures['cytoscape'] = executor.submit(visualizer.export_for_cytoscape, str(cytoscape_path),
+                                               layout_type=layout_type)
+        
+        # Static matplotlib visualization, on this thread since pyplot is not
+        # thread-safe; it overlaps with the two renders above
+        if MATPLOTLIB_AVAILABLE:
+            static_path = output_dir / "site_graph_static.png"
+            result = visualizer.visualize_with_matplotlib(
+                output_path=str(static_path),
+                layout_type=layout_type,
+                color_scheme="depth",
+                size_scheme="pagerank"
+            )
+            if result:
+                results['static'] = result
+        
+        for name, future in futures.items():
+            result = future.result()
+            if result:
+                results[name] = result
     
     return results
 
@@ -611,16 +989,18 @@ def analyze_graph_patterns(graph_handler) -> Dict[str, Any]:
     
     # Hub and spoke detection
     if centrality.get('degree'):
-        degrees = list(centrality['degree'].values())
-        max_degree = max(degrees) if degrees else 0
-        avg_degree = sum(degrees) / len(degrees) if degrees else 0
+        degrees = np.fromiter(centrality['degree'].values(), dtype=float, count=len(centrality['degree']))
+        max_degree = degrees.max()
+        avg_degree = degrees.mean()
         
         if max_degree > 3 * avg_degree and max_degree > 10:
             patterns['hub_and_spoke']['detected'] = True
-            patterns['hub_and_spoke']['confidence'] = min(1.0, max_degree / (5 * avg_degree))
+            patterns['hub_and_spoke']['confidence'] = min(1.0, float(max_degree / (5 * avg_degree)))
             
-            # Find hub nodes (top 10% by degree)
-            degree_threshold = sorted(degrees, reverse=True)[max(0, len(degrees) // 10)]
+            # Find hub nodes (top 10% by degree); a partial partition finds the
+            # (n // 10)-th largest degree without sorting them all
+            rank = len(degrees) - 1 - len(degrees) // 10
+            degree_threshold = np.partition(degrees, rank)[rank]
             patterns['hub_and_spoke']['hub_nodes'] = [
                 node for node, degree in centrality['degree'].items() 
                 if degree >= degree_threshold
@@ -639,9 +1019,8 @@ def analyze_graph_patterns(graph_handler) -> Dict[str, Any]:
         patterns['hierarchical']['levels'] = len(depth_groups)
         
         # Confidence based on depth distribution uniformity
-        counts = list(depth_groups.values())
+        counts = np.fromiter(depth_groups.values(), dtype=np.int64, count=len(depth_groups))
         if len(counts) > 1:
-            variance = sum((x - sum(counts)/len(counts))**2 for x in counts) / len(counts)
-            patterns['hierarchical']['confidence'] = max(0.0, 1.0 - variance / (sum(counts)/len(counts))**2)
+            patterns['hierarchical']['confidence'] = max(0.0, float(1.0 - counts.var() / counts.mean()**2))
     
     return patterns
\ No newline at end of file
@@ -140,6 +140,8 @@ class CrawlResult(BaseModel):
     pdf: Optional[bytes] = None
     mhtml: Optional[str] = None
     _markdown: Optional[MarkdownGenerationResult] = PrivateAttr(default=None)
+    _hrefs: Dict[str, List[str]] = PrivateAttr(default_factory=dict)
+    _hrefs_source: Optional[Dict[str, List[Dict]]] = PrivateAttr(default=None)
     extracted_content: Optional[str] = None
     metadata: Optional[dict] = None
     error_message: Optional[str] = None
@@ -198,6 +200,37 @@ class CrawlResult(BaseModel):
         """
         self._markdown = value
     
+    @property
+    def internal_hrefs(self) -> List[str]:
+        """Hrefs of the internal links as plain strings, in page order."""
+        return self._link_hrefs("internal")
+    
+    @property
+    def external_hrefs(self) -> List[str]:
+        """Hrefs of the external links as plain strings, in page order."""
+        return self._link_hrefs("external")
+    
+    def _link_hrefs(self, group: str) -> List[str]:
+        """
+        Flatten one group of `links` into href strings, once per result.
+        
+        Links come either as dicts with an 'href' key or as bare strings;
+        entries without an href are skipped. The lists are cached until `links`
+        is reassigned; in-place edits of `links` are not picked up.
+        """
+        if self._hrefs_source is not self.links:
+            self._hrefs = {}
+            self._hrefs_source = self.links
+        hrefs = self._hrefs.get(group)
+        if hrefs is None:
+            hrefs = []
+            for link in (self.links or {}).get(group) or ():
+                href = link.get("href") if isinstance(link, dict) else link
+                if href and isinstance(href, str):
+                    hrefs.append(href)
+            self._hrefs[group] = hrefs
+        return hrefs
+    
     @property
     def markdown_v2(self):
         """
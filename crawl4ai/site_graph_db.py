@@ -13,15 +13,109 @@ Follows existing Crawl4AI patterns:
 
 import os
 import json
+import asyncio
 import aiosqlite
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple, Any
+from dataclasses import dataclass, asdict, fields
+from urllib.parse import urlparse
 from .async_database import AsyncDatabaseManager
-from .async_logger import AsyncLogger
+from .async_logger import AsyncLogger, LogLevel
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass
+
+# Per-connection SQLite settings, on top of the WAL journal and busy timeout
+# the pool already sets. With WAL, synchronous=NORMAL only syncs at checkpoints
+# instead of on every commit
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -64000",
+)
+
+
+# Converts a column holding legacy local time ISO text to a Unix timestamp
+_EPOCH_FROM_TEXT = (
+    "CASE WHEN typeof({column}) = 'text' "
+    "THEN CAST(strftime('%s', {column}, 'utc') AS INTEGER) ELSE {column} END"
+)
+
+
+async def _apply_connection_pragmas(db: aiosqlite.Connection) -> None:
+    for pragma in _CONNECTION_PRAGMAS:
+        await db.execute(pragma)
+
+
+def _origin(url: str) -> Optional[str]:
+    """``scheme://netloc`` of a URL, the key of its base_urls row"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}" if parsed.scheme and parsed.netloc else None
+
+
+def _encode_metadata(metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+    """JSON text for the metadata column; empty metadata is stored as NULL"""
+    if not metadata:
+        return None
+    if HAS_ORJSON:
+        return orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(metadata)
+
+
+def _decode_metadata(raw: str) -> Dict[str, Any]:
+    try:
+        return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+    except ValueError:
+        return {}
+
+
+def _to_epoch(value: Optional[datetime]) -> Optional[int]:
+    """Unix timestamp stored for a datetime"""
+    return int(value.timestamp()) if value else None
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    """datetime of a stored timestamp; ISO text is left in databases written
+    before timestamps were stored as integers"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(value)
+
+
+class _LazyField:
+    """A URLNode field holding the column value of rows read from the
+    database (metadata JSON text, integer timestamps), which is only
+    converted when the attribute is first read.
+    
+    Wraps the slot descriptor of the field, which keeps the stored value"""
+    
+    def __init__(self, slot, raw_types, convert):
+        self._slot = slot
+        self._raw_types = raw_types
+        self._convert = convert
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = self._slot.__get__(obj, objtype)
+        if isinstance(value, self._raw_types):
+            value = self._convert(value)
+            self._slot.__set__(obj, value)
+        return value
+    
+    def __set__(self, obj, value):
+        self._slot.__set__(obj, value)
+
+
+@dataclass(slots=True)
 class URLNode:
     """Represents a discovered URL in the site graph"""
     url: str
@@ -41,7 +135,97 @@ class URLNode:
     retry_count: int = 0
 
 
-@dataclass
+URLNode.discovered_at = _LazyField(URLNode.discovered_at, (int, float, str), _to_datetime)
+URLNode.last_checked = _LazyField(URLNode.last_checked, (int, float, str), _to_datetime)
+URLNode.metadata = _LazyField(URLNode.metadata, str, _decode_metadata)
+
+
+class URLNodeView(NamedTuple):
+    """Read-only URLNode for consumers that only scan rows, such as
+    ``iter_site_graph(..., as_views=True)``; metadata is the raw JSON text"""
+    url: str
+    source_url: Optional[str]
+    discovered_at: Optional[datetime]
+    last_checked: Optional[datetime]
+    status_code: Optional[int]
+    content_type: Optional[str]
+    file_size: Optional[int]
+    is_file: bool
+    file_extension: Optional[str]
+    download_status: str
+    local_path: Optional[str]
+    checksum: Optional[str]
+    metadata: Optional[str]
+    error_message: Optional[str]
+    retry_count: int
+
+
+# Columns of discovered_urls read into a URLNode, in field order; the rows
+# are unpacked by position instead of being zipped into a dict per row
+_DISCOVERED_URLS_COLS = (
+    "url", "source_url", "discovered_at", "last_checked", "status_code",
+    "content_type", "file_size", "is_file", "file_extension", "download_status",
+    "local_path", "checksum", "metadata", "error_message", "retry_count",
+)
+_URL_COLUMNS = ", ".join(_DISCOVERED_URLS_COLS)
+# For listings: the same row layout without reading the metadata text
+_URL_COLUMNS_LIGHT = _URL_COLUMNS.replace("metadata", "NULL AS metadata")
+
+
+def _row_to_url_node(row: tuple) -> URLNode:
+    """Build a URLNode from a discovered_urls row"""
+    (url, source_url, discovered_at, last_checked, status_code, content_type, file_size,
+     is_file, file_extension, download_status, local_path, checksum, metadata,
+     error_message, retry_count) = row[:len(_DISCOVERED_URLS_COLS)]
+    
+    return URLNode(
+        url,
+        source_url,
+        # Timestamps and metadata are left as stored, for URLNode to convert
+        # on first access
+        discovered_at,
+        last_checked,
+        status_code,
+        content_type,
+        file_size,
+        bool(is_file),
+        file_extension,
+        download_status,
+        local_path,
+        checksum,
+        # Empty metadata is NULL, or '{}' in rows written before that
+        metadata if metadata and metadata != '{}' else {},
+        error_message,
+        retry_count
+    )
+
+
+def _row_to_url_node_view(row: tuple) -> URLNodeView:
+    """Build a URLNodeView from a discovered_urls row"""
+    (url, source_url, discovered_at, last_checked, status_code, content_type, file_size,
+     is_file, file_extension, download_status, local_path, checksum, metadata,
+     error_message, retry_count) = row[:len(_DISCOVERED_URLS_COLS)]
+    
+    return URLNodeView(
+        url,
+        source_url,
+        _to_datetime(discovered_at),
+        _to_datetime(last_checked),
+        status_code,
+        content_type,
+        file_size,
+        bool(is_file),
+        file_extension,
+        download_status,
+        local_path,
+        checksum,
+        metadata,
+        error_message,
+        retry_count
+    )
+
+
+@dataclass(slots=True)
 class SiteGraphStats:
     """Statistics for site graph crawling"""
     base_url: str
@@ -55,37 +239,238 @@ class SiteGraphStats:
     revisit_ratio: float = 0.0
 
 
+# Statements run on every write or lookup. They are kept as constants so each
+# call submits the same text, which the connections' statement cache
+# (keyed by SQL text) maps to the already compiled statement
+_STATEMENT_CACHE_SIZE = 256
+
+# First discovery of a URL: rows already stored are left as they are
+_SQL_INSERT_NEW_URL = """
+    INSERT OR IGNORE INTO discovered_urls (
+        url, source_url, discovered_at, last_checked, status_code,
+        content_type, file_size, is_file, file_extension, download_status,
+        local_path, checksum, metadata, error_message, retry_count, base_url_id,
+        source_base_url_id
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPSERT_URL = """
+    INSERT INTO discovered_urls (
+        url, source_url, discovered_at, last_checked, status_code,
+        content_type, file_size, is_file, file_extension, download_status,
+        local_path, checksum, metadata, error_message, retry_count, base_url_id,
+        source_base_url_id
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url) DO UPDATE SET
+        last_checked = excluded.last_checked,
+        status_code = excluded.status_code,
+        content_type = excluded.content_type,
+        file_size = excluded.file_size,
+        download_status = excluded.download_status,
+        local_path = excluded.local_path,
+        checksum = excluded.checksum,
+        metadata = excluded.metadata,
+        error_message = excluded.error_message,
+        retry_count = excluded.retry_count
+"""
+
+_SQL_UPDATE_URL_STATUS = """
+    UPDATE discovered_urls
+    SET last_checked = ?, status_code = ?, content_type = ?,
+        file_size = ?, error_message = ?
+    WHERE url = ?
+"""
+
+_SQL_UPDATE_DOWNLOAD_STATUS = """
+    UPDATE discovered_urls
+    SET download_status = ?, local_path = ?, checksum = ?,
+        error_message = ?, last_checked = ?
+    WHERE url = ?
+"""
+
+_SQL_UPSERT_STATS = """
+    INSERT INTO site_graph_stats (
+        base_url, total_urls_discovered, total_files_discovered,
+        total_files_downloaded, crawl_start_time, crawl_end_time,
+        last_activity, dead_end_count, revisit_ratio
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(base_url) DO UPDATE SET
+        total_urls_discovered = excluded.total_urls_discovered,
+        total_files_discovered = excluded.total_files_discovered,
+        total_files_downloaded = excluded.total_files_downloaded,
+        crawl_end_time = excluded.crawl_end_time,
+        last_activity = excluded.last_activity,
+        dead_end_count = excluded.dead_end_count,
+        revisit_ratio = excluded.revisit_ratio
+"""
+
+_SQL_SELECT_URL = f"SELECT {_URL_COLUMNS} FROM discovered_urls WHERE url = ?"
+
+# Trigger condition selecting the stats row of the site a URL belongs to
+_STATS_ROW_OF_URL = """base_url IN (
+    SELECT base_url FROM base_urls WHERE id = {row}.base_url_id
+    UNION ALL
+    SELECT base_url || '/' FROM base_urls WHERE id = {row}.base_url_id
+)"""
+_STATS_ROW_OF_NEW_URL = _STATS_ROW_OF_URL.format(row="NEW")
+_STATS_ROW_OF_OLD_URL = _STATS_ROW_OF_URL.format(row="OLD")
+
+_STATS_COLUMNS = tuple(field.name for field in fields(SiteGraphStats))
+
+_SQL_SELECT_STATS = f"SELECT {', '.join(_STATS_COLUMNS)} FROM site_graph_stats WHERE base_url = ?"
+
+_SQL_SELECT_BASE_URL_ID = "SELECT id FROM base_urls WHERE base_url = ?"
+
+_SQL_INSERT_BASE_URL = "INSERT OR IGNORE INTO base_urls (base_url) VALUES (?)"
+
+
 class SiteGraphDatabaseManager:
     """
     Extension to AsyncDatabaseManager for site graph persistence.
     
     Integrates with existing database infrastructure while adding
     site mapping and file discovery capabilities.
+    
+    Reads and writes use their own connections over WAL: one writer, and up
+    to ``max_readers`` read-only connections, so queries never wait behind a
+    write transaction.
     """
     
-    def __init__(self, db_manager: AsyncDatabaseManager):
+    def __init__(self, db_manager: AsyncDatabaseManager, max_readers: Optional[int] = None,
+                 match_by_prefix: bool = False):
         self.db_manager = db_manager
         self.logger = AsyncLogger(
             log_file=os.path.join(os.path.dirname(db_manager.db_path), "site_graph.log"),
             verbose=False,
             tag_width=12,
         )
-        self._schema_initialized = False
+        # Set once the schema exists; callers check it inline before awaiting
+        # initialize_site_graph_schema(), so the common case costs no await
+        self._init_event = asyncio.Event()
+        self._init_lock = asyncio.Lock()
+        
+        # Sites are selected by the indexed origin ids of their URLs and of the
+        # pages linking to them; with match_by_prefix, by the old
+        # url/source_url LIKE prefix match instead
+        self.match_by_prefix = match_by_prefix
+        self._base_url_ids: Dict[str, int] = {}
+        
+        # Connections are opened on first use, see _acquire_read()/_acquire_write()
+        self.max_readers = max_readers or os.cpu_count() or 1
+        self._readers: asyncio.Queue = asyncio.Queue()
+        self._reader_count = 0
+        # Bumped by close(); readers borrowed before it are closed on release
+        self._reader_generation = 0
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+
+    async def _open_connection(self, read_only: bool) -> aiosqlite.Connection:
+        """Open a connection outside the shared pool, closed again by close()"""
+        self.db_manager.add_cleanup_hook(self.close)
+        if read_only:
+            uri = Path(self.db_manager.db_path).resolve().as_uri() + "?mode=ro"
+            db = await aiosqlite.connect(uri, uri=True, timeout=30.0,
+                                         cached_statements=_STATEMENT_CACHE_SIZE)
+        else:
+            db = await aiosqlite.connect(self.db_manager.db_path, timeout=30.0,
+                                         cached_statements=_STATEMENT_CACHE_SIZE)
+        await db.execute("PRAGMA busy_timeout = 5000")
+        await _apply_connection_pragmas(db)
+        return db
+
+    @asynccontextmanager
+    async def _acquire_read(self):
+        """Borrow a read-only connection, opening one while below max_readers"""
+        db = None
+        # None in the queue is a freed slot rather than a connection, see below
+        while db is None:
+            try:
+                db = self._readers.get_nowait()
+            except asyncio.QueueEmpty:
+                if self._reader_count < self.max_readers:
+                    self._reader_count += 1
+                    try:
+                        db = await self._open_connection(read_only=True)
+                    except Exception:
+                        self._reader_count -= 1
+                        raise
+                else:
+                    db = await self._readers.get()
+        generation = self._reader_generation
+        try:
+            yield db
+        finally:
+            if generation == self._reader_generation:
+                self._readers.put_nowait(db)
+            else:
+                # Borrowed across close(): close it, and wake a waiter to open
+                # a new connection in its slot
+                self._reader_count -= 1
+                self._readers.put_nowait(None)
+                await db.close()
+
+    @asynccontextmanager
+    async def _acquire_write(self):
+        """Hold the writer connection for one transaction, committed on success"""
+        async with self._write_lock:
+            if self._writer is None:
+                self._writer = await self._open_connection(read_only=False)
+            db = self._writer
+            # Take the write lock up front rather than upgrading mid-transaction,
+            # which can fail with SQLITE_BUSY
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
+            await db.commit()
+
+    async def close(self):
+        """Close the reader and writer connections"""
+        async with self._write_lock:
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+        # Idle readers are closed here, borrowed ones when they are released
+        self._reader_generation += 1
+        while not self._readers.empty():
+            db = self._readers.get_nowait()
+            if db is not None:
+                await db.close()
+                self._reader_count -= 1
 
     async def initialize_site_graph_schema(self):
         """Initialize site graph database schema using existing patterns"""
-        if self._schema_initialized:
+        if self._init_event.is_set():
             return
-            
+        async with self._init_lock:
+            if not self._init_event.is_set():
+                await self._create_schema()
+                self._init_event.set()
+
+    async def _create_schema(self):
+        """Create the site graph tables and indexes, migrating older databases"""
         try:
+            # Every pooled connection, including the one below, gets the pragmas
+            self.db_manager.add_connection_init_hook(_apply_connection_pragmas)
+            
             async with self.db_manager.get_connection() as db:
-                # Create discovered_urls table
+                # Create discovered_urls table. source_url is a plain column
+                # rather than a foreign key to url: links are stored before the
+                # page they point from, and a constraint would cost a parent
+                # lookup per insert. The source index covers joins on it.
+                # Tables created with the constraint keep it, which is not
+                # enforced as foreign_keys is left off
                 await db.execute("""
                     CREATE TABLE IF NOT EXISTS discovered_urls (
                         url TEXT PRIMARY KEY,
                         source_url TEXT,
-                        discovered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        last_checked TIMESTAMP,
+                        discovered_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                        last_checked INTEGER,
                         status_code INTEGER,
                         content_type TEXT,
                         file_size INTEGER,
@@ -97,10 +482,40 @@ class SiteGraphDatabaseManager:
                         metadata TEXT DEFAULT '{}',
                         error_message TEXT,
                         retry_count INTEGER DEFAULT 0,
-                        FOREIGN KEY (source_url) REFERENCES discovered_urls(url)
+                        base_url_id INTEGER,
+                        source_base_url_id INTEGER
+                    )
+                """)
+                
+                # Origins (scheme://netloc) of the discovered URLs
+                await db.execute("""
+                    CREATE TABLE IF NOT EXISTS base_urls (
+                        id INTEGER PRIMARY KEY,
+                        base_url TEXT UNIQUE
                     )
                 """)
                 
+                # Databases created before the origin id columns get them and
+                # have their rows keyed once
+                async with db.execute("PRAGMA table_info(discovered_urls)") as cursor:
+                    columns = {column[1] for column in await cursor.fetchall()}
+                missing_columns = [column for column in ("base_url_id", "source_base_url_id")
+                                   if column not in columns]
+                if missing_columns:
+                    for column in missing_columns:
+                        await db.execute(f"ALTER TABLE discovered_urls ADD COLUMN {column} INTEGER")
+                    async with db.execute("SELECT url, source_url FROM discovered_urls") as cursor:
+                        origins = [(url, _origin(url), _origin(source_url) if source_url else None)
+                                   for url, source_url in await cursor.fetchall()]
+                    base_url_ids = await self._resolve_base_url_ids(
+                        db, {origin for _, *pair in origins for origin in pair} - {None}
+                    )
+                    await db.executemany(
+                        "UPDATE discovered_urls SET base_url_id = ?, source_base_url_id = ? WHERE url = ?",
+                        [(base_url_ids.get(origin), base_url_ids.get(source_origin), url)
+                         for url, origin, source_origin in origins]
+                    )
+                
                 # Create site_graph_stats table
                 await db.execute("""
                     CREATE TABLE IF NOT EXISTS site_graph_stats (
@@ -108,14 +523,81 @@ class SiteGraphDatabaseManager:
                         total_urls_discovered INTEGER DEFAULT 0,
                         total_files_discovered INTEGER DEFAULT 0,
                         total_files_downloaded INTEGER DEFAULT 0,
-                        crawl_start_time TIMESTAMP,
-                        crawl_end_time TIMESTAMP,
-                        last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        crawl_start_time INTEGER,
+                        crawl_end_time INTEGER,
+                        last_activity INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
                         dead_end_count INTEGER DEFAULT 0,
                         revisit_ratio REAL DEFAULT 0.0
                     )
                 """)
                 
+                # Timestamps were stored as local time ISO text before being
+                # stored as Unix timestamps; text sorts after numbers, so the
+                # discovered_at index finds legacy rows without a scan
+                async with db.execute(
+                    "SELECT 1 FROM discovered_urls WHERE discovered_at >= '' LIMIT 1"
+                ) as cursor:
+                    has_legacy_timestamps = await cursor.fetchone() is not None
+                if has_legacy_timestamps:
+                    await db.execute(f"""
+                        UPDATE discovered_urls SET
+                            discovered_at = {_EPOCH_FROM_TEXT.format(column="discovered_at")},
+                            last_checked = {_EPOCH_FROM_TEXT.format(column="last_checked")}
+                        WHERE typeof(discovered_at) = 'text' OR typeof(last_checked) = 'text'
+                    """)
+                await db.execute(f"""
+                    UPDATE site_graph_stats SET
+                        crawl_start_time = {_EPOCH_FROM_TEXT.format(column="crawl_start_time")},
+                        crawl_end_time = {_EPOCH_FROM_TEXT.format(column="crawl_end_time")},
+                        last_activity = {_EPOCH_FROM_TEXT.format(column="last_activity")}
+                    WHERE typeof(crawl_start_time) = 'text' OR typeof(crawl_end_time) = 'text'
+                        OR typeof(last_activity) = 'text'
+                """)
+                
+                # Keep a site's counters current as its URLs are stored and
+                # downloaded, so reading them is a primary key lookup. Only
+                # stats rows keyed by the origin are maintained, and only once
+                # they exist; store_site_graph_stats() still overwrites them
+                await db.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_discovered_urls_ai
+                    AFTER INSERT ON discovered_urls
+                    BEGIN
+                        UPDATE site_graph_stats SET
+                            total_urls_discovered = total_urls_discovered + 1,
+                            total_files_discovered = total_files_discovered + (NEW.is_file = 1),
+                            total_files_downloaded = total_files_downloaded
+                                + (NEW.is_file = 1 AND NEW.download_status = 'completed'),
+                            last_activity = CAST(strftime('%s', 'now') AS INTEGER)
+                        WHERE {_STATS_ROW_OF_NEW_URL};
+                    END
+                """)
+                await db.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_discovered_urls_downloaded
+                    AFTER UPDATE OF download_status ON discovered_urls
+                    WHEN NEW.is_file = 1 AND NEW.download_status = 'completed'
+                        AND OLD.download_status IS NOT 'completed'
+                    BEGIN
+                        UPDATE site_graph_stats SET
+                            total_files_downloaded = total_files_downloaded + 1,
+                            last_activity = CAST(strftime('%s', 'now') AS INTEGER)
+                        WHERE {_STATS_ROW_OF_NEW_URL};
+                    END
+                """)
+                # Deleted URLs (cleanup_old_entries) are taken back off, never
+                # below zero as store_site_graph_stats() may have lowered them
+                await db.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_discovered_urls_ad
+                    AFTER DELETE ON discovered_urls
+                    BEGIN
+                        UPDATE site_graph_stats SET
+                            total_urls_discovered = MAX(total_urls_discovered - 1, 0),
+                            total_files_discovered = MAX(total_files_discovered - (OLD.is_file = 1), 0),
+                            total_files_downloaded = MAX(total_files_downloaded
+                                - (OLD.is_file = 1 AND OLD.download_status = 'completed'), 0)
+                        WHERE {_STATS_ROW_OF_OLD_URL};
+                    END
+                """)
+                
                 # Create indexes for performance
                 await db.execute("""
                     CREATE INDEX IF NOT EXISTS idx_discovered_urls_source 
@@ -123,23 +605,38 @@ class SiteGraphDatabaseManager:
                 """)
                 
                 await db.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_discovered_urls_is_file 
-                    ON discovered_urls(is_file)
+                    CREATE INDEX IF NOT EXISTS idx_discovered_urls_discovered_at 
+                    ON discovered_urls(discovered_at)
                 """)
                 
+                # Files by status, covering the per-status file counts of
+                # get_crawl_progress(). Partial, as most rows are pages; only
+                # used by queries spelling the condition as is_file = 1
                 await db.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_discovered_urls_status 
-                    ON discovered_urls(download_status)
+                    CREATE INDEX IF NOT EXISTS idx_files_status_base
+                    ON discovered_urls(is_file, download_status, url)
+                    WHERE is_file = 1
                 """)
                 
+                # Superseded by the two indexes above and below
+                for index in ("idx_discovered_urls_is_file", "idx_discovered_urls_status",
+                              "idx_discovered_urls_file_status"):
+                    await db.execute(f"DROP INDEX IF EXISTS {index}")
+                
+                # Site lookups, and the file counts when matching by base_url_id
                 await db.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_discovered_urls_discovered_at 
-                    ON discovered_urls(discovered_at)
+                    CREATE INDEX IF NOT EXISTS idx_discovered_urls_base_url
+                    ON discovered_urls(base_url_id, is_file, download_status)
+                """)
+                
+                # URLs linked from a site, which site lookups take in as well
+                await db.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_discovered_urls_source_base_url
+                    ON discovered_urls(source_base_url_id)
                 """)
                 
                 await db.commit()
                 
-            self._schema_initialized = True
             self.logger.success("Site graph schema initialized successfully", tag="INIT")
             
         except Exception as e:
@@ -150,39 +647,95 @@ class SiteGraphDatabaseManager:
             )
             raise
 
+    async def _resolve_base_url_ids(self, db, origins) -> Dict[str, int]:
+        """Return base_urls ids for origins, inserting the missing ones"""
+        ids = {origin: self._base_url_ids[origin] for origin in origins if origin in self._base_url_ids}
+        missing = [(origin,) for origin in origins if origin not in ids]
+        if missing:
+            await db.executemany(_SQL_INSERT_BASE_URL, missing)
+            for (origin,) in missing:
+                async with db.execute(_SQL_SELECT_BASE_URL_ID, (origin,)) as cursor:
+                    ids[origin] = (await cursor.fetchone())[0]
+        return ids
+
+    async def _site_filter(self, db, base_url: str,
+                           include_sources: bool = False) -> Optional[Tuple[str, List[Any]]]:
+        """SQL condition and parameters selecting a site's rows.
+        
+        Returns None when nothing was ever stored under the site's origin.
+        Base URLs with a path also keep the url prefix match within the origin.
+        With ``include_sources``, URLs linked from the site are selected too,
+        whatever their own origin, e.g. files hosted on a CDN.
+        """
+        if self.match_by_prefix:
+            if include_sources:
+                return "(url LIKE ? OR source_url LIKE ?)", [f"{base_url}%", f"{base_url}%"]
+            return "url LIKE ?", [f"{base_url}%"]
+        
+        origin = _origin(base_url)
+        if origin is None:
+            return None
+        base_url_id = self._base_url_ids.get(origin)
+        if base_url_id is None:
+            async with db.execute(_SQL_SELECT_BASE_URL_ID, (origin,)) as cursor:
+                row = await cursor.fetchone()
+            if row is None:
+                return None
+            base_url_id = self._base_url_ids[origin] = row[0]
+        
+        if base_url.rstrip('/') == origin:
+            if include_sources:
+                return "(base_url_id = ? OR source_base_url_id = ?)", [base_url_id, base_url_id]
+            return "base_url_id = ?", [base_url_id]
+        if include_sources:
+            return (
+                "((base_url_id = ? AND url LIKE ?) OR (source_base_url_id = ? AND source_url LIKE ?))",
+                [base_url_id, f"{base_url}%", base_url_id, f"{base_url}%"]
+            )
+        return "base_url_id = ? AND url LIKE ?", [base_url_id, f"{base_url}%"]
+
     async def store_discovered_url(self, url_node: URLNode) -> None:
         """Store a discovered URL in the site graph using existing database patterns"""
-        await self.initialize_site_graph_schema()
+        await self.upsert_discovered_url(url_node)
+
+    async def upsert_discovered_url(self, url_node: URLNode) -> None:
+        """Store a URL, updating the crawl state of an already stored one"""
+        await self._store_urls([url_node], _SQL_UPSERT_URL)
+
+    async def store_new_discovered_url(self, url_node: URLNode) -> None:
+        """Store a newly discovered URL; an already stored URL is kept as is"""
+        await self._store_urls([url_node], _SQL_INSERT_NEW_URL)
+
+    async def store_discovered_urls_bulk(self, url_nodes: List[URLNode]) -> None:
+        """Store many discovered URLs in one transaction, updating the crawl
+        state of already stored ones.
         
-        async def _store(db):
-            # Convert datetime objects to ISO format strings for storage
-            discovered_at = url_node.discovered_at.isoformat() if url_node.discovered_at else None
-            last_checked = url_node.last_checked.isoformat() if url_node.last_checked else None
-            metadata_json = json.dumps(url_node.metadata or {})
-            
-            await db.execute("""
-                INSERT INTO discovered_urls (
-                    url, source_url, discovered_at, last_checked, status_code,
-                    content_type, file_size, is_file, file_extension, download_status,
-                    local_path, checksum, metadata, error_message, retry_count
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(url) DO UPDATE SET
-                    last_checked = excluded.last_checked,
-                    status_code = excluded.status_code,
-                    content_type = excluded.content_type,
-                    file_size = excluded.file_size,
-                    download_status = excluded.download_status,
-                    local_path = excluded.local_path,
-                    checksum = excluded.checksum,
-                    metadata = excluded.metadata,
-                    error_message = excluded.error_message,
-                    retry_count = excluded.retry_count
-            """, (
+        Rows are written with a single executemany, so a page's whole link list
+        costs one commit instead of one per URL.
+        """
+        await self._store_urls(url_nodes, _SQL_UPSERT_URL)
+
+    async def store_new_discovered_urls_bulk(self, url_nodes: List[URLNode]) -> None:
+        """Store many newly discovered URLs in one transaction.
+        
+        The link discovery path: a plain INSERT OR IGNORE skips the update
+        clause of the upsert, and already stored URLs are kept as they are.
+        """
+        await self._store_urls(url_nodes, _SQL_INSERT_NEW_URL)
+
+    async def _store_urls(self, url_nodes: List[URLNode], sql: str) -> None:
+        if not url_nodes:
+            return
+        if not self._init_event.is_set():
+            await self.initialize_site_graph_schema()
+        
+        # Convert datetime objects to Unix timestamps for storage
+        rows = [
+            (
                 url_node.url,
                 url_node.source_url,
-                discovered_at,
-                last_checked,
+                _to_epoch(url_node.discovered_at),
+                _to_epoch(url_node.last_checked),
                 url_node.status_code,
                 url_node.content_type,
                 url_node.file_size,
@@ -191,21 +744,43 @@ class SiteGraphDatabaseManager:
                 url_node.download_status,
                 url_node.local_path,
                 url_node.checksum,
-                metadata_json,
+                _encode_metadata(url_node.metadata),
                 url_node.error_message,
                 url_node.retry_count
-            ))
+            )
+            for url_node in url_nodes
+        ]
+        # Origins of each URL and of the page it was linked from
+        origins = [
+            (_origin(url_node.url), _origin(url_node.source_url) if url_node.source_url else None)
+            for url_node in url_nodes
+        ]
+        
+        async def _store(db):
+            base_url_ids = await self._resolve_base_url_ids(
+                db, {origin for pair in origins for origin in pair} - {None}
+            )
+            await db.executemany(sql, [
+                row + (base_url_ids.get(origin), base_url_ids.get(source_origin))
+                for row, (origin, source_origin) in zip(rows, origins)
+            ])
+            return base_url_ids
 
         try:
-            await self.db_manager.execute_with_retry(_store)
-            self.logger.debug(
-                message="Stored URL in site graph: {url}",
-                tag="STORE",
-                params={"url": url_node.url}
-            )
+            async with self._acquire_write() as db:
+                base_url_ids = await _store(db)
+            # Only cached once committed, as a rolled back id may be reused
+            self._base_url_ids.update(base_url_ids)
+            # One message per batch, and no params built when debug is off
+            if self.logger.is_enabled_for(LogLevel.DEBUG):
+                self.logger.debug(
+                    message="Stored {count} URLs in site graph",
+                    tag="STORE",
+                    params={"count": len(rows)}
+                )
         except Exception as e:
             self.logger.error(
-                message="Failed to store discovered URL: {error}",
+                message="Failed to store discovered URLs: {error}",
                 tag="ERROR",
                 params={"error": str(e)}
             )
@@ -213,36 +788,17 @@ class SiteGraphDatabaseManager:
 
     async def get_discovered_url(self, url: str) -> Optional[URLNode]:
         """Retrieve a discovered URL from the site graph"""
-        await self.initialize_site_graph_schema()
+        if not self._init_event.is_set():
+            await self.initialize_site_graph_schema()
         
         async def _get(db):
-            async with db.execute(
-                "SELECT * FROM discovered_urls WHERE url = ?", (url,)
-            ) as cursor:
+            async with db.execute(_SQL_SELECT_URL, (url,)) as cursor:
                 row = await cursor.fetchone()
-                if not row:
-                    return None
-                
-                # Get column names for proper mapping
-                columns = [description[0] for description in cursor.description]
-                row_dict = dict(zip(columns, row))
-                
-                # Convert timestamp strings back to datetime objects
-                if row_dict['discovered_at']:
-                    row_dict['discovered_at'] = datetime.fromisoformat(row_dict['discovered_at'])
-                if row_dict['last_checked']:
-                    row_dict['last_checked'] = datetime.fromisoformat(row_dict['last_checked'])
-                
-                # Parse metadata JSON
-                try:
-                    row_dict['metadata'] = json.loads(row_dict['metadata'] or '{}')
-                except json.JSONDecodeError:
-                    row_dict['metadata'] = {}
-                
-                return URLNode(**row_dict)
+                return _row_to_url_node(row) if row else None
 
         try:
-            return await self.db_manager.execute_with_retry(_get)
+            async with self._acquire_read() as db:
+                return await _get(db)
         except Exception as e:
             self.logger.error(
                 message="Failed to retrieve discovered URL: {error}",
@@ -251,58 +807,64 @@ class SiteGraphDatabaseManager:
             )
             return None
 
-    async def get_site_graph(self, base_url: str, include_files: bool = True) -> Dict[str, List[URLNode]]:
-        """Retrieve complete site graph for a base URL"""
-        await self.initialize_site_graph_schema()
+    async def iter_site_graph(self, base_url: str, include_files: bool = True,
+                              batch_size: int = 1000, as_views: bool = False,
+                              include_metadata: bool = True) -> AsyncIterator[URLNode]:
+        """Yield the URLs of a site in discovery order.
+        
+        Rows are fetched ``batch_size`` at a time, so memory use is bounded by
+        the batch rather than by the size of the crawl. A reader connection is
+        held until the iteration finishes. With ``as_views`` the rows are
+        yielded as read-only URLNodeView tuples instead of URLNodes; without
+        ``include_metadata`` the metadata column is not read.
+        """
+        make_node = _row_to_url_node_view if as_views else _row_to_url_node
+        if not self._init_event.is_set():
+            await self.initialize_site_graph_schema()
         
-        async def _get_graph(db):
+        async with self._acquire_read() as db:
+            site_filter = await self._site_filter(db, base_url, include_sources=True)
+            if site_filter is None:
+                return
+            
             # Build query based on parameters
-            query = "SELECT * FROM discovered_urls WHERE url LIKE ? OR source_url LIKE ?"
-            params = [f"{base_url}%", f"{base_url}%"]
+            columns = _URL_COLUMNS if include_metadata else _URL_COLUMNS_LIGHT
+            query = f"SELECT {columns} FROM discovered_urls WHERE {site_filter[0]}"
+            params = site_filter[1]
             
             if not include_files:
-                query += " AND is_file = FALSE"
+                query += " AND is_file = 0"
             
             query += " ORDER BY discovered_at ASC"
             
             async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-                columns = [description[0] for description in cursor.description]
-                
-                urls = []
-                files = []
-                
-                for row in rows:
-                    row_dict = dict(zip(columns, row))
-                    
-                    # Convert timestamps
-                    if row_dict['discovered_at']:
-                        row_dict['discovered_at'] = datetime.fromisoformat(row_dict['discovered_at'])
-                    if row_dict['last_checked']:
-                        row_dict['last_checked'] = datetime.fromisoformat(row_dict['last_checked'])
-                    
-                    # Parse metadata
-                    try:
-                        row_dict['metadata'] = json.loads(row_dict['metadata'] or '{}')
-                    except json.JSONDecodeError:
-                        row_dict['metadata'] = {}
-                    
-                    url_node = URLNode(**row_dict)
-                    
-                    if url_node.is_file:
-                        files.append(url_node)
-                    else:
-                        urls.append(url_node)
-                
-                return {
-                    'urls': urls,
-                    'files': files,
-                    'total_urls': len(urls),
-                    'total_files': len(files)
-                }
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield make_node(row)
 
+    async def get_site_graph(self, base_url: str, include_files: bool = True,
+                             include_metadata: bool = True) -> Dict[str, List[URLNode]]:
+        """Retrieve complete site graph for a base URL"""
         try:
-            return await self.db_manager.execute_with_retry(_get_graph)
+            urls = []
+            files = []
+            
+            async for url_node in self.iter_site_graph(base_url, include_files,
+                                                       include_metadata=include_metadata):
+                if url_node.is_file:
+                    files.append(url_node)
+                else:
+                    urls.append(url_node)
+            
+            return {
+                'urls': urls,
+                'files': files,
+                'total_urls': len(urls),
+                'total_files': len(files)
+            }
         except Exception as e:
             self.logger.error(
                 message="Failed to retrieve site graph: {error}",
@@ -315,16 +877,12 @@ class SiteGraphDatabaseManager:
                                content_type: str = None, file_size: int = None,
                                error_message: str = None) -> None:
         """Update URL status after checking/crawling"""
-        await self.initialize_site_graph_schema()
+        if not self._init_event.is_set():
+            await self.initialize_site_graph_schema()
         
         async def _update(db):
-            await db.execute("""
-                UPDATE discovered_urls 
-                SET last_checked = ?, status_code = ?, content_type = ?, 
-                    file_size = ?, error_message = ?
-                WHERE url = ?
-            """, (
-                datetime.now().isoformat(),
+            await db.execute(_SQL_UPDATE_URL_STATUS, (
+                _to_epoch(datetime.now()),
                 status_code,
                 content_type,
                 file_size,
@@ -333,7 +891,8 @@ class SiteGraphDatabaseManager:
             ))
 
         try:
-            await self.db_manager.execute_with_retry(_update)
+            async with self._acquire_write() as db:
+                await _update(db)
         except Exception as e:
             self.logger.error(
                 message="Failed to update URL status: {error}",
@@ -346,25 +905,22 @@ class SiteGraphDatabaseManager:
                                         local_path: str = None, checksum: str = None,
                                         error_message: str = None) -> None:
         """Update file download status and metadata"""
-        await self.initialize_site_graph_schema()
+        if not self._init_event.is_set():
+            await self.initialize_site_graph_schema()
         
         async def _update(db):
-            await db.execute("""
-                UPDATE discovered_urls 
-                SET download_status = ?, local_path = ?, checksum = ?, 
-                    error_message = ?, last_checked = ?
-                WHERE url = ?
-            """, (
+            await db.execute(_SQL_UPDATE_DOWNLOAD_STATUS, (
                 download_status,
                 local_path,
                 checksum,
                 error_message,
-                datetime.now().isoformat(),
+                _to_epoch(datetime.now()),
                 url
             ))
 
         try:
-            await self.db_manager.execute_with_retry(_update)
+            async with self._acquire_write() as db:
+                await _update(db)
         except Exception as e:
             self.logger.error(
                 message="Failed to update file download status: {error}",
@@ -373,44 +929,31 @@ class SiteGraphDatabaseManager:
             )
             raise
 
-    async def get_files_by_status(self, download_status: str, base_url: str = None) -> List[URLNode]:
+    async def get_files_by_status(self, download_status: str, base_url: str = None,
+                                  include_metadata: bool = True) -> List[URLNode]:
         """Get files filtered by download status"""
-        await self.initialize_site_graph_schema()
+        if not self._init_event.is_set():
+            await self.initialize_site_graph_schema()
         
         async def _get_files(db):
-            query = "SELECT * FROM discovered_urls WHERE is_file = TRUE AND download_status = ?"
+            columns = _URL_COLUMNS if include_metadata else _URL_COLUMNS_LIGHT
+            query = f"SELECT {columns} FROM discovered_urls WHERE is_file = 1 AND download_status = ?"
             params = [download_status]
             
             if base_url:
-                query += " AND url LIKE ?"
-                params.append(f"{base_url}%")
+                site_filter = await self._site_filter(db, base_url)
+                if site_filter is None:
+                    return []
+                query += f" AND {site_filter[0]}"
+                params.extend(site_filter[1])
             
             async with db.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
-                columns = [description[0] for description in cursor.description]
-                
-                files = []
-                for row in rows:
-                    row_dict = dict(zip(columns, row))
-                    
-                    # Convert timestamps
-                    if row_dict['discovered_at']:
-                        row_dict['discovered_at'] = datetime.fromisoformat(row_dict['discovered_at'])
-                    if row_dict['last_checked']:
-                        row_dict['last_checked'] = datetime.fromisoformat(row_dict['last_checked'])
-                    
-                    # Parse metadata
-                    try:
-                        row_dict['metadata'] = json.loads(row_dict['metadata'] or '{}')
-                    except json.JSONDecodeError:
-                        row_dict['metadata'] = {}
-                    
-                    files.append(URLNode(**row_dict))
-                
-                return files
+                return [_row_to_url_node(row) for row in rows]
 
         try:
-            return await self.db_manager.execute_with_retry(_get_files)
+            async with self._acquire_read() as db:
+                return await _get_files(db)
         except Exception as e:
             self.logger.error(
                 message="Failed to get files by status: {error}",
@@ -421,30 +964,16 @@ class SiteGraphDatabaseManager:
 
     async def store_site_graph_stats(self, stats: SiteGraphStats) -> None:
         """Store or update site graph statistics"""
-        await self.initialize_site_graph_schema()
+        if not self._init_event.is_set():
+            await self.initialize_site_graph_schema()
         
         async def _store_stats(db):
-            # Convert datetime objects to ISO format strings
-            crawl_start = stats.crawl_start_time.isoformat() if stats.crawl_start_time else None
-            crawl_end = stats.crawl_end_time.isoformat() if stats.crawl_end_time else None
-            last_activity = stats.last_activity.isoformat() if stats.last_activity else datetime.now().isoformat()
+            # Convert datetime objects to Unix timestamps
+            crawl_start = _to_epoch(stats.crawl_start_time)
+            crawl_end = _to_epoch(stats.crawl_end_time)
+            last_activity = _to_epoch(stats.last_activity or datetime.now())
             
-            await db.execute("""
-                INSERT INTO site_graph_stats (
-                    base_url, total_urls_discovered, total_files_discovered,
-                    total_files_downloaded, crawl_start_time, crawl_end_time,
-                    last_activity, dead_end_count, revisit_ratio
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(base_url) DO UPDATE SET
-                    total_urls_discovered = excluded.total_urls_discovered,
-                    total_files_discovered = excluded.total_files_discovered,
-                    total_files_downloaded = excluded.total_files_downloaded,
-                    crawl_end_time = excluded.crawl_end_time,
-                    last_activity = excluded.last_activity,
-                    dead_end_count = excluded.dead_end_count,
-                    revisit_ratio = excluded.revisit_ratio
-            """, (
+            await db.execute(_SQL_UPSERT_STATS, (
                 stats.base_url,
                 stats.total_urls_discovered,
                 stats.total_files_discovered,
@@ -457,7 +986,8 @@ class SiteGraphDatabaseManager:
             ))
 
         try:
-            await self.db_manager.execute_with_retry(_store_stats)
+            async with self._acquire_write() as db:
+                await _store_stats(db)
         except Exception as e:
             self.logger.error(
                 message="Failed to store site graph stats: {error}",
@@ -468,31 +998,26 @@ class SiteGraphDatabaseManager:
 
     async def get_site_graph_stats(self, base_url: str) -> Optional[SiteGraphStats]:
         """Retrieve site graph statistics"""
-        await self.initialize_site_graph_schema()
+        if not self._init_event.is_set():
+            await self.initialize_site_graph_schema()
         
         async def _get_stats(db):
-            async with db.execute(
-                "SELECT * FROM site_graph_stats WHERE base_url = ?", (base_url,)
-            ) as cursor:
+            async with db.execute(_SQL_SELECT_STATS, (base_url,)) as cursor:
                 row = await cursor.fetchone()
                 if not row:
                     return None
                 
-                columns = [description[0] for description in cursor.description]
-                row_dict = dict(zip(columns, row))
+                row_dict = dict(zip(_STATS_COLUMNS, row))
                 
-                # Convert timestamp strings back to datetime objects
-                if row_dict['crawl_start_time']:
-                    row_dict['crawl_start_time'] = datetime.fromisoformat(row_dict['crawl_start_time'])
-                if row_dict['crawl_end_time']:
-                    row_dict['crawl_end_time'] = datetime.fromisoformat(row_dict['crawl_end_time'])
-                if row_dict['last_activity']:
-                    row_dict['last_activity'] = datetime.fromisoformat(row_dict['last_activity'])
+                # Convert timestamps back to datetime objects
+                for column in ('crawl_start_time', 'crawl_end_time', 'last_activity'):
+                    row_dict[column] = _to_datetime(row_dict[column])
                 
                 return SiteGraphStats(**row_dict)
 
         try:
-            return await self.db_manager.execute_with_retry(_get_stats)
+            async with self._acquire_read() as db:
+                return await _get_stats(db)
         except Exception as e:
             self.logger.error(
                 message="Failed to get site graph stats: {error}",
@@ -501,37 +1026,92 @@ class SiteGraphDatabaseManager:
             )
             return None
 
+    async def _count_files_by_status(self, base_url: str) -> Dict[str, int]:
+        """Count a site's files per download status with one aggregate query"""
+        async with self._acquire_read() as db:
+            site_filter = await self._site_filter(db, base_url)
+            if site_filter is None:
+                return {}
+            async with db.execute(f"""
+                SELECT download_status, COUNT(*) FROM discovered_urls
+                WHERE is_file = 1 AND {site_filter[0]}
+                GROUP BY download_status
+            """, site_filter[1]) as cursor:
+                return dict(await cursor.fetchall())
+
+    async def get_site_signature(self, base_url: str) -> Tuple[int, Optional[int], Optional[int]]:
+        """Cheap fingerprint of a site's stored URLs: row count and latest
+        discovered_at and last_checked, which change whenever URLs are added or
+        checked. Used to invalidate analysis results persisted across runs.
+        
+        Timestamps are whole seconds, so a change that keeps the row count and
+        happens within the second of the latest discovery or check (such as a
+        download status update) leaves the signature unchanged."""
+        if not self._init_event.is_set():
+            await self.initialize_site_graph_schema()
+        
+        async with self._acquire_read() as db:
+            site_filter = await self._site_filter(db, base_url, include_sources=True)
+            if site_filter is None:
+                return 0, None, None
+            async with db.execute(f"""
+                SELECT COUNT(*), MAX(discovered_at), MAX(last_checked) FROM discovered_urls
+                WHERE {site_filter[0]}
+            """, site_filter[1]) as cursor:
+                return tuple(await cursor.fetchone())
+
     async def get_crawl_progress(self, base_url: str) -> Dict[str, Any]:
         """Get comprehensive crawl progress information"""
-        await self.initialize_site_graph_schema()
+        if not self._init_event.is_set():
+            await self.initialize_site_graph_schema()
         
         try:
-            # Get basic stats
-            stats = await self.get_site_graph_stats(base_url)
-            
-            # Get file download progress
-            files_pending = await self.get_files_by_status("not_attempted", base_url)
-            files_downloading = await self.get_files_by_status("downloading", base_url)
-            files_completed = await self.get_files_by_status("completed", base_url)
-            files_failed = await self.get_files_by_status("failed", base_url)
+            # The stats row and the file counts are independent reads, run on
+            # two reader connections at once; one failing keeps the other
+            stats, counts = await asyncio.gather(
+                self.get_site_graph_stats(base_url),
+                self._count_files_by_status(base_url),
+                return_exceptions=True
+            )
+            progress = {'base_url': base_url, 'stats': None, 'file_progress': None}
+            errors = {}
             
-            # Calculate progress metrics
-            total_files = len(files_pending) + len(files_downloading) + len(files_completed) + len(files_failed)
-            download_progress = len(files_completed) / total_files if total_files > 0 else 0.0
+            if isinstance(stats, BaseException):
+                errors['stats'] = str(stats)
+            elif stats:
+                progress['stats'] = asdict(stats)
             
-            return {
-                'base_url': base_url,
-                'stats': asdict(stats) if stats else None,
-                'file_progress': {
+            if isinstance(counts, BaseException):
+                errors['file_progress'] = str(counts)
+            else:
+                # Get file download progress
+                files_pending = counts.get("not_attempted", 0)
+                files_downloading = counts.get("downloading", 0)
+                files_completed = counts.get("completed", 0)
+                files_failed = counts.get("failed", 0)
+                
+                # Calculate progress metrics
+                total_files = files_pending + files_downloading + files_completed + files_failed
+                download_progress = files_completed / total_files if total_files > 0 else 0.0
+                
+                progress['file_progress'] = {
                     'total_files': total_files,
-                    'pending': len(files_pending),
-                    'downloading': len(files_downloading),
-                    'completed': len(files_completed),
-                    'failed': len(files_failed),
+                    'pending': files_pending,
+                    'downloading': files_downloading,
+                    'completed': files_completed,
+                    'failed': files_failed,
                     'progress_percentage': download_progress * 100
-                },
-                'last_updated': datetime.now().isoformat()
-            }
+                }
+            
+            if errors:
+                self.logger.error(
+                    message="Failed to get part of the crawl progress: {errors}",
+                    tag="ERROR",
+                    params={"errors": errors}
+                )
+                progress['errors'] = errors
+            progress['last_updated'] = datetime.now().isoformat()
+            return progress
             
         except Exception as e:
             self.logger.error(
@@ -545,30 +1125,48 @@ class SiteGraphDatabaseManager:
                 'last_updated': datetime.now().isoformat()
             }
 
-    async def cleanup_old_entries(self, base_url: str, days_old: int = 30) -> int:
-        """Clean up old site graph entries"""
-        await self.initialize_site_graph_schema()
+    async def cleanup_old_entries(self, base_url: str, days_old: int = 30, batch_size: int = 10_000) -> int:
+        """Clean up old site graph entries.
+        
+        Rows are deleted ``batch_size`` at a time, each batch in its own
+        transaction, so the writer is not held for the whole cleanup.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        if not self._init_event.is_set():
+            await self.initialize_site_graph_schema()
+        cutoff_date = _to_epoch(datetime.now() - timedelta(days=days_old))
         
         async def _cleanup(db):
-            cutoff_date = datetime.now().replace(day=datetime.now().day - days_old)
+            site_filter = await self._site_filter(db, base_url, include_sources=True)
+            if site_filter is None:
+                return 0
             
-            # Delete old discovered URLs
-            async with db.execute("""
-                DELETE FROM discovered_urls 
-                WHERE (url LIKE ? OR source_url LIKE ?) 
-                AND discovered_at < ?
-            """, (f"{base_url}%", f"{base_url}%", cutoff_date.isoformat())) as cursor:
-                deleted_count = cursor.rowcount
-            
-            return deleted_count
+            # Delete old discovered URLs; SQLite builds usually lack DELETE ... LIMIT
+            async with db.execute(f"""
+                DELETE FROM discovered_urls WHERE url IN (
+                    SELECT url FROM discovered_urls
+                    WHERE {site_filter[0]}
+                    AND discovered_at < ?
+                    LIMIT ?
+                )
+            """, (*site_filter[1], cutoff_date, batch_size)) as cursor:
+                return cursor.rowcount
 
         try:
-            deleted = await self.db_manager.execute_with_retry(_cleanup)
-            self.logger.info(
-                message="Cleaned up {count} old site graph entries",
-                tag="CLEANUP",
-                params={"count": deleted}
-            )
+            deleted = 0
+            while True:
+                async with self._acquire_write() as db:
+                    batch_deleted = await _cleanup(db)
+                deleted += batch_deleted
+                if batch_deleted < batch_size:
+                    break
+            if self.logger.is_enabled_for(LogLevel.INFO):
+                self.logger.info(
+                    message="Cleaned up {count} old site graph entries",
+                    tag="CLEANUP",
+                    params={"count": deleted}
+                )
             return deleted
         except Exception as e:
             self.logger.error(
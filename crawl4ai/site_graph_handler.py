@@ -12,22 +12,32 @@ Integrates with existing Crawl4AI patterns:
 """
 
 import asyncio
+import heapq
 import json
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import networkx as nx
 from typing import Dict, List, Optional, Tuple, Set, Any, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlparse
 
 # Optional imports for visualization
 try:
     import matplotlib.pyplot as plt
     import matplotlib.patches as mpatches
+    from matplotlib.collections import LineCollection, PolyCollection
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
     plt = None
     mpatches = None
+    LineCollection = None
+    PolyCollection = None
 
 try:
     import numpy as np
@@ -46,10 +56,162 @@ except ImportError:
     go = None
     px = None
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+# NetworkX backends running betweenness centrality on the GPU or in parallel
+try:
+    import nx_cugraph  # noqa: F401
+    BETWEENNESS_BACKEND = "cugraph"
+except ImportError:
+    try:
+        import nx_parallel  # noqa: F401
+        BETWEENNESS_BACKEND = "parallel"
+    except ImportError:
+        BETWEENNESS_BACKEND = None
+
+try:
+    from joblib import Memory
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+    Memory = None
+
 from .site_graph_db import SiteGraphDatabaseManager, URLNode, SiteGraphStats
 from .async_logger import AsyncLogger
 
 
+# PageRank is only used to rank and summarise nodes, which a looser tolerance
+# than NetworkX's default does not change
+_PAGERANK_TOL = 1e-4
+
+
+def _pagerank(graph: nx.DiGraph) -> Dict[str, float]:
+    """PageRank by sparse power iteration: nx.pagerank_scipy on NetworkX 2.x,
+    nx.pagerank (SciPy based since 3.0, which dropped pagerank_scipy) otherwise"""
+    pagerank = getattr(nx, "pagerank_scipy", nx.pagerank)
+    return pagerank(graph, max_iter=100, tol=_PAGERANK_TOL)
+
+
+def _stored_result(kind: str, base_url: str, signature: Tuple, key: Tuple, compute=None):
+    """Memoized by joblib.Memory on everything but compute, which produces the
+    result on a miss"""
+    return compute()
+
+
+# Arrowhead length as a fraction of the layout extent, and the point along
+# each edge where its tip sits (short of the target node's center)
+_ARROW_HEAD_SCALE = 0.02
+_ARROW_TIP_POSITION = 0.95
+
+
+def _arrowheads(start: "np.ndarray", end: "np.ndarray", head_length: float) -> "np.ndarray":
+    """Triangles pointing from start to end for each (n, 2) pair of edge
+    endpoints, skipping self-loops, which have no direction."""
+    delta = end - start
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    keep = length > 0
+    direction = delta[keep] / length[keep, None]
+    normal = np.column_stack([-direction[:, 1], direction[:, 0]])
+    tip = start[keep] + _ARROW_TIP_POSITION * delta[keep]
+    base = tip - head_length * direction
+    return np.stack([tip, base + 0.4 * head_length * normal, base - 0.4 * head_length * normal], axis=1)
+
+
+# Below this many BFS steps (sources x (nodes + edges)), worker processes cost
+# more to start and feed than they save
+_PARALLEL_BETWEENNESS_MIN_WORK = 500_000
+
+
+def _betweenness_centrality(graph: nx.DiGraph, k: int) -> Dict[str, float]:
+    """
+    Normalized betweenness centrality estimated from k sampled sources.
+    
+    Runs on an installed NetworkX backend (cugraph, nx-parallel) when there is
+    one, otherwise spreads the sources over worker processes when the graph is
+    large enough to pay for them.
+    """
+    if BETWEENNESS_BACKEND:
+        return nx.betweenness_centrality(graph, k=k, backend=BETWEENNESS_BACKEND)
+    
+    workers = min(os.cpu_count() or 1, k)
+    work = k * (graph.number_of_nodes() + graph.number_of_edges())
+    if workers < 2 or work < _PARALLEL_BETWEENNESS_MIN_WORK:
+        return nx.betweenness_centrality(graph, k=k)
+    
+    sources = random.sample(list(graph), k)
+    try:
+        return _parallel_betweenness_centrality(graph, sources, workers)
+    except BrokenProcessPool:
+        # Spawned workers re-import __main__, which fails in scripts without
+        # an `if __name__ == "__main__":` guard
+        return nx.betweenness_centrality(graph, k=k)
+
+
+def _betweenness_worker(topology: nx.DiGraph, sources: List[str]) -> Dict[str, float]:
+    return nx.betweenness_centrality_subset(topology, sources, list(topology), normalized=False)
+
+
+def _parallel_betweenness_centrality(graph: nx.DiGraph, sources: List[str],
+                                     workers: int) -> Dict[str, float]:
+    """
+    Betweenness centrality from the given sources, split across processes.
+    
+    Each worker accumulates the unnormalized dependencies of its sources; the
+    sums are normalized like nx.betweenness_centrality(k=len(sources)), per
+    (source, target) pair sampled for each node.
+    
+    Workers are spawned rather than forked: the calling process runs event
+    loop and aiosqlite threads, and forking with live threads can deadlock.
+    """
+    # Workers only need the topology, not the attribute dicts
+    topology = nx.DiGraph()
+    topology.add_nodes_from(graph)
+    topology.add_edges_from(graph.edges())
+    
+    chunks = [sources[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        partials = list(executor.map(_betweenness_worker, [topology] * workers, chunks))
+    
+    nodes = list(graph)
+    totals = np.zeros(len(nodes))
+    for partial in partials:
+        totals += np.fromiter((partial[node] for node in nodes), dtype=float, count=len(nodes))
+    
+    n, k = len(nodes), len(sources)
+    if n <= 2:
+        return dict(zip(nodes, totals.tolist()))
+    # A sampled node is not a source of its own paths
+    source_set = set(sources)
+    sampled = np.fromiter((node in source_set for node in nodes), dtype=bool, count=n)
+    pairs = np.where(sampled, k - 1, k) * (n - 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return dict(zip(nodes, (totals / pairs).tolist()))
+
+
+def _netloc(url: str) -> Optional[str]:
+    """netloc of a URL, '' for relative URLs and None when it cannot be parsed"""
+    try:
+        return urlparse(url).netloc
+    except ValueError:
+        return None
+
+
+def _is_internal_netloc(netloc: Optional[str], base_netloc: Optional[str]) -> bool:
+    """Whether a URL with this netloc is internal to the base domain"""
+    return netloc is not None and base_netloc is not None and netloc in ('', base_netloc)
+
+
+def _degree_array(degree_view, count: int) -> "np.ndarray":
+    """Degrees of a NetworkX degree view as an array, in graph node order"""
+    return np.fromiter((degree for _, degree in degree_view), dtype=np.int64, count=count)
+
+
 @dataclass
 class GraphMetrics:
     """Metrics for site graph analysis"""
@@ -63,6 +225,7 @@ class GraphMetrics:
     clustering_coefficient: float = 0.0
     page_rank_stats: Optional[Dict[str, float]] = None
     centrality_stats: Optional[Dict[str, Dict[str, float]]] = None
+    approx: bool = False  # diameter/average_path_length estimated from sampled sources
 
 
 @dataclass
@@ -84,12 +247,27 @@ class SiteGraphHandler:
     for the Domain Intelligence Crawler.
     """
     
-    def __init__(self, db_manager: Optional[SiteGraphDatabaseManager] = None, logger: Optional[AsyncLogger] = None):
+    def __init__(self, db_manager: Optional[SiteGraphDatabaseManager] = None, logger: Optional[AsyncLogger] = None,
+                 cache_dir: Optional[str] = None):
         self.db_manager = db_manager or SiteGraphDatabaseManager()
         self.logger = logger or AsyncLogger(verbose=False, tag_width=10)
+        
+        # Graphs, metrics and patterns persisted across runs in cache_dir
+        self._stored_result = None
+        if cache_dir:
+            if JOBLIB_AVAILABLE:
+                self._stored_result = Memory(cache_dir, verbose=0).cache(
+                    _stored_result, ignore=["compute"]
+                )
+            else:
+                self.logger.warning("joblib is not installed, cache_dir is ignored", tag="CACHE")
+        
         self.graph: nx.DiGraph = nx.DiGraph()
-        self._graph_cache: Dict[str, nx.DiGraph] = {}
+        # Each site's graph, with its attribute-free undirected topology
+        self._graph_cache: Dict[str, Tuple[nx.DiGraph, nx.Graph]] = {}
         self._metrics_cache: Dict[str, GraphMetrics] = {}
+        # PageRank per (base_url, node count, edge count) of the ranked graph
+        self._pagerank_cache: Dict[Tuple[str, int, int], Dict[str, float]] = {}
     
     async def build_site_graph(self, base_url: str, refresh_cache: bool = False) -> nx.DiGraph:
         """
@@ -102,9 +280,55 @@ class SiteGraphHandler:
         Returns:
             NetworkX DiGraph representing the site structure
         """
+        graph, _ = await self._build_site_graphs(base_url, refresh_cache)
+        return graph
+    
+    async def _build_site_graphs(self, base_url: str,
+                                 refresh_cache: bool = False) -> Tuple[nx.DiGraph, nx.Graph]:
+        """The site's directed graph and its undirected topology, built together once"""
         if not refresh_cache and base_url in self._graph_cache:
             return self._graph_cache[base_url]
+        self._clear_pagerank_cache(base_url)
+        
+        graphs = await self._disk_cached(
+            "site_graphs", base_url, (), lambda: self._load_site_graphs(base_url), refresh_cache,
+            persist=lambda graphs: graphs[0].number_of_nodes() > 0
+        )
+        
+        # Cache the graph
+        self._graph_cache[base_url] = graphs
+        return graphs
+    
+    async def _disk_cached(self, kind: str, base_url: str, key: Tuple, compute,
+                           refresh: bool = False, persist=bool):
+        """
+        Result of ``await compute()``, persisted in cache_dir when one is set.
         
+        Entries are keyed by the site's database signature, so storing or
+        checking any of its URLs invalidates them; refresh recomputes and
+        overwrites. Results for which ``persist(result)`` is false, such as
+        empty graphs or failed analyses, are returned but not persisted.
+        
+        The signature's timestamps have one-second resolution: a change that
+        keeps the URL count and lands in the same second as the latest
+        discovery or check (a download status update, say) is not seen until
+        refresh is passed.
+        """
+        if self._stored_result is None:
+            return await compute()
+        
+        signature = await self.db_manager.get_site_signature(base_url)
+        args = (kind, base_url, signature, key)
+        if not refresh and self._stored_result.check_call_in_cache(*args):
+            return self._stored_result(*args)
+        
+        result = await compute()
+        if persist(result):
+            self._stored_result.call(*args, compute=lambda: result)
+        return result
+    
+    async def _load_site_graphs(self, base_url: str) -> Tuple[nx.DiGraph, nx.Graph]:
+        """Build the site's graphs from the database"""
         try:
             self.logger.info(f"Building site graph for {base_url}", tag="GRAPH")
             
@@ -114,85 +338,120 @@ class SiteGraphHandler:
             # Create new directed graph
             graph = nx.DiGraph()
             
-            # Add nodes and edges
-            for url_node in site_data.get('urls', []):
-                # Add node with attributes
-                node_attrs = {
+            # Add nodes and edges, assembled first and added in bulk
+            urls = site_data.get('urls', [])
+            discovered_ats = [
+                url_node.discovered_at.isoformat() if url_node.discovered_at else None
+                for url_node in urls
+            ]
+            graph.add_nodes_from(
+                (url_node.url, {
                     'url': url_node.url,
                     'status_code': url_node.status_code,
                     'content_type': url_node.content_type,
                     'is_file': url_node.is_file,
                     'file_extension': url_node.file_extension,
                     'file_size': url_node.file_size,
-                    'discovered_at': url_node.discovered_at.isoformat() if url_node.discovered_at else None,
+                    'discovered_at': discovered_at,
                     'last_checked': url_node.last_checked.isoformat() if url_node.last_checked else None,
                     'download_status': url_node.download_status,
                     'error_message': url_node.error_message,
                     'retry_count': url_node.retry_count,
                     'metadata': url_node.metadata or {}
-                }
-                
-                graph.add_node(url_node.url, **node_attrs)
-                
-                # Add edge from source to this URL
-                if url_node.source_url and url_node.source_url != url_node.url:
-                    edge_attrs = {
-                        'discovered_at': url_node.discovered_at.isoformat() if url_node.discovered_at else None,
-                        'link_type': 'internal' if self._is_internal_link(url_node.url, base_url) else 'external'
-                    }
-                    graph.add_edge(url_node.source_url, url_node.url, **edge_attrs)
-            
-            # Add file nodes if they exist
-            for file_node in site_data.get('files', []):
-                if file_node.url not in graph:
-                    file_attrs = {
-                        'url': file_node.url,
-                        'is_file': True,
-                        'file_extension': file_node.file_extension,
-                        'file_size': file_node.file_size,
-                        'download_status': file_node.download_status,
-                        'local_path': file_node.local_path,
-                        'checksum': file_node.checksum,
-                        'content_type': file_node.content_type
-                    }
-                    graph.add_node(file_node.url, **file_attrs)
-                    
-                    # Add edge from source to file
-                    if file_node.source_url:
-                        graph.add_edge(file_node.source_url, file_node.url, link_type='file')
+                })
+                for url_node, discovered_at in zip(urls, discovered_ats)
+            )
+            
+            # Edges from source to each URL, classified against the base
+            # netloc, which is parsed once
+            base_netloc = _netloc(base_url)
+            graph.add_edges_from(
+                (url_node.source_url, url_node.url, {
+                    'discovered_at': discovered_at,
+                    'link_type': 'internal' if _is_internal_netloc(_netloc(url_node.url), base_netloc) else 'external'
+                })
+                for url_node, discovered_at in zip(urls, discovered_ats)
+                if url_node.source_url and url_node.source_url != url_node.url
+            )
+            
+            # Add file nodes if they exist, with edges from their sources
+            file_nodes = [
+                file_node for file_node in site_data.get('files', [])
+                if file_node.url not in graph
+            ]
+            graph.add_nodes_from(
+                (file_node.url, {
+                    'url': file_node.url,
+                    'is_file': True,
+                    'file_extension': file_node.file_extension,
+                    'file_size': file_node.file_size,
+                    'download_status': file_node.download_status,
+                    'local_path': file_node.local_path,
+                    'checksum': file_node.checksum,
+                    'content_type': file_node.content_type
+                })
+                for file_node in file_nodes
+            )
+            graph.add_edges_from(
+                (file_node.source_url, file_node.url, {'link_type': 'file'})
+                for file_node in file_nodes
+                if file_node.source_url
+            )
             
-            # Cache the graph
-            self._graph_cache[base_url] = graph
+            # Pure topology for the undirected analyses, cheaper than
+            # to_undirected(), which copies every attribute dict
+            undirected_graph = nx.Graph()
+            undirected_graph.add_nodes_from(graph)
+            undirected_graph.add_edges_from(graph.edges())
             
             self.logger.success(
                 f"Built site graph: {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges",
                 tag="GRAPH"
             )
             
-            return graph
+            return graph, undirected_graph
             
         except Exception as e:
             self.logger.error(f"Failed to build site graph: {str(e)}", tag="ERROR")
             raise
     
+    def _get_pagerank(self, graph: nx.DiGraph, base_url: Optional[str] = None) -> Dict[str, float]:
+        """PageRank of a site's graph, computed once per graph size.
+        
+        Only pass base_url with the site's full graph. Graphs derived from it,
+        such as filtered export views, can share a size while holding different
+        nodes, so they must be ranked without a base_url and are not cached.
+        """
+        key = (base_url, graph.number_of_nodes(), graph.number_of_edges())
+        if base_url is not None and key in self._pagerank_cache:
+            return self._pagerank_cache[key]
+        
+        pagerank = _pagerank(graph)
+        if base_url is not None:
+            self._pagerank_cache[key] = pagerank
+        return pagerank
+    
+    def _clear_pagerank_cache(self, base_url: Optional[str] = None):
+        if base_url is None:
+            self._pagerank_cache.clear()
+            return
+        for key in [key for key in self._pagerank_cache if key[0] == base_url]:
+            del self._pagerank_cache[key]
+    
     def _is_internal_link(self, url: str, base_url: str) -> bool:
         """Check if a URL is internal to the base domain."""
-        from urllib.parse import urlparse
-        
-        try:
-            base_domain = urlparse(base_url).netloc
-            url_domain = urlparse(url).netloc
-            return url_domain == base_domain or url_domain == ''
-        except:
-            return False
+        return _is_internal_netloc(_netloc(url), _netloc(base_url))
     
-    async def analyze_graph_metrics(self, base_url: str, refresh_cache: bool = False) -> GraphMetrics:
+    async def analyze_graph_metrics(self, base_url: str, refresh_cache: bool = False,
+                                    sample_k: int = 64) -> GraphMetrics:
         """
         Analyze graph metrics for a site.
         
         Args:
             base_url: Base URL to analyze
             refresh_cache: Whether to refresh cached metrics
+            sample_k: Breadth-first searches used for the path metrics; larger
+                components get an estimate from this many sampled sources
             
         Returns:
             GraphMetrics object with analysis results
@@ -200,8 +459,21 @@ class SiteGraphHandler:
         if not refresh_cache and base_url in self._metrics_cache:
             return self._metrics_cache[base_url]
         
+        metrics = await self._disk_cached(
+            "graph_metrics", base_url, (sample_k,),
+            lambda: self._compute_graph_metrics(base_url, refresh_cache, sample_k), refresh_cache,
+            persist=lambda metrics: metrics.total_nodes > 0
+        )
+        
+        # Cache the metrics
+        if metrics.total_nodes:
+            self._metrics_cache[base_url] = metrics
+        return metrics
+    
+    async def _compute_graph_metrics(self, base_url: str, refresh_cache: bool,
+                                     sample_k: int) -> GraphMetrics:
         try:
-            graph = await self.build_site_graph(base_url, refresh_cache)
+            graph, undirected_graph = await self._build_site_graphs(base_url, refresh_cache)
             
             self.logger.info(f"Analyzing graph metrics for {base_url}", tag="ANALYZE")
             
@@ -212,13 +484,12 @@ class SiteGraphHandler:
             if total_nodes == 0:
                 return GraphMetrics()
             
-            # Connected components (treat as undirected for this analysis)
-            undirected_graph = graph.to_undirected()
-            connected_components = nx.number_connected_components(undirected_graph)
+            # Weak components are the undirected ones, found without leaving the DiGraph
+            components = list(nx.weakly_connected_components(graph))
+            connected_components = len(components)
             
             # Degree statistics
-            degrees = [d for n, d in graph.degree()]
-            average_degree = np.mean(degrees) if degrees else 0.0
+            average_degree = _degree_array(graph.degree(), total_nodes).mean()
             
             # Density
             density = nx.density(graph)
@@ -226,17 +497,15 @@ class SiteGraphHandler:
             # Path-based metrics (only for largest connected component)
             diameter = None
             average_path_length = None
+            approx = False
             
             if connected_components > 0:
-                largest_cc = max(nx.connected_components(undirected_graph), key=len)
+                largest_cc = max(components, key=len)
                 if len(largest_cc) > 1:
                     cc_subgraph = undirected_graph.subgraph(largest_cc)
-                    try:
-                        diameter = nx.diameter(cc_subgraph)
-                        average_path_length = nx.average_shortest_path_length(cc_subgraph)
-                    except nx.NetworkXError:
-                        # Graph might not be connected
-                        pass
+                    diameter, average_path_length, approx = self._estimate_path_metrics(
+                        cc_subgraph, sample_k
+                    )
             
             # Clustering coefficient
             clustering_coefficient = nx.average_clustering(undirected_graph)
@@ -244,7 +513,7 @@ class SiteGraphHandler:
             # PageRank analysis
             page_rank_stats = None
             try:
-                pagerank = nx.pagerank(graph, max_iter=100)
+                pagerank = self._get_pagerank(graph, base_url)
                 if pagerank:
                     pr_values = list(pagerank.values())
                     page_rank_stats = {
@@ -261,7 +530,10 @@ class SiteGraphHandler:
             try:
                 # Only calculate for reasonably sized graphs
                 if total_nodes <= 1000:
-                    betweenness = nx.betweenness_centrality(graph, k=min(100, total_nodes))
+                    # Off the event loop; the parallel path waits on worker processes
+                    betweenness = await asyncio.to_thread(
+                        _betweenness_centrality, graph, min(100, total_nodes)
+                    )
                     closeness = nx.closeness_centrality(graph)
                     
                     centrality_stats = {
@@ -287,12 +559,10 @@ class SiteGraphHandler:
                 average_path_length=average_path_length,
                 clustering_coefficient=clustering_coefficient,
                 page_rank_stats=page_rank_stats,
-                centrality_stats=centrality_stats
+                centrality_stats=centrality_stats,
+                approx=approx
             )
             
-            # Cache the metrics
-            self._metrics_cache[base_url] = metrics
-            
             self.logger.success(f"Analyzed graph metrics: {total_nodes} nodes, {total_edges} edges", tag="ANALYZE")
             
             return metrics
@@ -301,6 +571,34 @@ class SiteGraphHandler:
             self.logger.error(f"Failed to analyze graph metrics: {str(e)}", tag="ERROR")
             raise
     
+    @staticmethod
+    def _estimate_path_metrics(component: nx.Graph, sample_k: int) -> Tuple[int, float, bool]:
+        """
+        Diameter and average shortest path length of a connected component.
+        
+        Runs one breadth-first search per source: from every node when the
+        component has at most sample_k nodes, which is exact, otherwise from
+        sample_k sampled nodes. The sampled average is unbiased; the sampled
+        diameter is the largest eccentricity seen, a lower bound.
+        
+        Returns:
+            (diameter, average_path_length, approx)
+        """
+        nodes = sorted(component)
+        approx = len(nodes) > sample_k
+        # Seeded, so repeated analyses of a site report the same estimate
+        sources = random.Random(0).sample(nodes, sample_k) if approx else nodes
+        
+        total = 0
+        diameter = 0
+        for source in sources:
+            lengths = nx.single_source_shortest_path_length(component, source).values()
+            total += sum(lengths)
+            diameter = max(diameter, max(lengths))
+        
+        average_path_length = total / (len(sources) * (len(nodes) - 1))
+        return diameter, average_path_length, approx
+    
     async def find_critical_paths(self, base_url: str, target_nodes: Optional[List[str]] = None) -> Dict[str, List[str]]:
         """
         Find critical paths in the site graph.
@@ -327,14 +625,11 @@ class SiteGraphHandler:
             critical_paths = {}
             
             for root in root_nodes:
+                # One BFS per root reaches every target; unreachable ones are absent
+                paths = nx.single_source_shortest_path(graph, root)
                 for target in target_nodes:
-                    if root != target and nx.has_path(graph, root, target):
-                        try:
-                            path = nx.shortest_path(graph, root, target)
-                            path_key = f"{root} -> {target}"
-                            critical_paths[path_key] = path
-                        except nx.NetworkXNoPath:
-                            continue
+                    if target != root and target in paths:
+                        critical_paths[f"{root} -> {target}"] = paths[target]
             
             return critical_paths
             
@@ -352,8 +647,13 @@ class SiteGraphHandler:
         Returns:
             Dictionary of detected patterns
         """
+        return await self._disk_cached(
+            "graph_patterns", base_url, (), lambda: self._detect_graph_patterns(base_url)
+        )
+    
+    async def _detect_graph_patterns(self, base_url: str) -> Dict[str, Any]:
         try:
-            graph = await self.build_site_graph(base_url)
+            graph, undirected_graph = await self._build_site_graphs(base_url)
             
             patterns = {
                 'hub_nodes': [],
@@ -364,23 +664,18 @@ class SiteGraphHandler:
                 'articulation_points': []
             }
             
-            # Hub nodes (high out-degree)
-            out_degrees = dict(graph.out_degree())
-            if out_degrees:
-                avg_out_degree = np.mean(list(out_degrees.values()))
-                patterns['hub_nodes'] = [
-                    node for node, degree in out_degrees.items() 
-                    if degree > avg_out_degree * 2
-                ]
-            
-            # Authority nodes (high in-degree)
-            in_degrees = dict(graph.in_degree())
-            if in_degrees:
-                avg_in_degree = np.mean(list(in_degrees.values()))
-                patterns['authority_nodes'] = [
-                    node for node, degree in in_degrees.items() 
-                    if degree > avg_in_degree * 2
-                ]
+            node_count = graph.number_of_nodes()
+            if node_count:
+                nodes = np.empty(node_count, dtype=object)
+                nodes[:] = list(graph)
+                
+                # Hub nodes (high out-degree)
+                out_degrees = _degree_array(graph.out_degree(), node_count)
+                patterns['hub_nodes'] = nodes[out_degrees > out_degrees.mean() * 2].tolist()
+                
+                # Authority nodes (high in-degree)
+                in_degrees = _degree_array(graph.in_degree(), node_count)
+                patterns['authority_nodes'] = nodes[in_degrees > in_degrees.mean() * 2].tolist()
             
             # Isolated nodes
             patterns['isolated_nodes'] = list(nx.isolates(graph))
@@ -393,7 +688,6 @@ class SiteGraphHandler:
                 pass
             
             # Bridges and articulation points (treat as undirected)
-            undirected_graph = graph.to_undirected()
             try:
                 patterns['bridges'] = list(nx.bridges(undirected_graph))
                 patterns['articulation_points'] = list(nx.articulation_points(undirected_graph))
@@ -424,7 +718,7 @@ class SiteGraphHandler:
             graph = await self.build_site_graph(base_url)
             
             # Apply filters
-            filtered_graph = self._apply_export_filters(graph, options)
+            filtered_graph = self._apply_export_filters(graph, options, base_url)
             
             # Ensure output directory exists
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
@@ -436,8 +730,16 @@ class SiteGraphHandler:
                 nx.write_gexf(filtered_graph, output_path)
             elif options.format.lower() == 'json':
                 data = nx.node_link_data(filtered_graph)
-                with open(output_path, 'w') as f:
-                    json.dump(data, f, indent=2, default=str)
+                if ORJSON_AVAILABLE:
+                    # Node timestamps are already ISO strings, so default=str
+                    # only catches odd metadata values
+                    Path(output_path).write_bytes(orjson.dumps(
+                        data, default=str,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                    ))
+                else:
+                    with open(output_path, 'w') as f:
+                        json.dump(data, f, indent=2, default=str)
             elif options.format.lower() == 'dot':
                 nx.drawing.nx_pydot.write_dot(filtered_graph, output_path)
             elif options.format.lower() == 'pajek':
@@ -452,41 +754,49 @@ class SiteGraphHandler:
             self.logger.error(f"Failed to export graph: {str(e)}", tag="ERROR")
             raise
     
-    def _apply_export_filters(self, graph: nx.DiGraph, options: GraphExportOptions) -> nx.DiGraph:
-        """Apply filters to graph before export."""
-        filtered_graph = graph.copy()
+    def _apply_export_filters(self, graph: nx.DiGraph, options: GraphExportOptions,
+                              base_url: Optional[str] = None) -> nx.DiGraph:
+        """
+        Apply filters to graph before export.
+        
+        Returns a read-only subgraph view of the surviving nodes, or the graph
+        itself when no filter removes anything; nothing is copied.
+        """
+        keep = set(graph)
         
         # Filter by file nodes
         if not options.include_file_nodes:
-            file_nodes = [n for n, d in filtered_graph.nodes(data=True) if d.get('is_file', False)]
-            filtered_graph.remove_nodes_from(file_nodes)
+            keep -= {n for n, d in graph.nodes(data=True) if d.get('is_file', False)}
         
         # Filter by failed nodes
         if not options.include_failed_nodes:
-            failed_nodes = [
-                n for n, d in filtered_graph.nodes(data=True) 
+            keep -= {
+                n for n, d in graph.nodes(data=True)
                 if d.get('status_code', 200) >= 400 or d.get('error_message')
-            ]
-            filtered_graph.remove_nodes_from(failed_nodes)
+            }
         
         # Filter by depth
         if options.filter_by_depth is not None:
             # This would require depth calculation from root nodes
             pass
         
+        filtered_graph = graph if len(keep) == graph.number_of_nodes() else graph.subgraph(keep)
+        
         # Limit number of nodes
-        if options.max_nodes and filtered_graph.number_of_nodes() > options.max_nodes:
+        if options.max_nodes and len(keep) > options.max_nodes:
             # Keep nodes with highest PageRank
             try:
-                pagerank = nx.pagerank(filtered_graph)
-                top_nodes = sorted(pagerank.items(), key=lambda x: x[1], reverse=True)[:options.max_nodes]
+                # Only the unfiltered site graph's ranking is cached
+                pagerank = self._get_pagerank(
+                    filtered_graph, base_url if filtered_graph is graph else None
+                )
+                ranked = ((node, rank) for node, rank in pagerank.items() if node in keep)
+                top_nodes = heapq.nlargest(options.max_nodes, ranked, key=lambda x: x[1])
                 nodes_to_keep = [node for node, _ in top_nodes]
-                filtered_graph = filtered_graph.subgraph(nodes_to_keep).copy()
             except:
                 # Fallback: keep random subset
-                import random
-                nodes_to_keep = random.sample(list(filtered_graph.nodes()), options.max_nodes)
-                filtered_graph = filtered_graph.subgraph(nodes_to_keep).copy()
+                nodes_to_keep = random.sample(list(keep), options.max_nodes)
+            filtered_graph = filtered_graph.subgraph(nodes_to_keep)
         
         return filtered_graph
     
@@ -511,33 +821,33 @@ class SiteGraphHandler:
             # Limit graph size for visualization
             if graph.number_of_nodes() > 100:
                 # Use PageRank to select most important nodes
-                pagerank = nx.pagerank(graph)
-                top_nodes = sorted(pagerank.items(), key=lambda x: x[1], reverse=True)[:100]
+                pagerank = self._get_pagerank(graph, base_url)
+                top_nodes = heapq.nlargest(100, pagerank.items(), key=lambda x: x[1])
                 nodes_to_keep = [node for node, _ in top_nodes]
-                graph = graph.subgraph(nodes_to_keep).copy()
+                graph = graph.subgraph(nodes_to_keep)
             
             # Set up the plot
-            plt.figure(figsize=figsize)
+            fig, ax = plt.subplots(figsize=figsize)
             
-            # Choose layout
+            # Choose layout, seeded so the same graph always looks the same
             if layout == 'spring':
-                pos = nx.spring_layout(graph, k=1, iterations=50)
+                pos = nx.spring_layout(graph, k=1, iterations=50, seed=0)
             elif layout == 'circular':
                 pos = nx.circular_layout(graph)
             elif layout == 'random':
-                pos = nx.random_layout(graph)
+                pos = nx.random_layout(graph, seed=0)
             elif layout == 'shell':
                 pos = nx.shell_layout(graph)
             else:
-                pos = nx.spring_layout(graph)
+                pos = nx.spring_layout(graph, seed=0)
             
             # Node sizes based on attribute
             if node_size_attr == 'degree':
-                node_sizes = [graph.degree(node) * 100 + 50 for node in graph.nodes()]
+                node_sizes = _degree_array(graph.degree(), graph.number_of_nodes()) * 100 + 50
             elif node_size_attr == 'in_degree':
-                node_sizes = [graph.in_degree(node) * 100 + 50 for node in graph.nodes()]
+                node_sizes = _degree_array(graph.in_degree(), graph.number_of_nodes()) * 100 + 50
             elif node_size_attr == 'out_degree':
-                node_sizes = [graph.out_degree(node) * 100 + 50 for node in graph.nodes()]
+                node_sizes = _degree_array(graph.out_degree(), graph.number_of_nodes()) * 100 + 50
             else:
                 node_sizes = [100] * graph.number_of_nodes()
             
@@ -554,22 +864,28 @@ class SiteGraphHandler:
                 else:
                     node_colors.append('lightblue')
             
-            # Draw the graph
-            nx.draw(graph, pos, 
-                   node_color=node_colors,
-                   node_size=node_sizes,
-                   with_labels=False,
-                   arrows=True,
-                   edge_color='gray',
-                   alpha=0.7)
+            # Draw all edge shafts, all arrowheads and all nodes as one
+            # collection each, rather than an artist per node and edge
+            node_index = {node: i for i, node in enumerate(graph)}
+            xy = np.array([pos[node] for node in graph]).reshape(-1, 2)
+            edge_index = np.array(
+                [(node_index[u], node_index[v]) for u, v in graph.edges()], dtype=np.intp
+            ).reshape(-1, 2)
+            segments = xy[edge_index]
+            ax.add_collection(LineCollection(segments, colors='gray', alpha=0.5, zorder=1))
+            extent = np.ptp(xy, axis=0).max() if len(xy) else 0.0
+            heads = _arrowheads(segments[:, 0], segments[:, 1], _ARROW_HEAD_SCALE * (extent or 1.0))
+            ax.add_collection(PolyCollection(heads, facecolors='gray', edgecolors='none', alpha=0.5, zorder=1))
+            ax.scatter(xy[:, 0], xy[:, 1], s=node_sizes, c=node_colors, alpha=0.7, zorder=2)
+            ax.set_axis_off()
             
             # Add title
-            plt.title(f"Site Graph: {base_url}\n{graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
+            ax.set_title(f"Site Graph: {base_url}\n{graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
             
             # Save the plot
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            fig.savefig(output_path, dpi=300, bbox_inches='tight')
+            plt.close(fig)
             
             self.logger.success(f"Created graph visualization: {output_path}", tag="VIZ")
             return output_path
@@ -586,28 +902,32 @@ class SiteGraphHandler:
         else:
             self._graph_cache.clear()
             self._metrics_cache.clear()
+        self._clear_pagerank_cache(base_url)
         
         self.logger.info("Cleared graph cache", tag="CACHE")
 
 
 # Convenience functions
-async def create_site_graph_handler(db_manager: Optional[SiteGraphDatabaseManager] = None) -> SiteGraphHandler:
+async def create_site_graph_handler(db_manager: Optional[SiteGraphDatabaseManager] = None,
+                                    cache_dir: Optional[str] = None) -> SiteGraphHandler:
     """Create a SiteGraphHandler with default configuration."""
-    return SiteGraphHandler(db_manager=db_manager)
+    return SiteGraphHandler(db_manager=db_manager, cache_dir=cache_dir)
 
 
-async def analyze_site_structure(base_url: str, export_path: Optional[str] = None) -> Dict[str, Any]:
+async def analyze_site_structure(base_url: str, export_path: Optional[str] = None,
+                                 cache_dir: Optional[str] = None) -> Dict[str, Any]:
     """
     Convenience function to analyze site structure and optionally export results.
     
     Args:
         base_url: Base URL to analyze
         export_path: Optional path to export graph
+        cache_dir: Optional directory persisting the analysis across runs
         
     Returns:
         Dictionary with analysis results
     """
-    handler = await create_site_graph_handler()
+    handler = await create_site_graph_handler(cache_dir=cache_dir)
     
     # Build graph and analyze
     graph = await handler.build_site_graph(base_url)
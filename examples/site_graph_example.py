@@ -37,7 +37,7 @@ async def main():
         content_type="text/html",
         is_file=False
     )
-    await site_graph_manager.store_discovered_url(page_url)
+    await site_graph_manager.store_new_discovered_url(page_url)
     
     # Store a file URL
     file_url = URLNode(
@@ -51,7 +51,7 @@ async def main():
         file_extension=".pdf",
         download_status="not_attempted"
     )
-    await site_graph_manager.store_discovered_url(file_url)
+    await site_graph_manager.store_new_discovered_url(file_url)
     
     print("✓ URLs stored successfully")
     
@@ -1,7 +1,9 @@
 # // File: tests/deep_crawling/test_filters.py
 import pytest
+import fnmatch
 from urllib.parse import urlparse
-from crawl4ai import ContentTypeFilter, URLFilter 
+from crawl4ai import ContentTypeFilter, URLFilter, PathSegmentFilter
+from crawl4ai.deep_crawling.filters import ExclusionTrie
 
 # Minimal URLFilter base class stub if not already importable directly for tests
 # In a real scenario, this would be imported from the library
@@ -73,3 +75,55 @@ class TestContentTypeFilter:
     def test_extract_extension(self, url, expected_extension):
         # Test the static method directly
         assert ContentTypeFilter._extract_extension(url) == expected_extension
+
+
+class TestPathSegmentFilter:
+    PATTERNS = ['*/wp-admin/*', '*/admin/*', '*/api/v*', '*/.git/*', '*/_*', '*/feed']
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://example.com/admin/users",
+            "https://example.com/admin/",
+            "https://example.com/admin",
+            "https://example.com/administrator/page",
+            "https://example.com/blog/wp-admin/index.php",
+            "https://example.com/api/v2/items",
+            "https://example.com/api/",
+            "https://example.com/_next/static.js",
+            "https://example.com/docs/_private",
+            "https://example.com/repo/.git/config",
+            "https://example.com/blog/feed",
+            "https://example.com/blog/feed/rss",
+            "https://example.com/",
+            "https://example.com",
+            # fnmatch sees the whole URL, not just the path
+            "https://example.com/login?next=/admin/users",
+            "https://example.com/app#/admin/",
+            "https://example.com/search?q=blog/feed",
+            "https://admin/dashboard",
+            "https://example.com/page?ref=/_x",
+            "https://example.com/page?ref=admin",
+        ],
+    )
+    def test_matches_fnmatch(self, url):
+        expected = any(fnmatch.fnmatch(url, p) for p in self.PATTERNS)
+        assert ExclusionTrie(self.PATTERNS).matches(url) == expected
+        assert PathSegmentFilter(self.PATTERNS, reverse=True).apply(url) == (not expected)
+
+    @pytest.mark.parametrize(
+        "pattern, supported",
+        [
+            ("*/admin/*", True),
+            ("*/api/v*", True),
+            ("*/_*", True),
+            ("*/docs/guide", True),
+            ("*.html", False),
+            ("/admin/*", False),
+            ("*/a/*/b/*", False),
+            ("*/blog-[0-9]/*", False),
+            ("*/*", False),
+        ],
+    )
+    def test_supports(self, pattern, supported):
+        assert ExclusionTrie.supports(pattern) == supported
@@ -291,6 +291,35 @@ class TestDeadEndDetectionLogic:
         should_stop, reason = self.analytics.should_stop_crawling(dead_end_threshold=50, revisit_threshold=0.95)
         assert should_stop == False
         assert reason == "Continue crawling"
+    
+    def test_batch_analysis_matches_per_result_analysis(self):
+        """Test that analyzing a batch with per-result sources scores each page."""
+        batch = [
+            create_mock_crawl_result("https://example.com/a", [{'href': 'https://example.com/c'}]),
+            create_mock_crawl_result("https://example.com/b", [{'href': 'https://example.com/c'}]),
+        ]
+        sources = ["https://example.com/a", "https://example.com/b"]
+        
+        per_result = ExhaustiveAnalytics()
+        per_result.start_crawl_session()
+        for result, source in zip(batch, sources):
+            per_result.analyze_crawl_results([result], source)
+        
+        analysis = self.analytics.analyze_crawl_results(batch, sources)
+        
+        assert analysis['new_urls_per_result'] == [1, 0]
+        assert analysis['new_urls_discovered'] == 1
+        assert self.analytics.metrics.consecutive_dead_pages == per_result.metrics.consecutive_dead_pages == 1
+        assert self.analytics.metrics.total_crawl_attempts == per_result.metrics.total_crawl_attempts == 2
+        assert self.analytics.metrics.discovery_rate_history == per_result.metrics.discovery_rate_history
+    
+    def test_analysis_carries_stop_check(self):
+        """Test that the analysis reports the stop check for the given thresholds."""
+        result = create_mock_crawl_result("https://example.com/a")
+        analysis = self.analytics.analyze_crawl_results([result], "https://example.com/a", dead_end_threshold=1)
+        
+        assert analysis['should_continue'] is False
+        assert (True, analysis['stop_reason']) == self.analytics.should_stop_crawling(dead_end_threshold=1)
 
 
 def create_mock_crawl_result(url: str, links: List[Dict] = None, success: bool = True) -> CrawlResult:
@@ -435,6 +464,46 @@ class TestExhaustiveCrawlingWorkflow:
             if hasattr(crawler, 'close'):
                 await crawler.close()
     
+    @pytest.mark.asyncio
+    async def test_slow_page_does_not_block_other_workers(self, mock_browser_config):
+        """Test that workers keep crawling discovered URLs while a slow page is in flight."""
+        config = ExhaustiveCrawlConfig(
+            max_pages=6,
+            dead_end_threshold=10,
+            max_concurrent_requests=3,
+            enable_progress_tracking=False
+        )
+        
+        crawler = ExhaustiveAsyncWebCrawler(config=mock_browser_config)
+        
+        async def mock_arun(url, **kwargs):
+            if url.endswith("/hub"):
+                links = [{'href': 'https://example.com/slow'}, {'href': 'https://example.com/fast0'}]
+            elif url.endswith("/slow"):
+                await asyncio.sleep(0.2)
+                links = []
+            else:
+                # Each fast page leads to the next one
+                index = int(url.rsplit("fast", 1)[1])
+                links = [{'href': f'https://example.com/fast{index + 1}'}]
+            return create_mock_crawl_result(url, links)
+        
+        crawler.arun = AsyncMock(side_effect=mock_arun)
+        
+        try:
+            result = await crawler.arun_exhaustive("https://example.com/hub", config=config)
+            
+            crawled = [r.url for r in result['results']]
+            assert len(crawled) == 6
+            assert len(set(crawled)) == 6
+            # The fast chain finished while the slow page was still loading
+            assert crawled[-1] == "https://example.com/slow"
+            assert result['urls_in_queue'] == 0
+            
+        finally:
+            if hasattr(crawler, 'close'):
+                await crawler.close()
+    
     @pytest.mark.asyncio
     async def test_progress_tracking_integration(self, mock_browser_config):
         """Test progress tracking functionality."""
@@ -516,6 +585,12 @@ class TestPerformanceScenarios:
         avg_rate = analytics.metrics.average_discovery_rate
         assert isinstance(avg_rate, float)
         assert avg_rate >= 0
+        
+        # Empty batches append to the same bounded history
+        for _ in range(20):
+            analytics.analyze_crawl_results([])
+        assert len(analytics.metrics.discovery_rate_history) == 10
+        assert analytics.metrics.recent_discovery_rates(5) == [0] * 5
     
     @pytest.mark.asyncio
     async def test_memory_usage_with_large_datasets(self):
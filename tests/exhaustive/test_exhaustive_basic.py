@@ -134,6 +134,77 @@ def test_webcrawler_components():
         print(f"⚠ WebCrawler components not available: {e}")
 
 
+def test_url_canonicalization():
+    """Test that equivalent URL spellings share one dedup key."""
+    from crawl4ai.exhaustive_webcrawler import _canonical, _host_of, _dedup_key
+    
+    key = _canonical("https://example.com/a")
+    assert _canonical("https://example.com/a/") == key
+    assert _canonical("HTTPS://Example.COM:443/a#section") == key
+    assert _canonical("https://example.com/a?utm_source=news&gclid=123") == key
+    assert _canonical("https://example.com/a?b=2&a=1") == _canonical("https://example.com/a?a=1&b=2")
+    
+    # Content-bearing differences are preserved
+    assert _canonical("https://example.com/a?page=2") != key
+    assert _canonical("http://example.com:8080/a") != _canonical("http://example.com/a")
+    
+    # URLs without a host are passed through untouched
+    assert _canonical("raw:<html></html>") == "raw:<html></html>"
+    
+    # Dedup buckets are keyed by host
+    assert _host_of(key) == "example.com"
+    assert _host_of(_canonical("http://example.com:8080/a")) == "example.com:8080"
+    assert _host_of("raw:<html></html>") == ""
+    
+    # Dedup keys are (host, int hash) pairs over the canonical form
+    host, digest = _dedup_key("https://Example.com/a/?utm_medium=x")
+    assert host == "example.com"
+    assert isinstance(digest, int)
+    assert _dedup_key("https://example.com/a") == (host, digest)
+    
+    print("✓ URL canonicalization test passed")
+
+
+def test_failed_result():
+    """Test that unvalidated failed results match validated ones."""
+    from crawl4ai.exhaustive_webcrawler import _failed_result
+    from crawl4ai.models import CrawlResult
+    
+    result = _failed_result("https://example.com/down", "Timeout")
+    expected = CrawlResult(url="https://example.com/down", html="", success=False, error_message="Timeout")
+    
+    assert isinstance(result, CrawlResult)
+    assert result.model_dump() == expected.model_dump()
+    
+    print("✓ Failed result test passed")
+
+
+def test_crawl_result_hrefs():
+    """Test that link groups are flattened to href strings."""
+    from crawl4ai.models import CrawlResult
+    
+    result = CrawlResult(
+        url="https://example.com",
+        html="",
+        success=True,
+        links={
+            'internal': [{'href': 'https://example.com/a'}, {'text': 'no href'}, {'href': 'https://example.com/b'}],
+            'external': [{'href': 'https://other.com/'}],
+        }
+    )
+    
+    assert result.internal_hrefs == ['https://example.com/a', 'https://example.com/b']
+    assert result.external_hrefs == ['https://other.com/']
+    assert result.internal_hrefs is result.internal_hrefs  # Flattened once
+    
+    # Reassigning links drops the cached hrefs; unvalidated links may be bare strings
+    result.links = {'internal': ['https://example.com/c']}
+    assert result.internal_hrefs == ['https://example.com/c']
+    assert result.external_hrefs == []
+    
+    print("✓ CrawlResult hrefs test passed")
+
+
 def test_file_discovery_components():
     """Test that file discovery components can be imported."""
     try:
@@ -175,6 +246,9 @@ if __name__ == "__main__":
         test_preset_creation()
         test_analytics_components()
         test_webcrawler_components()
+        test_url_canonicalization()
+        test_failed_result()
+        test_crawl_result_hrefs()
         test_file_discovery_components()
         test_integration_components()
         
@@ -229,14 +229,14 @@ class TestExhaustiveFileDiscoveryCrawler:
         
         # Mock the file filter to return discovered files
         mock_crawler.file_filter.apply = MagicMock(return_value=True)
-        mock_crawler.file_filter.get_discovered_files = MagicMock(return_value=[
+        mock_crawler.file_filter.discovered_files = [
             FileMetadata(
                 url="https://example.com/test.pdf",
                 filename="test.pdf",
                 extension=".pdf",
                 file_type=FileType.DOCUMENT
             )
-        ])
+        ]
         
         # Mock the download queue
         mock_crawler.download_queue.add_file_task = AsyncMock(return_value=True)
@@ -420,6 +420,37 @@ class TestIntegrationWorkflow:
         finally:
             await crawler.close()
 
+    @pytest.mark.asyncio
+    async def test_exhaustive_crawl_discovers_linked_files(self, temp_dir):
+        """Test that pages crawled by the worker pool are scanned for files."""
+        crawler = create_document_focused_crawler(download_directory=temp_dir)
+        crawler.close = AsyncMock()
+
+        async def mock_arun(url, **kwargs):
+            # Only the start page links to the file
+            internal = [{'href': 'https://example.com/report.pdf'}] if url == "https://example.com" else []
+            return CrawlResult(
+                url=url,
+                html="<html></html>",
+                success=True,
+                links={'internal': internal, 'external': []}
+            )
+
+        crawler.arun = mock_arun
+
+        try:
+            results = await crawler.arun_exhaustive_with_files(
+                start_url="https://example.com",
+                config=ExhaustiveCrawlConfig(max_pages=5),
+                enable_file_download=False
+            )
+
+            discovered = results['file_discovery']['discovered_files']
+            assert [f['url'] for f in discovered] == ["https://example.com/report.pdf"]
+            assert results['download_stats'] is None
+        finally:
+            await crawler.close()
+
 
 if __name__ == "__main__":
     # Run the tests
@@ -0,0 +1,37 @@
+"""
+Tests for the exhaustive crawl strategy configuration helpers
+"""
+
+import pytest
+
+from crawl4ai.deep_crawling.filters import PathSegmentFilter, URLPatternFilter
+from crawl4ai.exhaustive_strategy_config import create_minimal_filter_chain
+
+
+class TestMinimalFilterChain:
+    """Test suite for create_minimal_filter_chain"""
+
+    @pytest.mark.asyncio
+    async def test_chains_do_not_share_state(self):
+        """Test that identical configurations get independent chains and statistics"""
+        patterns = ["*/admin/*", "*.tmp"]
+        first = create_minimal_filter_chain(exclude_patterns=patterns)
+        second = create_minimal_filter_chain(exclude_patterns=patterns)
+
+        assert first is not second
+        assert all(a is not b for a, b in zip(first.filters, second.filters))
+
+        assert not await first.apply("https://example.com/admin/users")
+        assert await first.apply("https://example.com/docs/guide.html")
+        assert (first.stats.total_urls, first.stats.rejected_urls) == (2, 1)
+        assert second.stats.total_urls == 0
+        assert all(f.stats.total_urls == 0 for f in second.filters)
+
+    def test_exclude_patterns_split_between_filters(self):
+        """Test that segment globs go to the trie filter and the rest to regex"""
+        chain = create_minimal_filter_chain(exclude_patterns=["*/admin/*", "*/wp-*", "*.tmp"])
+        segment, regex = chain.filters[:2]
+        assert isinstance(segment, PathSegmentFilter) and segment.patterns == ["*/admin/*", "*/wp-*"]
+        assert isinstance(regex, URLPatternFilter) and regex.patterns == ["*.tmp"]
+
+        assert create_minimal_filter_chain(enable_filtering=False).filters == ()
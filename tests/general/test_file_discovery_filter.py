@@ -105,6 +105,22 @@ class TestFileDiscoveryFilter:
         assert len(filter_instance.discovered_files) == 0
         assert filter_instance.discovery_stats.total_files_discovered == 0
     
+    @pytest.mark.parametrize("url", [
+        "http://[::1%20/report.pdf",
+        "http://[bad/report.pdf",
+        "http://bad]/report.pdf",
+        "http://[zz]/report.pdf",
+        "http://ex\u2100ample.com/report.pdf",
+    ])
+    def test_apply_malformed_url(self, url):
+        """Test that a URL urlparse cannot split is rejected and logged."""
+        logger = Mock()
+        filter_instance = FileDiscoveryFilter(logger=logger)
+        
+        assert filter_instance.apply(url) is False
+        assert filter_instance.stats.rejected_urls == 1
+        logger.error.assert_called_once()
+    
     def test_apply_excluded_extensions(self):
         """Test that excluded extensions are properly filtered out."""
         filter_instance = FileDiscoveryFilter(
@@ -148,6 +164,158 @@ class TestFileDiscoveryFilter:
         assert "/attachments" in repo_paths
         assert None in repo_paths  # For the path that doesn't match patterns
     
+    def test_repository_path_uses_leftmost_match(self):
+        """Test that nested repository directories resolve to the outermost one."""
+        filter_instance = FileDiscoveryFilter(
+            target_file_types=[FileType.DOCUMENT],
+            repository_patterns=[r'/files?/', r'/static/', r'[invalid']
+        )
+        
+        # The invalid pattern is skipped, the valid ones are still applied
+        assert len(filter_instance.repository_patterns) == 2
+        assert filter_instance.apply("https://example.com/static/files/report.pdf") is True
+        assert filter_instance.discovered_files[0].repository_path == "/static"
+    
+    def test_repository_pattern_literal_variants(self):
+        """Test which repository patterns expand to literal markers."""
+        from crawl4ai.file_discovery_filter import _literal_variants
+
+        assert sorted(_literal_variants(r'/Downloads?/')) == ['/download/', '/downloads/']
+        assert _literal_variants(r'/static/') == ['/static/']
+        assert _literal_variants(r'/v\d+/') is None
+        assert _literal_variants(r'/(docs|files)/') is None
+
+        # Paths too shallow to hold a marker skip the repository scan
+        assert FileDiscoveryFilter()._repository_min_slashes == 2
+        assert FileDiscoveryFilter(repository_patterns=[r'/v\d+/'])._repository_min_slashes == 0
+        filter_instance = FileDiscoveryFilter()
+        assert filter_instance.apply("https://example.com/report.pdf") is True
+        assert filter_instance.discovered_files[0].repository_path is None
+
+    def test_repository_path_cache(self):
+        """Test that repository paths are cached per directory and bounded."""
+        from crawl4ai import file_discovery_filter as module
+
+        filter_instance = FileDiscoveryFilter()
+        assert filter_instance._extract_repository_path("/a/b/c/d/files/x.pdf") == "/a/b/c/d/files"
+        assert filter_instance._extract_repository_path("/a/b/c/d/files/y.pdf") == "/a/b/c/d/files"
+        assert filter_instance._extract_repository_path("/a/b/c/d/other/x.pdf") is None
+        assert list(filter_instance._repository_path_cache) == ["/a/b/c/d/files/", "/a/b/c/d/other/"]
+
+        with patch.object(module, "_REPOSITORY_PATH_CACHE_SIZE", 2):
+            filter_instance._extract_repository_path("/media/z.pdf")
+        assert list(filter_instance._repository_path_cache) == ["/a/b/c/d/other/", "/media/"]
+
+        # A marker that may reach into the filename is cached per full path
+        filter_instance = FileDiscoveryFilter(repository_patterns=[r'/report'])
+        assert filter_instance._extract_repository_path("/x/report.pdf") == "/x/report"
+        assert list(filter_instance._repository_path_cache) == ["/x/report.pdf"]
+
+    def test_repository_automaton_matches_regex(self):
+        """Test that the Aho-Corasick scan resolves the same paths as the regex."""
+        pytest.importorskip("ahocorasick")
+        filter_instance = FileDiscoveryFilter(
+            repository_patterns=[r'/files?/', r'/static/', r'/a/', r'/a/b/']
+        )
+        assert filter_instance._repository_automaton is not None
+
+        for path in ["/static/files/report.pdf", "/x/File/y.pdf", "/a/b/c.pdf",
+                     "/nothing/here.pdf", "/Ärger/files/x.pdf"]:
+            match = filter_instance._repository_regex.search(path)
+            expected = path[:match.end()].rstrip('/') if match else None
+            assert filter_instance._extract_repository_path(path) == expected
+
+    @pytest.mark.parametrize("url", [
+        "https://example.com/docs/Report.PDF?version=2#page=3",
+        "https://example.com/docs/my%20report.pdf",
+        "https://example.com/docs/report.pdf;jsessionid=abc",
+        "https://example.com/docs/report.pdf/",
+        "https://example.com/archive.tar.gz",
+        "https://example.com/.hidden",
+        "https://example.com/file.",
+        "https://example.com.pdf",
+        "https://example.com/",
+        "http://[::1]/docs/report.pdf",
+        "https://ex\u00e4mple.com/docs/report.pdf",
+    ])
+    def test_url_splitting_matches_urlparse(self, url):
+        """Test that the fast URL split agrees with urlparse + Path."""
+        from pathlib import Path
+        from urllib.parse import urlparse, unquote
+        from crawl4ai.file_discovery_filter import _split_file_path
+        
+        path = unquote(urlparse(url).path)
+        filename = Path(path).name
+        assert _split_file_path(url) == (path, filename, Path(filename).suffix.lower())
+    
+    def test_suffix_prefilter(self):
+        """Test that the raw-suffix reject path agrees with full parsing."""
+        filter_instance = FileDiscoveryFilter(target_extensions=['.pdf'])
+        
+        # Pages are rejected up front but still counted
+        assert filter_instance.apply("https://example.com/about") is False
+        assert filter_instance.apply("https://example.com/v1.2/index.html?f=a.pdf") is False
+        assert filter_instance.stats.rejected_urls == 2
+        
+        # Suffixes hidden behind slashes, escapes or path parameters are still found
+        assert filter_instance.apply("https://example.com/report.PDF/") is True
+        assert filter_instance.apply("https://example.com/report%2Epdf") is True
+        assert filter_instance.apply("https://example.com/report.pdf;jsessionid=1") is True
+        assert filter_instance.stats.passed_urls == 3
+    
+    def test_apply_batch_matches_apply(self):
+        """Test that batch filtering gives the same results as per-URL filtering."""
+        urls = [
+            "https://example.com/report.pdf",
+            "https://example.com/about",
+            "https://example.com/data.XLSX/?download=1",
+            "https://example.com/report%2Epdf",
+            "https://example.com/index.html?file=a.pdf",
+            "https://example.com/report.pdfx",
+            "https://example.com/notes.doc;jsessionid=1",
+            "",
+        ]
+        batch_filter = FileDiscoveryFilter()
+        single_filter = FileDiscoveryFilter()
+        
+        assert batch_filter.apply_batch(urls) == [single_filter.apply(url) for url in urls]
+        assert batch_filter.stats.total_urls == single_filter.stats.total_urls == len(urls)
+        assert batch_filter.stats.rejected_urls == single_filter.stats.rejected_urls
+        assert [f.url for f in batch_filter.discovered_files] == [f.url for f in single_filter.discovered_files]
+        assert batch_filter.apply_batch([]) == []
+    
+    def test_apply_bytes_matches_apply(self):
+        """Test that byte URLs get the same results as their decoded form."""
+        urls = [
+            "https://example.com/about",
+            "https://example.com/docs/Report.PDF?version=2#page=3",
+            "https://example.com/docs/my%20report.pdf",
+            "https://example.com/docs/report.pdf;jsessionid=abc",
+            "https://example.com/downloads/data.csv/",
+            "https://example.com/ünïcode/guide.docx",
+        ]
+        by_str = FileDiscoveryFilter()
+        by_bytes = FileDiscoveryFilter()
+        
+        assert [by_bytes.apply_bytes(u.encode()) for u in urls] == [by_str.apply(u) for u in urls]
+        assert list(by_bytes.discovered_files) == list(by_str.discovered_files)
+        assert by_bytes.apply_bytes(b"https://example.com/\xff.pdf") is False
+        assert by_bytes.stats.total_urls == len(urls) + 1
+    
+    def test_size_hints(self):
+        """Test that URL size hints are checked against max_file_size_mb."""
+        filter_instance = FileDiscoveryFilter(
+            target_file_types=[FileType.DOCUMENT],
+            max_file_size_mb=1
+        )
+        
+        assert filter_instance.apply("https://example.com/report.pdf?size=1024") is True
+        assert filter_instance.apply("https://example.com/report.pdf?size=1048576") is True
+        assert filter_instance.apply("https://example.com/report.pdf?size=1048577") is False
+        assert filter_instance.apply("https://example.com/report.pdf?FileSize=5242880") is False
+        assert filter_instance.apply("https://example.com/bytes=2097152/report.pdf") is False
+        assert filter_instance.apply("https://example.com/report.pdf") is True
+    
     def test_file_metadata_creation(self):
         """Test that file metadata is correctly created."""
         filter_instance = FileDiscoveryFilter(
@@ -268,12 +436,42 @@ class TestFileDiscoveryFilter:
         json_export = filter_instance.export_file_inventory("json")
         assert isinstance(json_export, str)
         assert "discovered_files" in json_export
+        assert filter_instance.export_file_inventory_bytes() == json_export.encode("utf-8")
+        
+        # orjson and the json fallback produce the same document
+        import json
+        with patch("crawl4ai.file_discovery_filter.HAS_ORJSON", False):
+            assert filter_instance.export_file_inventory("json") == json_export
+        assert json.loads(json_export) == dict_export
         
         # Test CSV export
         csv_export = filter_instance.export_file_inventory("csv")
         assert isinstance(csv_export, str)
         assert "URL,Filename,Extension" in csv_export
         assert "file.pdf" in csv_export
+        
+        # Streaming rows add up to the same document, quoting included
+        filter_instance.apply("https://example.com/a,b.pdf")
+        rows = list(filter_instance.iter_csv_rows())
+        assert len(rows) == 3
+        assert rows[2].startswith('"https://example.com/a,b.pdf","a,b.pdf"')
+        assert "".join(rows) == filter_instance.export_file_inventory("csv")
+    
+    def test_discovered_files_sequence(self):
+        """Test that column-stored discovered files read back as FileMetadata."""
+        filter_instance = FileDiscoveryFilter(
+            target_file_types=[FileType.DOCUMENT, FileType.DATA]
+        )
+        filter_instance.apply("https://example.com/downloads/report.pdf")
+        filter_instance.apply("https://example.com/data/export.csv")
+        
+        files = filter_instance.discovered_files
+        assert len(files) == 2
+        assert isinstance(files[-1], FileMetadata)
+        assert files[-1].file_type == FileType.DATA
+        assert [f.filename for f in files] == ["report.pdf", "export.csv"]
+        assert [f.url for f in files[1:]] == ["https://example.com/data/export.csv"]
+        assert filter_instance.get_discovered_files(FileType.DOCUMENT)[0].repository_path == "/downloads"
     
     def test_clear_discovered_files(self):
         """Test clearing discovered files and statistics."""
@@ -313,6 +511,11 @@ class TestFileDiscoveryFilter:
             result = filter_instance.apply("https://example.com/file.pdf")
             # Current implementation is lenient with MIME validation
             assert result is True
+        
+        # The check itself reports mismatches; apply() only logs them
+        assert filter_instance._is_valid_mime_type('application/PDF', '.PDF') is True
+        assert filter_instance._is_valid_mime_type('text/html', '.pdf') is False
+        assert filter_instance._is_valid_mime_type('text/html', '.unknown') is True
     
     def test_convenience_functions(self):
         """Test convenience functions for creating specialized filters."""
@@ -351,7 +554,7 @@ class TestFileMetadata:
     """Test cases for FileMetadata class."""
     
     def test_file_metadata_creation(self):
-        """Test FileMetadata creation and post-initialization."""
+        """Test FileMetadata creation and lazy MIME type guessing."""
         metadata = FileMetadata(
             url="https://example.com/file.pdf",
             filename="file.pdf",
@@ -363,7 +566,25 @@ class TestFileMetadata:
         assert metadata.filename == "file.pdf"
         assert metadata.extension == ".pdf"
         assert metadata.file_type == FileType.DOCUMENT
-        assert metadata.mime_type == "application/pdf"  # Set by post_init
+        assert metadata.mime_type is None  # Not guessed at construction
+        assert metadata.mime_type_guessed == "application/pdf"
+        
+        explicit = FileMetadata(
+            url="https://example.com/file.pdf",
+            filename="file.pdf",
+            extension=".pdf",
+            file_type=FileType.DOCUMENT,
+            mime_type="application/x-pdf"
+        )
+        assert explicit.mime_type_guessed == "application/x-pdf"
+        
+        upper = FileMetadata(
+            url="https://example.com/FILE.PDF",
+            filename="FILE.PDF",
+            extension=".PDF",
+            file_type=FileType.DOCUMENT
+        )
+        assert upper.extension == ".pdf"  # Normalized once at construction
 
 
 class TestFileDiscoveryStats:
@@ -0,0 +1,447 @@
+"""
+Tests for GraphVisualizer
+
+Runs the visualizer over a small duck-typed graph handler exposing the
+graph, nodes, calculate_centrality_measures() and analyze_graph() it reads,
+and checks its per-graph-version caches, layouts and renderers. Renderer
+tests are skipped when matplotlib or plotly are not installed.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+import networkx as nx
+import numpy as np
+
+from crawl4ai import graph_visualizer
+from crawl4ai.graph_visualizer import GraphVisualizer
+
+
+HOME = "https://example.com"
+
+requires_matplotlib = pytest.mark.skipif(not graph_visualizer.MATPLOTLIB_AVAILABLE,
+                                         reason="matplotlib not installed")
+requires_plotly = pytest.mark.skipif(not graph_visualizer.PLOTLY_AVAILABLE, reason="plotly not installed")
+
+
+@dataclass
+class PageNode:
+    """Node attributes the visualizer reads"""
+    url: str
+    depth: int = 0
+    is_file: bool = False
+
+    @property
+    def file_extension(self):
+        return os.path.splitext(self.url)[1] if self.is_file else None
+
+
+class StubGraphHandler:
+    """Minimal graph handler: a DiGraph, its nodes by URL, and the analyses"""
+
+    def __init__(self):
+        self.graph = nx.DiGraph()
+        self.nodes = {}
+
+    def add_node(self, node: PageNode):
+        self.nodes[node.url] = node
+        self.graph.add_node(node.url)
+
+    def add_edge(self, source: str, target: str):
+        self.graph.add_edge(source, target)
+
+    def calculate_centrality_measures(self):
+        return {
+            'degree': nx.degree_centrality(self.graph),
+            'betweenness': nx.betweenness_centrality(self.graph),
+        }
+
+    def analyze_graph(self):
+        pagerank = nx.pagerank(self.graph)
+        return SimpleNamespace(
+            total_nodes=self.graph.number_of_nodes(),
+            total_edges=self.graph.number_of_edges(),
+            density=nx.density(self.graph),
+            connected_components=nx.number_weakly_connected_components(self.graph),
+            dead_ends=[n for n in self.graph if self.graph.out_degree(n) == 0],
+            entry_points=[n for n in self.graph if self.graph.in_degree(n) == 0],
+            file_nodes=[url for url, node in self.nodes.items() if node.is_file],
+            page_rank_top_10=sorted(pagerank.items(), key=lambda x: x[1], reverse=True)[:10],
+        )
+
+
+@pytest.fixture
+def handler():
+    """A home page linking to two pages, one of which links to a PDF"""
+    handler = StubGraphHandler()
+    for node in (PageNode(HOME), PageNode(f"{HOME}/page1", depth=1), PageNode(f"{HOME}/page2", depth=1),
+                 PageNode(f"{HOME}/file.pdf", depth=2, is_file=True)):
+        handler.add_node(node)
+    handler.add_edge(HOME, f"{HOME}/page1")
+    handler.add_edge(HOME, f"{HOME}/page2")
+    handler.add_edge(f"{HOME}/page1", f"{HOME}/file.pdf")
+    return handler
+
+
+@pytest.fixture
+def visualizer(handler):
+    visualizer = GraphVisualizer(handler)
+    yield visualizer
+    visualizer.close_figure()
+
+
+@pytest.fixture
+def agg():
+    """Render with the non-interactive Agg backend"""
+    import matplotlib.pyplot as plt
+    backend = plt.get_backend()
+    plt.switch_backend("Agg")
+    yield
+    plt.switch_backend(backend)
+
+
+class TestGraphVisualizerCaches:
+    """Test suite for results reused until the graph changes"""
+
+    def test_metrics_cached_until_graph_changes(self, handler, visualizer):
+        """Test that centrality and analysis are reused across render calls"""
+        with patch.object(handler, 'calculate_centrality_measures',
+                          wraps=handler.calculate_centrality_measures) as centrality, \
+             patch.object(handler, 'analyze_graph', wraps=handler.analyze_graph) as analysis:
+            assert visualizer._get_centrality() is visualizer._get_centrality()
+            visualizer._get_analysis()
+            visualizer._get_analysis()
+            assert centrality.call_count == 1
+            assert analysis.call_count == 1
+
+            # Adding an edge invalidates both caches
+            handler.add_edge(f"{HOME}/page2", f"{HOME}/file.pdf")
+            visualizer._get_centrality()
+            visualizer._get_analysis()
+            assert centrality.call_count == 2
+            assert analysis.call_count == 2
+
+            # So does bumping the graph version after an in-place change
+            handler.graph.graph["version"] = 1
+            visualizer._get_analysis()
+            assert analysis.call_count == 3
+
+    def test_csr_mirror(self, handler, visualizer):
+        """Test that the CSR arrays mirror the graph's edges and degrees"""
+        def csr_edges():
+            indptr, indices, node_ids = visualizer._ensure_csr()
+            assert node_ids == list(handler.graph)
+            return [(node_ids[i], node_ids[j])
+                    for i in range(len(node_ids)) for j in indices[indptr[i]:indptr[i + 1]]]
+
+        assert csr_edges() == list(handler.graph.edges())
+        assert visualizer._degrees().tolist() == [d for _, d in handler.graph.degree()]
+        assert visualizer._ensure_csr()[0] is visualizer._ensure_csr()[0]
+
+        # Rebuilt after a graph change
+        indptr = visualizer._ensure_csr()[0]
+        handler.add_node(PageNode(f"{HOME}/page3", depth=2))
+        handler.add_edge(f"{HOME}/page2", f"{HOME}/page3")
+        assert visualizer._ensure_csr()[0] is not indptr
+        assert csr_edges() == list(handler.graph.edges())
+        assert visualizer._degrees().tolist() == [d for _, d in handler.graph.degree()]
+
+    def test_short_labels(self, handler, visualizer):
+        """Test that node labels are parsed once per graph version and reused"""
+        from urllib.parse import urlparse
+
+        with patch('crawl4ai.graph_visualizer.urlparse', wraps=urlparse) as parse:
+            assert visualizer._short_label(HOME) == "example.com"
+            assert visualizer._short_label(f"{HOME}/file.pdf") == "file.pdf"
+            visualizer._short_label(f"{HOME}/page1")
+            assert parse.call_count == 4
+
+            # URLs outside the graph are parsed on each call
+            assert visualizer._short_label("https://other.com/docs/guide") == "guide"
+            assert parse.call_count == 5
+
+            # A graph change parses the node URLs again
+            handler.add_node(PageNode(f"{HOME}/page3"))
+            assert visualizer._short_label(f"{HOME}/page3") == "page3"
+            assert parse.call_count == 10
+
+    def test_pagerank_matches_networkx(self, handler, visualizer):
+        """Test the CSR PageRank against NetworkX, before and after a graph change"""
+        assert visualizer._get_pagerank() == pytest.approx(nx.pagerank(handler.graph), abs=1e-6)
+
+        # Warm-started from the previous scores
+        handler.add_edge(f"{HOME}/file.pdf", HOME)
+        assert visualizer._get_pagerank() == pytest.approx(nx.pagerank(handler.graph), abs=1e-5)
+
+    def test_pagerank_matches_networkx_with_dangling_nodes(self):
+        """Test the CSR PageRank on a larger graph with cycles and dead ends"""
+        handler = StubGraphHandler()
+        graph = nx.gnp_random_graph(200, 0.02, seed=7, directed=True)
+        for node in graph:
+            handler.add_node(PageNode(f"{HOME}/{node}"))
+        for u, v in graph.edges():
+            handler.add_edge(f"{HOME}/{u}", f"{HOME}/{v}")
+        assert any(handler.graph.out_degree(node) == 0 for node in handler.graph)
+
+        pagerank = GraphVisualizer(handler)._get_pagerank()
+        assert pagerank == pytest.approx(nx.pagerank(handler.graph), abs=1e-6)
+
+
+class TestGraphVisualizerLayouts:
+    """Test suite for layout computation and caching"""
+
+    def test_layout_cached_until_graph_changes(self, handler, visualizer):
+        """Test that each layout type is computed once per graph version"""
+        with patch.object(visualizer, 'create_hierarchical_layout',
+                          wraps=visualizer.create_hierarchical_layout) as layout:
+            assert visualizer.get_layout("hierarchical") is visualizer.get_layout("hierarchical")
+            assert layout.call_count == 1
+
+            handler.add_edge(f"{HOME}/page2", f"{HOME}/file.pdf")
+            visualizer.get_layout("hierarchical")
+            assert layout.call_count == 2
+
+    def test_spring_layout_method_by_size(self, visualizer):
+        """Test that large graphs use the energy spring layout solver"""
+        with patch('networkx.spring_layout', return_value={}) as layout:
+            visualizer._spring_layout(seed=42)
+            assert layout.call_args.kwargs == {"method": "force", "seed": 42}
+
+            with patch('crawl4ai.graph_visualizer._ENERGY_LAYOUT_MIN_NODES', 4):
+                visualizer._spring_layout()
+            assert layout.call_args.kwargs == {"method": "energy"}
+
+            with patch('crawl4ai.graph_visualizer._ENERGY_LAYOUT_MIN_NODES', 5):
+                visualizer._spring_layout()
+            assert layout.call_args.kwargs == {"method": "force"}
+
+        # NetworkX without the method argument
+        with patch('networkx.spring_layout', side_effect=[TypeError("method"), {}]) as layout:
+            visualizer._spring_layout(k=1)
+            assert layout.call_count == 2
+            assert layout.call_args.kwargs == {"k": 1}
+
+    def test_energy_spring_layout(self, visualizer):
+        """Test that the installed NetworkX lays out every node with the energy solver"""
+        with patch('crawl4ai.graph_visualizer._ENERGY_LAYOUT_MIN_NODES', 1):
+            pos = visualizer._spring_layout(seed=0)
+        assert set(pos) == set(visualizer.graph)
+
+    def test_hierarchical_layout(self, handler, visualizer):
+        """Test that depth rows are spread evenly, as the per-node layout placed them"""
+        handler.add_node(PageNode(f"{HOME}/page3", depth=1))
+        handler.add_node(PageNode(f"{HOME}/other.pdf", depth=2, is_file=True))
+        handler.add_edge(HOME, f"{HOME}/page3")
+        handler.add_edge(f"{HOME}/page3", f"{HOME}/other.pdf")
+
+        assert visualizer.create_hierarchical_layout() == {
+            HOME: (0.0, 2.0),
+            f"{HOME}/page1": (-1.5, 1.0),
+            f"{HOME}/page2": (0.0, 1.0),
+            f"{HOME}/page3": (1.5, 1.0),
+            f"{HOME}/file.pdf": (-1.0, 0.0),
+            f"{HOME}/other.pdf": (1.0, 0.0),
+        }
+
+    def test_hierarchical_coords(self):
+        """Test the installed coordinate kernel, NumPy or numba, against linspace per row"""
+        counts = np.array([1, 2, 5, 7, 1], dtype=np.int64)
+        levels = np.array([4.0, 3.0, 2.0, 1.0, 0.0])
+        xs, ys = graph_visualizer._hierarchical_coords(counts, levels)
+
+        expected = np.concatenate([np.linspace(-n / 2, n / 2, n) if n > 1 else [0.0] for n in counts])
+        assert np.allclose(xs, expected)
+        assert ys.tolist() == [4.0, 3.0, 3.0] + [2.0] * 5 + [1.0] * 7 + [0.0]
+
+    def test_domain_clustered_layout(self, handler, visualizer):
+        """Test that one spring layout is split into unit-radius clusters around each domain's center"""
+        handler.add_node(PageNode("https://other.org/a"))
+        handler.add_node(PageNode("https://other.org/b"))
+        handler.add_node(PageNode("https://third.net/x"))
+        handler.add_edge("https://other.org/a", "https://other.org/b")
+        handler.add_edge(HOME, "https://third.net/x")
+
+        with patch.object(visualizer, '_spring_layout', wraps=visualizer._spring_layout) as spring:
+            pos = visualizer.create_domain_clustered_layout()
+        assert spring.call_count == 1
+        assert set(pos) == set(handler.graph)
+
+        # Domains in order of first appearance, on a circle of radius 3
+        angles = np.linspace(0, 2 * np.pi, 3, endpoint=False)
+        centers = 3 * np.column_stack([np.cos(angles), np.sin(angles)])
+        clusters = [
+            [HOME, f"{HOME}/page1", f"{HOME}/page2", f"{HOME}/file.pdf"],
+            ["https://other.org/a", "https://other.org/b"],
+            ["https://third.net/x"],
+        ]
+        for center, urls in zip(centers, clusters):
+            offsets = np.array([pos[url] for url in urls]) - center
+            assert np.allclose(offsets.mean(axis=0), 0)
+            # A lone node sits on the center, larger clusters reach unit radius
+            assert np.isclose(np.abs(offsets).max(), 0 if len(urls) == 1 else 1)
+
+    def test_domain_clustered_layout_single_domain(self, visualizer):
+        """Test that a single domain is centered on the origin within unit radius"""
+        coords = np.array(list(visualizer.create_domain_clustered_layout().values()))
+        assert np.allclose(coords.mean(axis=0), 0)
+        assert np.isclose(np.abs(coords).max(), 1)
+
+    @patch('crawl4ai.graph_visualizer.GRAPHVIZ_AVAILABLE', True)
+    def test_force_directed_layout_uses_sfdp(self, handler, visualizer):
+        """Test the sfdp layout path, rescaled to the spring layout's range"""
+        sfdp_pos = {node: (i * 100.0, 50.0) for i, node in enumerate(handler.graph)}
+        with patch('networkx.nx_agraph.graphviz_layout', return_value=sfdp_pos) as layout, \
+             patch.object(visualizer, '_spring_layout') as spring:
+            pos = visualizer.create_force_directed_layout(k=2)
+            assert layout.call_args.kwargs == {"prog": "sfdp", "args": "-GK=2"}
+            assert max(abs(c) for xy in pos.values() for c in xy) == pytest.approx(1.0)
+            assert spring.call_count == 0
+
+            visualizer.create_force_directed_layout()
+            assert layout.call_args.kwargs == {"prog": "sfdp", "args": ""}
+
+    @pytest.mark.parametrize("error", [ValueError("sfdp not found"), OSError("dot crashed")])
+    @patch('crawl4ai.graph_visualizer.GRAPHVIZ_AVAILABLE', True)
+    def test_force_directed_layout_falls_back_to_spring(self, visualizer, error):
+        """Test the spring layout fallback when sfdp fails"""
+        with patch('networkx.nx_agraph.graphviz_layout', side_effect=error), \
+             patch.object(visualizer, '_spring_layout', wraps=visualizer._spring_layout) as spring:
+            assert len(visualizer.create_force_directed_layout(iterations=10)) == 4
+            assert spring.call_args.kwargs == {"k": None, "iterations": 10, "seed": 42}
+
+    @patch('crawl4ai.graph_visualizer.GRAPHVIZ_AVAILABLE', False)
+    def test_force_directed_layout_without_graphviz(self, visualizer):
+        """Test that the spring layout is used without pygraphviz"""
+        with patch('networkx.nx_agraph.graphviz_layout') as layout:
+            pos = visualizer.create_force_directed_layout()
+            assert layout.call_count == 0
+        assert len(pos) == 4
+        # Seeded, so the same graph gets the same layout
+        again = visualizer.create_force_directed_layout()
+        assert all(np.array_equal(pos[node], again[node]) for node in pos)
+
+    def test_cytoscape_export_with_positions(self, visualizer, tmp_path):
+        """Test that a layout type exports preset node positions"""
+        visualizer.export_for_cytoscape(str(tmp_path / "graph.json"), layout_type="hierarchical")
+        data = json.loads((tmp_path / "graph.json").read_text())
+
+        assert data['layout'] == {'name': 'preset'}
+        positions = {e['data']['id']: e['position'] for e in data['elements'] if 'position' in e}
+        assert len(positions) == 4
+        # The root sits above its children; Cytoscape's y axis points down
+        assert positions[HOME]['y'] < positions[f"{HOME}/page1"]['y']
+
+        visualizer.export_for_cytoscape(str(tmp_path / "plain.json"))
+        data = json.loads((tmp_path / "plain.json").read_text())
+        assert data['layout']['name'] != 'preset'
+        assert not any('position' in e for e in data['elements'])
+        assert sum('source' in e['data'] for e in data['elements']) == 3
+
+
+@requires_matplotlib
+@pytest.mark.usefixtures("agg")
+class TestGraphVisualizerMatplotlib:
+    """Test suite for matplotlib rendering"""
+
+    def test_edges_drawn_as_collections(self, handler, visualizer, tmp_path):
+        """Test that edges are drawn as shaft and arrowhead collections"""
+        from matplotlib.collections import LineCollection, PolyCollection
+        handler.add_edge(f"{HOME}/page2", f"{HOME}/page2")
+
+        visualizer.visualize_with_matplotlib(output_path=str(tmp_path / "a.png"),
+                                             layout_type="hierarchical", dpi=50)
+        ax = visualizer._render_context['fig'].axes[0]
+        shafts = [c for c in ax.collections if isinstance(c, LineCollection)]
+        heads = [c for c in ax.collections if isinstance(c, PolyCollection)]
+        assert not ax.patches
+
+        # Regular edges in gray, the file edge in red, both with arrowheads
+        # except on the self-loop
+        assert [len(c.get_segments()) for c in shafts] == [3, 1]
+        assert [len(c.get_paths()) for c in heads] == [2, 1]
+
+        # Each arrowhead's tip sits just short of its edge's target and the
+        # triangle points along the edge
+        pos = visualizer.get_layout("hierarchical")
+        tips = {tuple(np.round(path.vertices[0], 6)): path.vertices[:3] for c in heads for path in c.get_paths()}
+        for u, v in handler.graph.edges():
+            if u == v:
+                continue
+            start, end = np.array(pos[u]), np.array(pos[v])
+            tip = start + graph_visualizer._ARROW_TIP_POSITION * (end - start)
+            triangle = tips[tuple(np.round(tip, 6))]
+            base_center = triangle[1:].mean(axis=0)
+            direction = (end - start) / np.linalg.norm(end - start)
+            assert np.dot(tip - base_center, direction) > 0
+            axis = tip - base_center
+            assert axis[0] * direction[1] - axis[1] * direction[0] == pytest.approx(0, abs=1e-9)
+            # Base corners are symmetric about the edge
+            assert np.linalg.norm(triangle[1] - base_center) == pytest.approx(np.linalg.norm(triangle[2] - base_center))
+
+    def test_figure_reused_across_schemes(self, handler, visualizer, tmp_path):
+        """Test that restyling a saved render keeps the same figure and artists"""
+        visualizer.visualize_with_matplotlib(output_path=str(tmp_path / "a.png"), color_scheme="depth", dpi=50)
+        context = visualizer._render_context
+        fig, nodes = context['fig'], context['nodes']
+        assert context['colorbar'] is not None
+        sizes = nodes.get_sizes().copy()
+
+        with patch.object(visualizer, '_build_figure', wraps=visualizer._build_figure) as build:
+            visualizer.visualize_with_matplotlib(output_path=str(tmp_path / "b.png"), color_scheme="none",
+                                                 size_scheme="degree", dpi=50)
+            assert build.call_count == 0
+        assert visualizer._render_context['fig'] is fig
+        assert visualizer._render_context['nodes'] is nodes
+        assert visualizer._render_context['colorbar'] is None
+        assert not np.array_equal(nodes.get_sizes(), sizes)
+        assert (tmp_path / "b.png").exists()
+
+        # A changed graph or a different layout builds a new figure
+        handler.add_edge(f"{HOME}/page2", f"{HOME}/file.pdf")
+        visualizer.visualize_with_matplotlib(output_path=str(tmp_path / "c.png"), dpi=50)
+        assert visualizer._render_context['fig'] is not fig
+        fig = visualizer._render_context['fig']
+        visualizer.visualize_with_matplotlib(output_path=str(tmp_path / "d.png"), layout_type="hierarchical", dpi=50)
+        assert visualizer._render_context['fig'] is not fig
+
+        visualizer.close_figure()
+        assert visualizer._render_context is None
+
+
+@requires_plotly
+class TestGraphVisualizerDashboard:
+    """Test suite for the plotly dashboard"""
+
+    def test_dashboard_defers_network_panel(self, visualizer, tmp_path):
+        """Test that the network panel is embedded as JSON for on-demand rendering"""
+        page = (tmp_path / "dash.html")
+        assert visualizer.create_interactive_dashboard(str(page)) == str(page)
+        page = page.read_text()
+
+        assert page.startswith("<html>")
+        assert "Plotly.react('site-graph-network'" in page
+        network = page.split('id="site-graph-network-data">', 1)[1].split('</script>', 1)[0]
+        figure = json.loads(network)
+        assert figure['layout']['title']['text'] == 'Site Graph Network'
+        assert len(figure['data'][1]['text']) == 4
+
+        summary = tmp_path / "summary.html"
+        visualizer.create_interactive_dashboard(str(summary), include_network=False)
+        assert 'site-graph-network' not in summary.read_text()
+
+    def test_dashboard_network_json_cannot_close_script(self, visualizer, tmp_path):
+        """Test that "</" in hover text is escaped inside the embedded JSON"""
+        label = "</script><script>alert(1)</script>"
+        visualizer._short_label = lambda url: label
+
+        page = (tmp_path / "dash.html")
+        visualizer.create_interactive_dashboard(str(page))
+        page = page.read_text()
+
+        assert "<script>alert(1)" not in page
+        network = page.split('id="site-graph-network-data">', 1)[1].split('</script>', 1)[0]
+        assert json.loads(network)['data'][1]['text'][0].startswith(label)
@@ -10,13 +10,16 @@ import pytest_asyncio
 import asyncio
 import tempfile
 import os
-from datetime import datetime
+from dataclasses import asdict
+from datetime import datetime, timedelta
 from crawl4ai.async_database import AsyncDatabaseManager
 from crawl4ai.site_graph_db import (
     URLNode, 
     SiteGraphStats, 
     SiteGraphDatabaseManager,
-    create_site_graph_manager
+    create_site_graph_manager,
+    URLNodeView,
+    _row_to_url_node
 )
 
 
@@ -75,6 +78,20 @@ class TestSiteGraphDatabase:
         assert retrieved.content_type == url_node.content_type
         assert retrieved.is_file == url_node.is_file
     
+    def test_slotted_dataclasses(self):
+        """Test that URLNode and SiteGraphStats carry no per-instance __dict__"""
+        node = URLNode(url="https://example.com", metadata={"a": 1})
+        stats = SiteGraphStats(base_url="https://example.com")
+        assert not hasattr(node, "__dict__")
+        assert not hasattr(stats, "__dict__")
+        assert asdict(node)["metadata"] == {"a": 1}
+        assert asdict(stats)["base_url"] == "https://example.com"
+        
+        row = ("https://example.com", None, None, None, None, None, None, 0, None,
+               "not_attempted", None, None, '{"a": 1}', None, 0)
+        lazy = _row_to_url_node(row)
+        assert lazy == node
+    
     @pytest.mark.asyncio
     async def test_store_file_url(self, site_graph_manager):
         """Test storing a file URL with metadata"""
@@ -102,6 +119,42 @@ class TestSiteGraphDatabase:
         assert retrieved.download_status == "not_attempted"
         assert retrieved.metadata["title"] == "Test Document"
     
+    @pytest.mark.asyncio
+    async def test_store_discovered_urls_bulk(self, site_graph_manager):
+        """Test storing a page's links in one batch, including an upsert"""
+        base_url = "https://example.com"
+        nodes = [
+            URLNode(url=f"{base_url}/page{i}", source_url=base_url, discovered_at=datetime.now())
+            for i in range(50)
+        ]
+        nodes.append(URLNode(url=f"{base_url}/page0", source_url=base_url, status_code=404))
+        
+        await site_graph_manager.store_discovered_urls_bulk(nodes)
+        await site_graph_manager.store_discovered_urls_bulk([])
+        
+        site_graph = await site_graph_manager.get_site_graph(base_url)
+        assert site_graph['total_urls'] == 50
+        
+        # The later duplicate updated the first row
+        retrieved = await site_graph_manager.get_discovered_url(f"{base_url}/page0")
+        assert retrieved.status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_store_new_discovered_urls(self, site_graph_manager):
+        """Test that storing new URLs keeps already stored ones, unlike the upsert"""
+        base_url = "https://example.com"
+        await site_graph_manager.store_new_discovered_urls_bulk([
+            URLNode(url=f"{base_url}/page{i}", source_url=base_url) for i in range(10)
+        ])
+        await site_graph_manager.store_new_discovered_url(
+            URLNode(url=f"{base_url}/page0", status_code=404)
+        )
+        assert (await site_graph_manager.get_discovered_url(f"{base_url}/page0")).status_code is None
+        assert (await site_graph_manager.get_site_graph(base_url))['total_urls'] == 10
+
+        await site_graph_manager.upsert_discovered_url(URLNode(url=f"{base_url}/page0", status_code=404))
+        assert (await site_graph_manager.get_discovered_url(f"{base_url}/page0")).status_code == 404
+
     @pytest.mark.asyncio
     async def test_update_url_status(self, site_graph_manager):
         """Test updating URL status after crawling"""
@@ -211,6 +264,31 @@ class TestSiteGraphDatabase:
         assert site_graph_no_files['total_urls'] == 2
         assert site_graph_no_files['total_files'] == 0
     
+    @pytest.mark.asyncio
+    async def test_iter_site_graph(self, site_graph_manager):
+        """Test streaming a site graph in batches"""
+        base_url = "https://example.com"
+        await site_graph_manager.store_discovered_urls_bulk([
+            URLNode(url=f"{base_url}/page{i}", discovered_at=datetime(2024, 1, 1, 0, 0, i),
+                    is_file=i % 3 == 0)
+            for i in range(25)
+        ])
+        
+        streamed = [node.url async for node in site_graph_manager.iter_site_graph(base_url, batch_size=4)]
+        assert streamed == [f"{base_url}/page{i}" for i in range(25)]
+        
+        pages = [node async for node in site_graph_manager.iter_site_graph(base_url, include_files=False)]
+        assert len(pages) == 16
+        assert not any(node.is_file for node in pages)
+        
+        assert [node async for node in site_graph_manager.iter_site_graph("https://unknown.com")] == []
+        
+        views = [node async for node in site_graph_manager.iter_site_graph(base_url, as_views=True)]
+        assert all(isinstance(view, URLNodeView) for view in views)
+        assert [view.url for view in views] == streamed
+        assert views[0].is_file is True
+        assert views[0].discovered_at == datetime(2024, 1, 1, 0, 0, 0)
+    
     @pytest.mark.asyncio
     async def test_site_graph_stats(self, site_graph_manager):
         """Test storing and retrieving site graph statistics"""
@@ -240,6 +318,55 @@ class TestSiteGraphDatabase:
         assert retrieved_stats.dead_end_count == 5
         assert retrieved_stats.revisit_ratio == 0.25
     
+    @pytest.mark.asyncio
+    async def test_site_graph_stats_counters(self, site_graph_manager):
+        """Test that stored and downloaded URLs update the site's counters"""
+        base_url = "https://example.com"
+        await site_graph_manager.store_site_graph_stats(SiteGraphStats(base_url=base_url))
+        
+        await site_graph_manager.store_new_discovered_urls_bulk([
+            URLNode(url=f"{base_url}/page"),
+            URLNode(url=f"{base_url}/a.pdf", is_file=True),
+            URLNode(url=f"{base_url}/b.pdf", is_file=True, download_status="completed"),
+            URLNode(url="https://other.com/c.pdf", is_file=True),
+        ])
+        # Already stored, so not counted again
+        await site_graph_manager.store_new_discovered_url(URLNode(url=f"{base_url}/page"))
+        await site_graph_manager.update_file_download_status(f"{base_url}/a.pdf", "completed")
+        await site_graph_manager.update_file_download_status(f"{base_url}/a.pdf", "completed")
+        
+        stats = await site_graph_manager.get_site_graph_stats(base_url)
+        assert stats.total_urls_discovered == 3
+        assert stats.total_files_discovered == 2
+        assert stats.total_files_downloaded == 2
+        assert stats.last_activity is not None
+    
+    @pytest.mark.asyncio
+    async def test_site_graph_stats_counters_after_cleanup(self, site_graph_manager):
+        """Test that cleaned up URLs are taken off the site's counters"""
+        base_url = "https://example.com"
+        await site_graph_manager.store_site_graph_stats(SiteGraphStats(base_url=base_url))
+        
+        old = datetime.now() - timedelta(days=60)
+        await site_graph_manager.store_new_discovered_urls_bulk([
+            URLNode(url=f"{base_url}/old", discovered_at=old),
+            URLNode(url=f"{base_url}/old.pdf", is_file=True, download_status="completed", discovered_at=old),
+            URLNode(url=f"{base_url}/new"),
+            URLNode(url=f"{base_url}/new.pdf", is_file=True, download_status="completed"),
+        ])
+        assert await site_graph_manager.cleanup_old_entries(base_url, days_old=30) == 2
+        
+        stats = await site_graph_manager.get_site_graph_stats(base_url)
+        assert stats.total_urls_discovered == 2
+        assert stats.total_files_discovered == 1
+        assert stats.total_files_downloaded == 1
+        
+        # Counters set lower by hand do not go negative
+        await site_graph_manager.store_site_graph_stats(SiteGraphStats(base_url=base_url))
+        await site_graph_manager.cleanup_old_entries(base_url, days_old=-1)
+        stats = await site_graph_manager.get_site_graph_stats(base_url)
+        assert (stats.total_urls_discovered, stats.total_files_discovered, stats.total_files_downloaded) == (0, 0, 0)
+    
     @pytest.mark.asyncio
     async def test_crawl_progress(self, site_graph_manager):
         """Test getting comprehensive crawl progress"""
@@ -275,7 +402,333 @@ class TestSiteGraphDatabase:
         assert progress['file_progress']['failed'] == 1
         assert progress['file_progress']['pending'] == 1
         assert progress['file_progress']['progress_percentage'] == 50.0
+        assert 'errors' not in progress
+    
+    @pytest.mark.asyncio
+    async def test_crawl_progress_partial_failure(self, site_graph_manager):
+        """Test that a failed file count is reported alongside the stats"""
+        base_url = "https://example.com"
+        await site_graph_manager.store_site_graph_stats(SiteGraphStats(base_url=base_url))
+        
+        async def failing_count(base_url):
+            raise RuntimeError("count failed")
+        
+        site_graph_manager._count_files_by_status = failing_count
+        progress = await site_graph_manager.get_crawl_progress(base_url)
+        
+        assert progress['stats']['base_url'] == base_url
+        assert progress['file_progress'] is None
+        assert progress['errors'] == {'file_progress': "count failed"}
+    
+    @pytest.mark.asyncio
+    async def test_connection_pragmas(self, site_graph_manager):
+        """Test that pooled connections get the site graph pragmas once the schema exists"""
+        await site_graph_manager.initialize_site_graph_schema()
+        await site_graph_manager.initialize_site_graph_schema()
+        db_manager = site_graph_manager.db_manager
+        assert len(db_manager.connection_init_hooks) == 1
+        
+        async with db_manager.get_connection() as db:
+            async with db.execute("PRAGMA synchronous") as cursor:
+                assert (await cursor.fetchone())[0] == 1  # NORMAL
+            async with db.execute("PRAGMA temp_store") as cursor:
+                assert (await cursor.fetchone())[0] == 2  # MEMORY
+            async with db.execute("PRAGMA journal_mode") as cursor:
+                assert (await cursor.fetchone())[0] == "wal"
+    
+    @pytest.mark.asyncio
+    async def test_links_stored_before_their_source(self, site_graph_manager):
+        """Test that source_url is not a foreign key, so children may precede parents"""
+        await site_graph_manager.initialize_site_graph_schema()
+        async with site_graph_manager._acquire_read() as db:
+            async with db.execute("PRAGMA foreign_key_list(discovered_urls)") as cursor:
+                assert await cursor.fetchall() == []
+        
+        await site_graph_manager.store_new_discovered_url(
+            URLNode(url="https://example.com/child", source_url="https://example.com/unstored")
+        )
+        assert await site_graph_manager.get_discovered_url("https://example.com/child") is not None
+    
+    @pytest.mark.asyncio
+    async def test_reads_do_not_wait_for_writer(self, site_graph_manager):
+        """Test that readers see committed data while a write transaction is open"""
+        url = "https://example.com/page"
+        await site_graph_manager.store_discovered_url(URLNode(url=url, status_code=200))
+        
+        async with site_graph_manager._acquire_write() as db:
+            await db.execute("UPDATE discovered_urls SET status_code = 500 WHERE url = ?", (url,))
+            retrieved = await asyncio.wait_for(site_graph_manager.get_discovered_url(url), timeout=5)
+            assert retrieved.status_code == 200
+        
+        assert (await site_graph_manager.get_discovered_url(url)).status_code == 500
+        
+        # Concurrent reads never open more than max_readers connections
+        site_graph_manager.max_readers = 2
+        await asyncio.gather(*(site_graph_manager.get_discovered_url(url) for _ in range(10)))
+        assert site_graph_manager._reader_count <= 2
     
+    @pytest.mark.asyncio
+    async def test_count_files_by_status(self, site_graph_manager):
+        """Test the per-status file counts behind get_crawl_progress"""
+        await site_graph_manager.store_discovered_urls_bulk([
+            URLNode(url="https://example.com/a.pdf", is_file=True, download_status="downloading"),
+            URLNode(url="https://example.com/b.pdf", is_file=True, download_status="completed"),
+            URLNode(url="https://example.com/page", is_file=False, download_status="completed"),
+            URLNode(url="https://other.com/c.pdf", is_file=True, download_status="completed"),
+        ])
+        
+        counts = await site_graph_manager._count_files_by_status("https://example.com")
+        assert counts == {"downloading": 1, "completed": 1}
+        
+        # Answered from the covering index alone
+        async with site_graph_manager._acquire_read() as db:
+            async with db.execute(
+                "EXPLAIN QUERY PLAN SELECT download_status, COUNT(*) FROM discovered_urls "
+                "WHERE is_file = 1 AND base_url_id = ? GROUP BY download_status", (1,)
+            ) as cursor:
+                plan = " ".join(row[-1] for row in await cursor.fetchall())
+        assert "COVERING INDEX" in plan
+        
+        # The legacy prefix match uses the partial index of files
+        async with site_graph_manager._acquire_read() as db:
+            async with db.execute(
+                "EXPLAIN QUERY PLAN SELECT download_status, COUNT(*) FROM discovered_urls "
+                "WHERE is_file = 1 AND url LIKE ? GROUP BY download_status", ("https://example.com%",)
+            ) as cursor:
+                plan = " ".join(row[-1] for row in await cursor.fetchall())
+        assert "COVERING INDEX idx_files_status_base" in plan
+    
+    @pytest.mark.asyncio
+    async def test_site_selection_by_base_url_id(self, temp_db_manager):
+        """Test selecting a site by origin id, with a path prefix, and by the legacy prefix match"""
+        manager = SiteGraphDatabaseManager(temp_db_manager)
+        await manager.store_discovered_urls_bulk([
+            URLNode(url="https://example.com/docs/a", is_file=False),
+            URLNode(url="https://example.com/blog/b", is_file=False),
+            URLNode(url="https://other.com/c", source_url="https://example.com/blog/b"),
+        ])
+        
+        # URLs linked from the site belong to it too, as with the prefix match
+        assert (await manager.get_site_graph("https://example.com"))['total_urls'] == 3
+        assert (await manager.get_site_graph("https://example.com/docs"))['total_urls'] == 1
+        assert (await manager.get_site_graph("https://example.com/blog"))['total_urls'] == 2
+        assert (await manager.get_site_graph("https://other.com"))['total_urls'] == 1
+        assert (await manager.get_site_graph("https://unknown.com"))['total_urls'] == 0
+        
+        legacy = SiteGraphDatabaseManager(temp_db_manager, match_by_prefix=True)
+        assert (await legacy.get_site_graph("https://example.com"))['total_urls'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_off_origin_files_linked_from_site(self, site_graph_manager):
+        """Test that files hosted elsewhere but linked from the site stay in its graph"""
+        base_url = "https://example.com"
+        old = datetime.now() - timedelta(days=45)
+        await site_graph_manager.store_discovered_urls_bulk([
+            URLNode(url=f"{base_url}/page", discovered_at=old),
+            URLNode(url="https://cdn.other.com/report.pdf", source_url=f"{base_url}/page",
+                    is_file=True, discovered_at=old),
+        ])
+        
+        site_graph = await site_graph_manager.get_site_graph(base_url)
+        assert [node.url for node in site_graph['files']] == ["https://cdn.other.com/report.pdf"]
+        assert (await site_graph_manager.get_site_signature(base_url))[0] == 2
+        
+        assert await site_graph_manager.cleanup_old_entries(base_url, days_old=30) == 2
+        assert await site_graph_manager.get_discovered_url("https://cdn.other.com/report.pdf") is None
+    
+    @pytest.mark.asyncio
+    async def test_base_url_id_migration(self, temp_db_manager):
+        """Test that rows stored before base_url_id existed are keyed on schema init"""
+        async with temp_db_manager.get_connection() as db:
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS discovered_urls (
+                    url TEXT PRIMARY KEY, source_url TEXT, discovered_at TIMESTAMP,
+                    last_checked TIMESTAMP, status_code INTEGER, content_type TEXT,
+                    file_size INTEGER, is_file BOOLEAN DEFAULT FALSE, file_extension TEXT,
+                    download_status TEXT DEFAULT 'not_attempted', local_path TEXT,
+                    checksum TEXT, metadata TEXT DEFAULT '{}', error_message TEXT,
+                    retry_count INTEGER DEFAULT 0
+                )
+            """)
+            await db.execute("INSERT INTO discovered_urls (url) VALUES ('https://example.com/old')")
+            await db.execute(
+                "INSERT INTO discovered_urls (url, source_url) VALUES (?, ?)",
+                ("https://cdn.other.com/old", "https://example.com/old")
+            )
+            await db.commit()
+        
+        manager = SiteGraphDatabaseManager(temp_db_manager)
+        site_graph = await manager.get_site_graph("https://example.com")
+        assert sorted(node.url for node in site_graph['urls']) == [
+            "https://cdn.other.com/old", "https://example.com/old"
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_timestamp_migration(self, temp_db_manager):
+        """Test that ISO text timestamps of older databases become Unix timestamps"""
+        async with temp_db_manager.get_connection() as db:
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS discovered_urls (
+                    url TEXT PRIMARY KEY, source_url TEXT, discovered_at TIMESTAMP,
+                    last_checked TIMESTAMP, status_code INTEGER, content_type TEXT,
+                    file_size INTEGER, is_file BOOLEAN DEFAULT FALSE, file_extension TEXT,
+                    download_status TEXT DEFAULT 'not_attempted', local_path TEXT,
+                    checksum TEXT, metadata TEXT DEFAULT '{}', error_message TEXT,
+                    retry_count INTEGER DEFAULT 0
+                )
+            """)
+            await db.execute(
+                "INSERT INTO discovered_urls (url, discovered_at, last_checked) VALUES (?, ?, ?)",
+                ("https://example.com/old", "2024-01-02T03:04:05.250000", "2024-01-03T00:00:00")
+            )
+            await db.commit()
+        
+        manager = SiteGraphDatabaseManager(temp_db_manager)
+        node = await manager.get_discovered_url("https://example.com/old")
+        assert node.discovered_at == datetime(2024, 1, 2, 3, 4, 5)
+        assert node.last_checked == datetime(2024, 1, 3)
+        
+        async with manager._acquire_read() as db:
+            async with db.execute("SELECT typeof(discovered_at), typeof(last_checked) FROM discovered_urls") as cursor:
+                assert await cursor.fetchone() == ("integer", "integer")
+        
+        # Old entries are found by the integer cutoff
+        assert await manager.cleanup_old_entries("https://example.com", days_old=1) == 1
+    
+    def test_row_to_url_node(self):
+        """Test building URLNodes from positional discovered_urls rows"""
+        row = ("https://example.com/a.pdf", None, "2024-01-02T03:04:05", None, 200, "application/pdf",
+               10, 1, ".pdf", "completed", None, None, '{"k": 1}', None, 0, 7)
+        node = _row_to_url_node(row)
+        assert node.is_file is True
+        assert node.discovered_at == datetime(2024, 1, 2, 3, 4, 5)
+        assert node.metadata == {"k": 1}
+        assert node.download_status == "completed"
+        
+        assert _row_to_url_node(row[:12] + ("{}",) + row[13:]).metadata == {}
+        
+        epoch = int(datetime(2024, 1, 2, 3, 4, 5).timestamp())
+        assert _row_to_url_node(row[:2] + (epoch, epoch) + row[4:]).last_checked == datetime(2024, 1, 2, 3, 4, 5)
+        assert _row_to_url_node(row[:12] + ("not json",) + row[13:]).metadata == {}
+    
+    @pytest.mark.asyncio
+    async def test_metadata_storage(self, site_graph_manager):
+        """Test that empty metadata is stored as NULL and stored metadata decodes lazily"""
+        await site_graph_manager.store_discovered_urls_bulk([
+            URLNode(url="https://example.com/empty"),
+            URLNode(url="https://example.com/tagged", metadata={"title": "Tagged", 1: [2]}),
+        ])
+        
+        async with site_graph_manager._acquire_read() as db:
+            async with db.execute("SELECT url, metadata FROM discovered_urls ORDER BY url") as cursor:
+                stored = dict(await cursor.fetchall())
+        assert stored["https://example.com/empty"] is None
+        
+        tagged = await site_graph_manager.get_discovered_url("https://example.com/tagged")
+        assert isinstance(URLNode.metadata._slot.__get__(tagged), str)
+        assert tagged.metadata == {"title": "Tagged", "1": [2]}
+        assert (await site_graph_manager.get_discovered_url("https://example.com/empty")).metadata == {}
+        
+        # Listings can skip reading the metadata column
+        site_graph = await site_graph_manager.get_site_graph("https://example.com", include_metadata=False)
+        assert [node.metadata for node in site_graph['urls']] == [{}, {}]
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_old_entries(self, site_graph_manager):
+        """Test deleting a site's entries older than the cutoff, in batches"""
+        base_url = "https://example.com"
+        old = datetime.now() - timedelta(days=45)
+        await site_graph_manager.store_discovered_urls_bulk(
+            [URLNode(url=f"{base_url}/old{i}", discovered_at=old) for i in range(5)]
+            + [URLNode(url=f"{base_url}/new", discovered_at=datetime.now()),
+               URLNode(url="https://other.com/old", discovered_at=old)]
+        )
+        
+        # More days than the current day of the month
+        assert await site_graph_manager.cleanup_old_entries(base_url, days_old=40, batch_size=2) == 5
+        assert (await site_graph_manager.get_site_graph(base_url))['total_urls'] == 1
+        assert await site_graph_manager.get_discovered_url("https://other.com/old") is not None
+        
+        # A batch size below one would never finish the loop
+        for batch_size in (0, -1):
+            with pytest.raises(ValueError):
+                await site_graph_manager.cleanup_old_entries(base_url, batch_size=batch_size)
+    
+    @pytest.mark.asyncio
+    async def test_schema_initialized_once(self, site_graph_manager):
+        """Test concurrent first calls create the schema only once"""
+        calls = 0
+        create_schema = site_graph_manager._create_schema
+
+        async def counting_create_schema():
+            nonlocal calls
+            calls += 1
+            await create_schema()
+
+        site_graph_manager._create_schema = counting_create_schema
+        await asyncio.gather(*(
+            site_graph_manager.get_discovered_url(f"https://example.com/{i}") for i in range(5)
+        ))
+        await site_graph_manager.initialize_site_graph_schema()
+
+        assert calls == 1
+        assert site_graph_manager._init_event.is_set()
+
+    @pytest.mark.asyncio
+    async def test_site_signature(self, site_graph_manager):
+        """Test that the site signature changes as URLs are stored and checked"""
+        base_url = "https://example.com"
+        assert await site_graph_manager.get_site_signature(base_url) == (0, None, None)
+        
+        await site_graph_manager.store_new_discovered_url(
+            URLNode(url=f"{base_url}/page", discovered_at=datetime(2024, 1, 1))
+        )
+        stored = await site_graph_manager.get_site_signature(base_url)
+        assert stored == (1, int(datetime(2024, 1, 1).timestamp()), None)
+        
+        await site_graph_manager.update_url_status(f"{base_url}/page", 200)
+        checked = await site_graph_manager.get_site_signature(base_url)
+        assert checked[:2] == stored[:2] and checked[2] is not None
+
+    @pytest.mark.asyncio
+    async def test_close_with_borrowed_reader(self, site_graph_manager):
+        """Test that a reader borrowed across close() is closed when released"""
+        base_url = "https://example.com"
+        await site_graph_manager.store_discovered_urls_bulk(
+            [URLNode(url=f"{base_url}/page{i}") for i in range(3)]
+        )
+
+        opened = []
+        open_connection = site_graph_manager._open_connection
+
+        async def recording_open_connection(*args, **kwargs):
+            db = await open_connection(*args, **kwargs)
+            opened.append(db)
+            return db
+
+        site_graph_manager._open_connection = recording_open_connection
+        seen = []
+        async for node in site_graph_manager.iter_site_graph(base_url, batch_size=1):
+            if not seen:
+                borrowed = site_graph_manager._reader_count
+                await site_graph_manager.close()
+                # Still borrowed, so still counted and still usable
+                assert site_graph_manager._reader_count == borrowed
+            seen.append(node.url)
+        assert len(seen) == 3
+
+        # Released after close(): the connection was closed, not queued again
+        assert len(opened) == 1 and opened[0]._connection is None
+        assert site_graph_manager._reader_count == 0
+        queued = []
+        while not site_graph_manager._readers.empty():
+            queued.append(site_graph_manager._readers.get_nowait())
+        assert all(db is None for db in queued)
+
+        # Later reads open a fresh connection
+        assert (await site_graph_manager.get_site_graph(base_url))['total_urls'] == 3
+        assert site_graph_manager._reader_count == 1
+
     @pytest.mark.asyncio
     async def test_factory_function(self, temp_db_manager):
         """Test the factory function for creating site graph manager"""
@@ -0,0 +1,295 @@
+"""
+Tests for SiteGraphHandler graph analysis
+
+Builds site graphs from an in-memory site graph database stub and checks
+the NetworkX based metrics, pattern detection and export filters.
+"""
+
+import json
+import random
+
+import pytest
+import networkx as nx
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+
+from crawl4ai import site_graph_handler
+from crawl4ai.site_graph_db import URLNode
+from crawl4ai.site_graph_handler import (
+    SiteGraphHandler,
+    GraphExportOptions,
+    _parallel_betweenness_centrality,
+)
+
+
+BASE_URL = "https://example.com"
+
+
+def make_site(pages: int = 30):
+    """A home page linking to section pages, each linking to its own child pages,
+    and an orphan page"""
+    urls = [URLNode(url=BASE_URL, discovered_at=datetime(2024, 1, 1), status_code=200)]
+    for i in range(pages):
+        parent = BASE_URL if i < 5 else f"{BASE_URL}/page{i % 5}"
+        urls.append(URLNode(url=f"{BASE_URL}/page{i}", source_url=parent,
+                            discovered_at=datetime(2024, 1, 1), status_code=200))
+    # Linked from nowhere known
+    urls.append(URLNode(url=f"{BASE_URL}/orphan", status_code=200))
+    files = [URLNode(url=f"{BASE_URL}/doc.pdf", source_url=f"{BASE_URL}/page1", is_file=True)]
+    return {'urls': urls, 'files': files}
+
+
+def make_db_manager():
+    """Site graph database stub serving make_site()"""
+    db_manager = Mock()
+    db_manager.get_site_graph = AsyncMock(return_value=make_site())
+    db_manager.get_site_signature = AsyncMock(return_value=(32, 1704067200, None))
+    return db_manager
+
+
+@pytest.fixture
+def handler():
+    """SiteGraphHandler over a stubbed site graph database"""
+    return SiteGraphHandler(db_manager=make_db_manager(), logger=Mock())
+
+
+class TestSiteGraphHandlerAnalysis:
+    """Test suite for site graph analysis"""
+
+    @pytest.mark.asyncio
+    async def test_pagerank_cached_per_graph(self, handler):
+        """Test that PageRank is computed once per site graph and matches NetworkX"""
+        graph = await handler.build_site_graph(BASE_URL)
+        pagerank = handler._get_pagerank(graph, BASE_URL)
+        assert handler._get_pagerank(graph, BASE_URL) is pagerank
+
+        expected = nx.pagerank(graph)
+        assert max(abs(pagerank[node] - expected[node]) for node in graph) < 1e-3
+
+        metrics = await handler.analyze_graph_metrics(BASE_URL)
+        assert metrics.page_rank_stats['max'] == max(pagerank.values())
+
+        handler.clear_cache(BASE_URL)
+        assert handler._pagerank_cache == {}
+
+    @pytest.mark.asyncio
+    async def test_export_keeps_top_pagerank_nodes(self, handler):
+        """Test that max_nodes keeps the highest ranked nodes"""
+        graph = await handler.build_site_graph(BASE_URL)
+        options = GraphExportOptions(max_nodes=5)
+        filtered = handler._apply_export_filters(graph, options, BASE_URL)
+
+        pagerank = nx.pagerank(graph)
+        assert filtered.number_of_nodes() == 5
+        assert min(pagerank[node] for node in filtered) >= sorted(pagerank.values())[-5] - 1e-6
+
+    @pytest.mark.asyncio
+    async def test_filtered_exports_ranked_separately(self):
+        """Test that filtered views of the same size do not share a PageRank"""
+        db_manager = make_db_manager()
+        site = make_site()
+        site['urls'].append(URLNode(url=f"{BASE_URL}/broken", source_url=BASE_URL, status_code=404))
+        db_manager.get_site_graph.return_value = site
+        handler = SiteGraphHandler(db_manager=db_manager, logger=Mock())
+        graph = await handler.build_site_graph(BASE_URL)
+
+        without_files = handler._apply_export_filters(
+            graph, GraphExportOptions(include_file_nodes=False, include_failed_nodes=True, max_nodes=7), BASE_URL
+        )
+        without_failed = handler._apply_export_filters(
+            graph, GraphExportOptions(include_file_nodes=True, include_failed_nodes=False, max_nodes=7), BASE_URL
+        )
+        assert f"{BASE_URL}/doc.pdf" not in without_files
+        assert f"{BASE_URL}/broken" not in without_failed
+        assert handler._pagerank_cache == {}
+
+    def test_max_nodes_never_restores_filtered_nodes(self, handler, monkeypatch):
+        """Test that the max_nodes cut only keeps nodes that passed the filters"""
+        graph = nx.DiGraph([("a", "b"), ("b", "c"), ("c", "d")])
+        graph.nodes["d"]['is_file'] = True
+        # A ranking that still includes the filtered file node
+        monkeypatch.setattr(handler, "_get_pagerank", Mock(return_value={"d": 0.9, "a": 0.5, "b": 0.3, "c": 0.1}))
+
+        filtered = handler._apply_export_filters(graph, GraphExportOptions(include_file_nodes=False, max_nodes=2))
+        assert set(filtered) == {"a", "b"}
+
+    @pytest.mark.asyncio
+    async def test_export_filters_without_copying(self, handler, monkeypatch, tmp_path):
+        """Test that export filters return views of the site graph"""
+        graph = await handler.build_site_graph(BASE_URL)
+        monkeypatch.setattr(nx.DiGraph, "copy", Mock(side_effect=AssertionError))
+
+        assert handler._apply_export_filters(graph, GraphExportOptions(), BASE_URL) is graph
+
+        filtered = handler._apply_export_filters(graph, GraphExportOptions(include_file_nodes=False), BASE_URL)
+        assert nx.is_frozen(filtered)
+        assert set(filtered) == set(graph) - {f"{BASE_URL}/doc.pdf"}
+        assert filtered.number_of_edges() == graph.number_of_edges() - 1
+
+        output_path = tmp_path / "site.json"
+        options = GraphExportOptions(format='json', include_file_nodes=False, max_nodes=10)
+        await handler.export_graph(BASE_URL, str(output_path), options)
+        assert len(json.loads(output_path.read_text())['nodes']) == 10
+
+    @pytest.mark.asyncio
+    async def test_json_export(self, handler, monkeypatch, tmp_path):
+        """Test that orjson and the json fallback export the same document"""
+        options = GraphExportOptions(format='json')
+        await handler.export_graph(BASE_URL, str(tmp_path / "fast.json"), options)
+        monkeypatch.setattr(site_graph_handler, "ORJSON_AVAILABLE", False)
+        await handler.export_graph(BASE_URL, str(tmp_path / "plain.json"), options)
+
+        exported = json.loads((tmp_path / "fast.json").read_text())
+        assert exported == json.loads((tmp_path / "plain.json").read_text())
+        assert len(exported['nodes']) == 33
+
+    @pytest.mark.asyncio
+    async def test_undirected_graph_cached_with_graph(self, handler, monkeypatch):
+        """Test that the undirected topology is built once, with every node"""
+        graph = await handler.build_site_graph(BASE_URL)
+
+        monkeypatch.setattr(nx.DiGraph, "to_undirected", Mock(side_effect=AssertionError))
+        metrics = await handler.analyze_graph_metrics(BASE_URL)
+        patterns = await handler.detect_graph_patterns(BASE_URL)
+
+        undirected = handler._graph_cache[BASE_URL][1]
+        assert set(undirected) == set(graph)
+        assert metrics.connected_components == 2
+        assert set(patterns['articulation_points']) == {BASE_URL} | {f"{BASE_URL}/page{i}" for i in range(5)}
+
+    def test_path_metrics_estimate(self):
+        """Test the sampled path metrics against the exact all-pairs values"""
+        component = nx.connected_watts_strogatz_graph(300, 6, 0.1, seed=1)
+        exact_diameter = nx.diameter(component)
+        exact_average = nx.average_shortest_path_length(component)
+
+        diameter, average, approx = SiteGraphHandler._estimate_path_metrics(component, 300)
+        assert (diameter, approx) == (exact_diameter, False)
+        assert average == pytest.approx(exact_average)
+
+        diameter, average, approx = SiteGraphHandler._estimate_path_metrics(component, 64)
+        assert approx
+        assert diameter <= exact_diameter
+        assert average == pytest.approx(exact_average, rel=0.05)
+
+    def test_parallel_betweenness_centrality(self):
+        """Test the process pool betweenness against NetworkX"""
+        graph = nx.gnp_random_graph(60, 0.08, seed=2, directed=True)
+
+        exact = nx.betweenness_centrality(graph)
+        result = _parallel_betweenness_centrality(graph, list(graph), workers=2)
+        assert result == pytest.approx(exact)
+
+        sampled = nx.betweenness_centrality(graph, k=20, seed=3)
+        sources = random.Random(3).sample(list(graph), 20)
+        result = _parallel_betweenness_centrality(graph, sources, workers=2)
+        assert result == pytest.approx(sampled)
+
+    def test_betweenness_falls_back_when_workers_fail(self, monkeypatch):
+        """Test that a broken process pool falls back to the serial computation"""
+        graph = nx.gnp_random_graph(30, 0.1, seed=2, directed=True)
+        monkeypatch.setattr(site_graph_handler, "BETWEENNESS_BACKEND", None)
+        monkeypatch.setattr(site_graph_handler, "_PARALLEL_BETWEENNESS_MIN_WORK", 0)
+        monkeypatch.setattr(site_graph_handler.os, "cpu_count", lambda: 2)
+        monkeypatch.setattr(site_graph_handler, "_parallel_betweenness_centrality",
+                            Mock(side_effect=BrokenProcessPool))
+
+        result = site_graph_handler._betweenness_centrality(graph, len(graph))
+        assert result == pytest.approx(nx.betweenness_centrality(graph))
+
+    @pytest.mark.asyncio
+    async def test_hub_and_authority_nodes(self, handler):
+        """Test degree thresholding against the per-node definition"""
+        graph = await handler.build_site_graph(BASE_URL)
+        patterns = await handler.detect_graph_patterns(BASE_URL)
+
+        for key, degrees in (('hub_nodes', dict(graph.out_degree())),
+                             ('authority_nodes', dict(graph.in_degree()))):
+            threshold = 2 * sum(degrees.values()) / len(degrees)
+            assert patterns[key] == [node for node, degree in degrees.items() if degree > threshold]
+        assert BASE_URL in patterns['hub_nodes']
+
+    @pytest.mark.asyncio
+    async def test_results_persisted_in_cache_dir(self, tmp_path):
+        """Test that a new handler reuses persisted results until the site changes"""
+        first = SiteGraphHandler(db_manager=make_db_manager(), logger=Mock(), cache_dir=str(tmp_path))
+        metrics = await first.analyze_graph_metrics(BASE_URL)
+        patterns = await first.detect_graph_patterns(BASE_URL)
+
+        db_manager = make_db_manager()
+        second = SiteGraphHandler(db_manager=db_manager, logger=Mock(), cache_dir=str(tmp_path))
+        assert await second.analyze_graph_metrics(BASE_URL) == metrics
+        assert await second.detect_graph_patterns(BASE_URL) == patterns
+        assert (await second.build_site_graph(BASE_URL)).number_of_nodes() == metrics.total_nodes
+        db_manager.get_site_graph.assert_not_called()
+
+        # A stored or checked URL changes the signature
+        db_manager.get_site_signature.return_value = (33, 1704067200, None)
+        second.clear_cache()
+        await second.analyze_graph_metrics(BASE_URL)
+        db_manager.get_site_graph.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_find_critical_paths(self, handler):
+        """Test shortest paths from every root to every reachable target"""
+        graph = await handler.build_site_graph(BASE_URL)
+        paths = await handler.find_critical_paths(BASE_URL)
+
+        roots = [BASE_URL, f"{BASE_URL}/orphan"]
+        leaves = [node for node in graph if graph.out_degree(node) == 0]
+        expected = {f"{root} -> {leaf}": nx.shortest_path_length(graph, root, leaf)
+                    for root in roots for leaf in leaves
+                    if leaf != root and nx.has_path(graph, root, leaf)}
+        assert {key: len(path) - 1 for key, path in paths.items()} == expected
+        assert paths[f"{BASE_URL} -> {BASE_URL}/doc.pdf"] == [BASE_URL, f"{BASE_URL}/page1", f"{BASE_URL}/doc.pdf"]
+
+        paths = await handler.find_critical_paths(BASE_URL, [f"{BASE_URL}/page7", f"{BASE_URL}/missing"])
+        assert paths == {f"{BASE_URL} -> {BASE_URL}/page7": [BASE_URL, f"{BASE_URL}/page2", f"{BASE_URL}/page7"]}
+
+    @pytest.mark.asyncio
+    async def test_empty_results_not_persisted(self, tmp_path):
+        """Test that an empty site's graphs and metrics are not written to cache_dir"""
+        db_manager = make_db_manager()
+        db_manager.get_site_graph.return_value = {'urls': [], 'files': []}
+        db_manager.get_site_signature.return_value = (0, None, None)
+        handler = SiteGraphHandler(db_manager=db_manager, logger=Mock(), cache_dir=str(tmp_path))
+
+        assert (await handler.analyze_graph_metrics(BASE_URL)).total_nodes == 0
+        assert not handler._stored_result.check_call_in_cache("site_graphs", BASE_URL, (0, None, None), ())
+        assert not handler._stored_result.check_call_in_cache("graph_metrics", BASE_URL, (0, None, None), (64,))
+
+    def test_arrowheads_point_at_edge_targets(self):
+        """Test the arrowhead triangles drawn for directed edges"""
+        np = pytest.importorskip("numpy")
+        start = np.array([[0.0, 0.0], [0.0, 0.0], [1.0, 1.0]])
+        end = np.array([[1.0, 0.0], [0.0, -2.0], [1.0, 1.0]])
+
+        heads = site_graph_handler._arrowheads(start, end, 0.1)
+        # The self-loop gets no arrowhead
+        assert heads.shape == (2, 3, 2)
+        assert heads[0].ravel().tolist() == pytest.approx([0.95, 0.0, 0.85, 0.04, 0.85, -0.04])
+        assert heads[1, 0].tolist() == pytest.approx([0.0, -1.9])
+        assert heads[1, 1:, 1].tolist() == pytest.approx([-1.8, -1.8])
+
+    @pytest.mark.asyncio
+    async def test_build_site_graph(self, handler):
+        """Test the nodes, edges and attributes of a built site graph"""
+        graph = await handler.build_site_graph(BASE_URL)
+
+        assert graph.number_of_nodes() == 33
+        assert graph.number_of_edges() == 31
+        assert graph.nodes[f"{BASE_URL}/page7"]['discovered_at'] == datetime(2024, 1, 1).isoformat()
+        assert graph.nodes[f"{BASE_URL}/doc.pdf"]['is_file'] is True
+        assert graph.edges[f"{BASE_URL}/page2", f"{BASE_URL}/page7"] == {
+            'discovered_at': datetime(2024, 1, 1).isoformat(),
+            'link_type': 'internal'
+        }
+        assert graph.edges[f"{BASE_URL}/page1", f"{BASE_URL}/doc.pdf"] == {'link_type': 'file'}
+
+    def test_is_internal_link(self, handler):
+        """Test classifying links against the base domain"""
+        assert handler._is_internal_link(f"{BASE_URL}/page", BASE_URL)
+        assert handler._is_internal_link("/relative/page", BASE_URL)
+        assert not handler._is_internal_link("https://other.com/page", BASE_URL)
+        assert not handler._is_internal_link("http://[invalid/page", BASE_URL)